@@ -0,0 +1,154 @@
+import re
+
+import numpy as np
+
+# Sample rate audio yang dipakai oleh Whisper (mono, 16 kHz).
+SAMPLE_RATE = 16000
+
+
+def frame_energy_db(audio, frame_seconds: float = 0.05, sample_rate: int = SAMPLE_RATE):
+    """
+    Menghitung energi (RMS dalam dB) untuk setiap frame audio.
+
+    Args:
+        audio (numpy.ndarray): Sampel audio mono float32.
+        frame_seconds (float): Panjang satu frame dalam detik.
+        sample_rate (int): Sample rate audio.
+
+    Returns:
+        numpy.ndarray: Energi per frame dalam dBFS. Frame terakhir yang tidak penuh diabaikan.
+    """
+    frame_samples = max(1, int(frame_seconds * sample_rate))
+    frame_count = len(audio) // frame_samples
+    if frame_count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = np.asarray(audio[:frame_count * frame_samples], dtype=np.float32).reshape(frame_count, frame_samples)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    # Batas bawah kecil mencegah log10(0) pada bagian yang benar-benar hening.
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+def find_silence_split_points(audio, target_chunk_seconds: float = 600.0, search_seconds: float = 30.0,
+                              frame_seconds: float = 0.05, sample_rate: int = SAMPLE_RATE) -> list:
+    """
+    Mencari titik potong di bagian paling hening di sekitar setiap kelipatan 'target_chunk_seconds'.
+    Memotong di bagian hening mencegah kata terpotong di tengah antar-potongan.
+
+    Args:
+        audio (numpy.ndarray): Sampel audio mono float32.
+        target_chunk_seconds (float): Panjang potongan yang diinginkan.
+        search_seconds (float): Lebar jendela pencarian (ke kiri dan kanan) di sekitar target.
+        frame_seconds (float): Resolusi analisis energi.
+        sample_rate (int): Sample rate audio.
+
+    Returns:
+        list: Indeks sampel titik potong, terurut naik (tidak termasuk 0 dan akhir audio).
+    """
+    total_seconds = len(audio) / sample_rate
+    if total_seconds <= target_chunk_seconds * 1.5:
+        return []
+
+    energy = frame_energy_db(audio, frame_seconds, sample_rate)
+    # Perataan sekitar 0.5 detik agar yang dipilih adalah jeda bicara, bukan satu frame sepi.
+    smooth_frames = max(1, int(0.5 / frame_seconds))
+    kernel = np.ones(smooth_frames, dtype=np.float32) / smooth_frames
+    smoothed = np.convolve(energy, kernel, mode="same")
+
+    split_points = []
+    search_frames = int(search_seconds / frame_seconds)
+    target = target_chunk_seconds
+    while target < total_seconds - target_chunk_seconds * 0.5:
+        center = int(target / frame_seconds)
+        low = max(0, center - search_frames)
+        high = min(len(smoothed), center + search_frames + 1)
+        if high <= low:
+            break
+        quietest = low + int(np.argmin(smoothed[low:high]))
+        split_points.append(quietest * int(frame_seconds * sample_rate))
+        # Target berikutnya dihitung dari titik potong yang sebenarnya.
+        target = quietest * frame_seconds + target_chunk_seconds
+    return split_points
+
+
+def plan_chunks(total_samples: int, split_points, overlap_seconds: float = 1.0,
+                sample_rate: int = SAMPLE_RATE) -> list:
+    """
+    Menyusun daftar potongan dari titik-titik potong. Setiap potongan memiliki wilayah
+    'inti' (tanpa tumpang tindih) dan wilayah yang diperlebar 'overlap_seconds' ke kiri
+    dan kanan agar Whisper mendapat sedikit konteks di batas potongan.
+
+    Args:
+        total_samples (int): Jumlah total sampel audio.
+        split_points (list): Indeks sampel titik potong.
+        overlap_seconds (float): Lebar tumpang tindih di setiap sisi.
+        sample_rate (int): Sample rate audio.
+
+    Returns:
+        list: Daftar dict dengan kunci 'index', 'start', 'end' (sampel yang ditranskripsi)
+              serta 'core_start' dan 'core_end' (wilayah milik potongan ini).
+    """
+    overlap = int(overlap_seconds * sample_rate)
+    boundaries = [0] + list(split_points) + [total_samples]
+    chunks = []
+    for index in range(len(boundaries) - 1):
+        core_start, core_end = boundaries[index], boundaries[index + 1]
+        chunks.append({
+            "index": index,
+            "core_start": core_start,
+            "core_end": core_end,
+            "start": max(0, core_start - overlap),
+            "end": min(total_samples, core_end + overlap),
+        })
+    return chunks
+
+
+def _normalize_text(text: str) -> str:
+    """Menyederhanakan teks untuk perbandingan duplikat (huruf kecil, tanpa tanda baca)."""
+    return re.sub(r"[^\w\s]", "", text.lower()).strip()
+
+
+def stitch_segments(chunk_results, sample_rate: int = SAMPLE_RATE) -> list:
+    """
+    Menggabungkan segmen dari banyak potongan menjadi satu daftar dengan timestamp global.
+
+    Segmen dipertahankan hanya jika titik tengahnya berada di wilayah inti potongannya,
+    sehingga teks di wilayah tumpang tindih tidak muncul dua kali. Sisa duplikat (teks
+    yang sama dan waktunya bertumpuk) dibuang, dan waktu mulai dipaksa tidak mendahului
+    akhir segmen sebelumnya.
+
+    Args:
+        chunk_results (list): Daftar tuple (chunk, segments) dengan 'chunk' dari plan_chunks()
+            dan 'segments' berwaktu relatif terhadap awal potongan ('start' chunk).
+        sample_rate (int): Sample rate audio.
+
+    Returns:
+        list: Daftar dict segmen ('id', 'start', 'end', 'text', dan 'words' jika ada) berwaktu global.
+    """
+    stitched = []
+    for chunk, segments in sorted(chunk_results, key=lambda item: item[0]["start"]):
+        offset = chunk["start"] / sample_rate
+        core_start = chunk["core_start"] / sample_rate
+        core_end = chunk["core_end"] / sample_rate
+        for segment in segments:
+            start = segment["start"] + offset
+            end = segment["end"] + offset
+            midpoint = (start + end) / 2
+            if not (core_start <= midpoint < core_end):
+                continue
+            text = segment["text"]
+            if stitched:
+                previous = stitched[-1]
+                if start < previous["end"] and _normalize_text(text) == _normalize_text(previous["text"]):
+                    previous["end"] = max(previous["end"], end)
+                    continue
+                start = max(start, previous["end"])
+            item = {"start": start, "end": max(start, end), "text": text}
+            if segment.get("words"):
+                # Timestamp per kata ikut digeser ke waktu global.
+                item["words"] = [{**word, "start": word["start"] + offset, "end": word["end"] + offset}
+                                 for word in segment["words"]]
+            stitched.append(item)
+
+    for index, segment in enumerate(stitched):
+        segment["id"] = index
+    return stitched
@@ -0,0 +1,386 @@
+import os
+import importlib
+import importlib.util
+import threading
+import types
+
+from transcribe_options import TranscribeOptions
+
+# Sample rate audio dan jarak antar-frame mel Whisper (dalam sampel).
+SAMPLE_RATE = 16000
+HOP_LENGTH = 160
+# Panjang satu jendela input Whisper (detik) dan resolusi token timestamp-nya.
+WINDOW_SECONDS = 30.0
+TIMESTAMP_PRECISION = 0.02
+
+# Konstanta global untuk menyimpan nama model Whisper yang valid.
+# Digunakan untuk validasi input dan pengisian dropdown di GUI. Didefinisikan di sini
+# (bukan di core_logic) agar GUI bisa mengisi dropdown tanpa mengimpor numpy/ffmpeg.
+AVAILABLE_MODELS = ["tiny", "base", "small", "medium", "large"]
+
+# Ambang yang sama dengan bawaan whisper.transcribe(): hasil greedy yang berulang-ulang
+# (rasio kompresi tinggi) atau kurang yakin didekode ulang dengan fallback temperatur.
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+# Callback progres per thread untuk backend openai-whisper, karena beberapa job bisa
+# berjalan bersamaan di thread berbeda. Hook dipasang saat whisper pertama kali dimuat.
+_progress_local = threading.local()
+
+
+def _install_progress_hook():
+    # 'whisper.transcribe' sebagai atribut paket tertimpa oleh fungsi transcribe(),
+    # jadi modulnya diambil lewat importlib.
+    transcribe_module = importlib.import_module("whisper.transcribe")
+    if isinstance(transcribe_module.tqdm, types.SimpleNamespace):
+        return
+
+    class _ProgressTqdm(transcribe_module.tqdm.tqdm):
+        def update(self, n=1):
+            callback = getattr(_progress_local, "callback", None)
+            if callback is not None:
+                # 'self.n' belum termasuk 'n' sampai super().update() dipanggil.
+                callback(self.n + n)
+            return super().update(n)
+
+    # Modul tqdm milik whisper diganti dengan namespace yang 'tqdm'-nya adalah subclass kita.
+    transcribe_module.tqdm = types.SimpleNamespace(tqdm=_ProgressTqdm)
+
+
+class WhisperBackend:
+    """
+    Backend bawaan: openai-whisper (PyTorch, FP32 di CPU).
+    Semua backend mengembalikan hasil dengan bentuk yang sama sehingga penulis SRT,
+    cache, dan penyambung segmen tidak perlu tahu backend mana yang dipakai.
+    """
+    name = "openai-whisper"
+    label = "openai-whisper (FP32)"
+    module = "whisper"
+    # Presisi bobot yang didukung; 'int8' memakai kuantisasi dinamis PyTorch pada lapisan Linear.
+    default_precision = "fp32"
+    precisions = ("fp32", "int8")
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    def set_threads(self, threads: int):
+        """Membatasi jumlah thread inferensi di proses ini (dipakai oleh proses worker)."""
+        import torch
+        torch.set_num_threads(threads)
+
+    def load(self, model_name: str, precision: str = "fp32"):
+        """
+        Memuat model. Di CPU, checkpoint di-memory-map sehingga bobot tidak perlu disalin
+        dua kali (isi file + tensor model) saat dimuat; halaman bobot juga bisa dilepas oleh
+        sistem operasi tanpa swap.
+
+        Args:
+            model_name (str): Nama model Whisper.
+            precision (str): 'fp32' atau 'int8' (kuantisasi dinamis lapisan Linear).
+        """
+        import torch
+        import whisper
+        _install_progress_hook()
+        model = None
+        if not torch.cuda.is_available():
+            model = _load_whisper_mmap(model_name)
+        if model is None:
+            model = whisper.load_model(model_name)
+        if precision == "int8":
+            model = _quantize_int8(model)
+        return model
+
+    def model_size_mb(self, model, model_name: str) -> float:
+        """Menghitung ukuran bobot model (termasuk bobot int8 yang sudah dipaket) dalam MB."""
+        total_bytes = 0
+        for value in model.state_dict().values():
+            # Lapisan terkuantisasi menyimpan bobotnya sebagai tuple (weight, bias).
+            for tensor in (value if isinstance(value, tuple) else (value,)):
+                if hasattr(tensor, "element_size"):
+                    total_bytes += tensor.numel() * tensor.element_size()
+        return total_bytes / (1024 * 1024)
+
+    def detect_language(self, model, audio) -> str:
+        """
+        Mendeteksi bahasa dari jendela 30 detik pertama audio (satu forward pass encoder).
+
+        Args:
+            model: Model dari load().
+            audio (numpy.ndarray): Audio mono float32 16 kHz, sebaiknya sudah tanpa bagian hening.
+
+        Returns:
+            str: Kode bahasa, misal 'id'.
+        """
+        import numpy as np
+        import whisper
+        if not model.is_multilingual:
+            return "en"
+        window = np.ascontiguousarray(audio[:int(WINDOW_SECONDS * SAMPLE_RATE)], dtype=np.float32)
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(window), n_mels=model.dims.n_mels).to(model.device)
+        _, probs = model.detect_language(mel)
+        return max(probs, key=probs.get)
+
+    def transcribe(self, model, audio, initial_prompt=None, progress_callback=None, options=None) -> dict:
+        """
+        Mentranskripsi array audio.
+
+        Args:
+            model: Model dari load().
+            audio (numpy.ndarray): Audio mono float32 16 kHz.
+            initial_prompt (str, optional): Teks konteks sebelumnya.
+            progress_callback (callable, optional): Dipanggil dengan posisi (detik, relatif
+                terhadap awal 'audio') yang sudah didekode.
+            options (TranscribeOptions, optional): Opsi decoding. Defaults to TranscribeOptions().
+
+        Returns:
+            dict: 'text', 'language', dan 'segments' (list dict 'start', 'end', 'text', ditambah
+                  'words' jika options.word_timestamps aktif).
+        """
+        options = options or TranscribeOptions()
+        if progress_callback:
+            # Frame mel Whisper berjarak HOP_LENGTH sampel.
+            _progress_local.callback = lambda frames: progress_callback(frames * HOP_LENGTH / SAMPLE_RATE)
+        try:
+            # 'fp16=False' digunakan untuk kompatibilitas CPU yang lebih luas.
+            # 'verbose=False' untuk mencegah Whisper mencetak log progresnya sendiri ke konsol.
+            # Dengan satu temperatur saja, whisper tidak pernah mendekode ulang jendela yang meragukan.
+            # beam_size=None berarti decoder greedy (beam 1 tetap memakai BeamSearchDecoder yang lebih lambat).
+            result = model.transcribe(audio, fp16=False, verbose=False, initial_prompt=initial_prompt,
+                                      language=options.language, temperature=options.temperatures,
+                                      beam_size=options.beam_size if options.beam_size > 1 else None,
+                                      condition_on_previous_text=options.condition_on_previous_text,
+                                      word_timestamps=options.word_timestamps)
+        finally:
+            _progress_local.callback = None
+        segments = []
+        for seg in result["segments"]:
+            segment = {"start": seg["start"], "end": seg["end"], "text": seg["text"]}
+            if options.word_timestamps:
+                segment["words"] = [{"start": word["start"], "end": word["end"], "word": word["word"]}
+                                    for word in seg.get("words", [])]
+            segments.append(segment)
+        return {"text": result["text"], "language": result.get("language"), "segments": segments}
+
+
+    def transcribe_batch(self, model, windows, options=None) -> list:
+        """
+        Mentranskripsi beberapa jendela audio (masing-masing maksimal WINDOW_SECONDS) dalam
+        satu forward pass: mel setiap jendela ditumpuk menjadi satu batch lalu didekode
+        bersama dengan whisper.decode(). Jika bahasa tidak ditentukan di 'options', bahasa
+        dideteksi per jendela di dalam forward pass yang sama.
+
+        Args:
+            model: Model dari load().
+            windows (list): Daftar array audio mono float32 16 kHz.
+            options (TranscribeOptions, optional): Opsi decoding. Defaults to TranscribeOptions().
+
+        Returns:
+            list: Satu dict per jendela dengan bentuk yang sama seperti transcribe()
+                  (waktu segmen relatif terhadap awal jendela).
+        """
+        options = options or TranscribeOptions()
+        if options.word_timestamps:
+            # Timestamp per kata butuh alignment cross-attention per jendela yang hanya ada di
+            # model.transcribe(), jadi jendela didekode satu per satu.
+            return [self.transcribe(model, window, options=options) for window in windows]
+
+        import numpy as np
+        import torch
+        import whisper
+        from whisper.tokenizer import get_tokenizer
+
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(np.ascontiguousarray(window, dtype=np.float32)),
+                                        n_mels=model.dims.n_mels)
+            for window in windows
+        ]).to(model.device)
+        decoding = whisper.DecodingOptions(fp16=False, temperature=options.temperature, language=options.language,
+                                           beam_size=options.beam_size if options.beam_size > 1 else None)
+        decoded = whisper.decode(model, mels, decoding)
+
+        results = []
+        for window, result in zip(windows, decoded):
+            duration = len(window) / SAMPLE_RATE
+            if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+                # Jendela dianggap hening, sama seperti logika whisper.transcribe().
+                results.append({"text": "", "language": result.language, "segments": []})
+                continue
+            if options.temperature_fallback and (result.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+                                                 or result.avg_logprob < LOGPROB_THRESHOLD):
+                # Hasil greedy meragukan: jendela ini didekode ulang sendiri dengan fallback temperatur.
+                results.append(self.transcribe(model, window, options=options))
+                continue
+            tokenizer = get_tokenizer(model.is_multilingual, num_languages=getattr(model, "num_languages", 99),
+                                      language=result.language, task="transcribe")
+            segments = _segments_from_tokens(result.tokens, tokenizer, duration)
+            results.append({"text": "".join(segment["text"] for segment in segments),
+                            "language": result.language, "segments": segments})
+        return results
+
+
+def _load_whisper_mmap(model_name: str):
+    """
+    Memuat checkpoint Whisper dengan torch.load(mmap=True) dan menempelkan tensornya langsung
+    ke model (assign=True), tanpa salinan kedua. Mengembalikan None jika versi whisper/torch
+    atau format checkpoint tidak mendukungnya, sehingga pemanggil memakai whisper.load_model().
+    """
+    import torch
+    import whisper
+    from whisper.model import ModelDimensions, Whisper
+
+    models = getattr(whisper, "_MODELS", {})
+    if model_name not in models or not hasattr(whisper, "_download"):
+        return None
+    download_root = os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                                 "whisper")
+    # Mengunduh (jika belum ada) dan memverifikasi checkpoint persis seperti whisper.load_model().
+    checkpoint_path = whisper._download(models[model_name], download_root, False)
+    try:
+        checkpoint = torch.load(checkpoint_path, map_location="cpu", mmap=True, weights_only=True)
+        model = Whisper(ModelDimensions(**checkpoint["dims"]))
+        model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+    except (TypeError, RuntimeError, ValueError, KeyError):
+        # Checkpoint format lama (bukan zip) atau torch < 2.1 tidak mendukung mmap/assign.
+        return None
+    alignment_heads = getattr(whisper, "_ALIGNMENT_HEADS", {}).get(model_name)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model
+
+
+def _quantize_int8(model):
+    """Mengkuantisasi lapisan Linear model Whisper ke int8 (kuantisasi dinamis, khusus CPU)."""
+    import torch
+    from whisper.model import Linear
+
+    # Kelas Linear milik whisper hanya menambahkan konversi dtype di forward(); quantize_dynamic
+    # hanya mengenali torch.nn.Linear persis, jadi kelasnya dikembalikan ke Linear standar dulu.
+    for module in model.modules():
+        if type(module) is Linear:
+            module.__class__ = torch.nn.Linear
+    model = model.cpu().float()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _segments_from_tokens(tokens, tokenizer, duration: float) -> list:
+    """
+    Memecah token hasil whisper.decode() menjadi segmen berdasarkan token timestamp.
+    Whisper menulis '<|t0|> teks <|t1|>' per segmen; dua timestamp berurutan menandai batas segmen.
+
+    Args:
+        tokens (list): Token hasil dekode (tanpa SOT/EOT).
+        tokenizer: Tokenizer Whisper untuk bahasa jendela tersebut.
+        duration (float): Panjang jendela (detik), batas atas waktu segmen.
+
+    Returns:
+        list: Segmen dengan kunci 'start', 'end', dan 'text' (relatif terhadap awal jendela).
+    """
+    segments = []
+    text_tokens = []
+    last_time = 0.0
+    for token in tokens:
+        if token >= tokenizer.timestamp_begin:
+            seconds = min((token - tokenizer.timestamp_begin) * TIMESTAMP_PRECISION, duration)
+            if text_tokens:
+                segments.append({"start": last_time, "end": max(seconds, last_time),
+                                 "text": tokenizer.decode(text_tokens)})
+                text_tokens = []
+            last_time = seconds
+        elif token < tokenizer.eot:
+            text_tokens.append(token)
+    if text_tokens:
+        # Segmen terakhir tanpa timestamp penutup berakhir di ujung jendela.
+        segments.append({"start": last_time, "end": max(duration, last_time), "text": tokenizer.decode(text_tokens)})
+    return [segment for segment in segments if segment["text"].strip()]
+
+
+class FasterWhisperBackend:
+    """
+    Backend faster-whisper (CTranslate2) dengan bobot terkuantisasi int8 di CPU.
+    Biasanya beberapa kali lebih cepat dari openai-whisper FP32 dan memakai jauh lebih
+    sedikit memori, terutama untuk model 'medium' dan 'large'.
+    """
+    name = "faster-whisper"
+    label = "faster-whisper (int8, lebih cepat)"
+    module = "faster_whisper"
+    compute_type = "int8"
+    default_precision = "int8"
+    precisions = ("int8",)
+
+    # Perkiraan ukuran bobot int8 (MB), karena model CTranslate2 tidak mengekspos parameternya.
+    _APPROX_SIZE_MB = {"tiny": 40, "base": 75, "small": 250, "medium": 780, "large": 1550}
+
+    def __init__(self):
+        # 0 = mengikuti OMP_NUM_THREADS / bawaan CTranslate2.
+        self.cpu_threads = 0
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    def set_threads(self, threads: int):
+        # Jumlah thread CTranslate2 ditentukan saat model dimuat.
+        self.cpu_threads = threads
+
+    def load(self, model_name: str, precision: str = "int8"):
+        # Bobot CTranslate2 selalu int8 di backend ini; 'precision' diterima demi antarmuka yang sama.
+        from faster_whisper import WhisperModel
+        return WhisperModel(model_name, device="cpu", compute_type=self.compute_type,
+                            cpu_threads=self.cpu_threads)
+
+    def model_size_mb(self, model, model_name: str) -> float:
+        return float(self._APPROX_SIZE_MB.get(model_name, 0))
+
+    def detect_language(self, model, audio) -> str:
+        # Bahasa ditentukan sebelum segmen pertama didekode; iterator segmen yang lazy tidak
+        # dibaca, jadi yang dijalankan hanya encoder pada jendela pertama.
+        _, info = model.transcribe(audio[:int(WINDOW_SECONDS * SAMPLE_RATE)], beam_size=1, vad_filter=False)
+        return info.language
+
+    def transcribe(self, model, audio, initial_prompt=None, progress_callback=None, options=None) -> dict:
+        # Opsi decoding dipetakan sama seperti backend openai-whisper agar segmen yang dihasilkan sebanding.
+        options = options or TranscribeOptions()
+        segments_iter, info = model.transcribe(
+            audio, beam_size=options.beam_size, initial_prompt=initial_prompt, language=options.language,
+            temperature=list(options.temperatures),
+            condition_on_previous_text=options.condition_on_previous_text, vad_filter=False,
+            word_timestamps=options.word_timestamps,
+        )
+        segments = []
+        # Segmen didekode secara lazy saat iterator dibaca, jadi progres bisa dilaporkan per segmen.
+        for segment in segments_iter:
+            item = {"start": segment.start, "end": segment.end, "text": segment.text}
+            if options.word_timestamps:
+                item["words"] = [{"start": word.start, "end": word.end, "word": word.word}
+                                 for word in segment.words or []]
+            segments.append(item)
+            if progress_callback:
+                progress_callback(segment.end)
+        return {"text": "".join(segment["text"] for segment in segments),
+                "language": info.language, "segments": segments}
+
+    def transcribe_batch(self, model, windows, options=None) -> list:
+        # CTranslate2 sudah efisien per panggilan; jendela didekode berurutan dengan model yang sama.
+        return [self.transcribe(model, window, options=options) for window in windows]
+
+
+# Registri backend yang dikenal, berurutan sesuai tampilan di GUI.
+BACKENDS = {backend.name: backend for backend in (WhisperBackend(), FasterWhisperBackend())}
+DEFAULT_BACKEND = WhisperBackend.name
+
+
+def get_backend(name: str = DEFAULT_BACKEND):
+    """
+    Mengambil backend berdasarkan nama.
+
+    Raises:
+        ValueError: Jika nama backend tidak dikenal.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend '{name}' tidak dikenal. Pilihan: {', '.join(BACKENDS)}.")
+    return BACKENDS[name]
+
+
+def available_backends() -> list:
+    """Mengembalikan nama backend yang pustakanya terpasang (tanpa mengimpornya)."""
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
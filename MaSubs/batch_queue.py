@@ -0,0 +1,329 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from core_logic import transcribe_audio, use_model, preload_model, run_inference, detect_language, SAMPLE_RATE
+from backends import get_backend, DEFAULT_BACKEND
+from memory_planner import max_workers_for_memory
+from speech_regions import strip_non_speech
+from result_cache import ResultCache
+from masubs_common.media import load_pcm
+
+# Panjang awal audio (detik) yang diperiksa untuk deteksi bahasa pada mode audio panjang.
+LANGUAGE_PROBE_SECONDS = 300
+
+# Ekstensi file yang diambil saat pengguna memilih satu folder penuh.
+SUPPORTED_EXTENSIONS = (
+    ".mp3", ".wav", ".m4a", ".flac", ".ogg", ".aac", ".wma",
+    ".mp4", ".mkv", ".mov", ".avi", ".webm",
+)
+
+# Batas atas jumlah proses worker bawaan per model. Setiap proses memuat model
+# sendiri, sehingga model besar dibatasi agar RAM tidak habis.
+_DEFAULT_MAX_WORKERS = {"tiny": 4, "base": 4, "small": 2, "medium": 1, "large": 1}
+
+# State milik setiap proses worker. Diisi oleh '_init_worker' sekali per proses.
+_worker_state = {}
+
+
+def collect_media_files(paths) -> list:
+    """
+    Mengubah daftar path (file dan/atau folder) menjadi daftar file media yang akan diproses.
+    Folder dipindai (tidak rekursif) dan hanya file dengan ekstensi yang didukung yang diambil.
+
+    Args:
+        paths (list): Daftar path file atau folder.
+
+    Returns:
+        list: Daftar path file media yang unik, dengan urutan yang stabil.
+    """
+    collected = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                full_path = os.path.join(path, name)
+                if os.path.isfile(full_path) and name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    collected.append(full_path)
+        elif os.path.isfile(path):
+            collected.append(path)
+    # Menghapus duplikat tanpa mengubah urutan.
+    return list(dict.fromkeys(collected))
+
+
+def default_worker_count(model_name: str, backend: str = DEFAULT_BACKEND) -> int:
+    """
+    Menentukan jumlah proses worker bawaan berdasarkan jumlah core CPU, ukuran model,
+    dan RAM yang tersedia (setiap worker memuat model sendiri).
+
+    Args:
+        model_name (str): Nama model Whisper yang akan dipakai.
+        backend (str, optional): Nama backend inferensi. Defaults to DEFAULT_BACKEND.
+
+    Returns:
+        int: Jumlah proses worker (minimal 1).
+    """
+    cpu_count = os.cpu_count() or 1
+    return max(1, min(cpu_count // 2, _DEFAULT_MAX_WORKERS.get(model_name, 1),
+                      max_workers_for_memory(model_name, backend)))
+
+
+class _QueueProgressSignal:
+    """
+    Meniru antarmuka 'pyqtSignal.emit' agar 'transcribe_audio' bisa melaporkan progres
+    dari dalam proses worker. Setiap update dikirim ke proses utama lewat antrean.
+    """
+    def __init__(self, progress_queue, file_path):
+        self.progress_queue = progress_queue
+        self.file_path = file_path
+
+    def emit(self, percent, message):
+        self.progress_queue.put((self.file_path, percent, message))
+
+
+def _init_worker(model_name, progress_queue, torch_threads, backend=DEFAULT_BACKEND):
+    """
+    Initializer yang dijalankan sekali di setiap proses worker.
+    Membatasi jumlah thread inferensi agar proses-proses tidak saling berebut core,
+    lalu memuat model ke cache milik proses ini lewat memory planner: jika RAM sudah
+    terpakai oleh worker lain, warm-up dilewati dan job memakai use_model() (int8,
+    model lebih kecil, atau menunggu) alih-alih memuat model melebihi RAM.
+    """
+    _worker_state["model_name"] = model_name
+    _worker_state["progress_queue"] = progress_queue
+    _worker_state["backend"] = backend
+    if torch_threads:
+        get_backend(backend).set_threads(torch_threads)
+    try:
+        preload_model(model_name, backend)
+    except Exception:
+        # Kegagalan warm-up tidak boleh merusak pool; error yang sama akan
+        # muncul lagi (dan dilaporkan per file) saat job pertama dijalankan.
+        pass
+
+
+def _transcribe_job(file_path, skip_silence=True, options=None, export_formats=("srt",), layout=None,
+                    incremental=False, use_cache=True):
+    """Job yang dijalankan di proses worker untuk satu file."""
+    signal = _QueueProgressSignal(_worker_state["progress_queue"], file_path)
+    start_time = time.perf_counter()
+    _, srt_path = transcribe_audio(file_path, _worker_state["model_name"], signal,
+                                   backend=_worker_state["backend"], skip_silence=skip_silence, options=options,
+                                   export_formats=export_formats, layout=layout, incremental=incremental,
+                                   use_cache=use_cache)
+    return srt_path, time.perf_counter() - start_time
+
+
+def _detect_language_job(file_path, pcm_path, use_cache):
+    """Job di proses worker: deteksi bahasa dari ucapan pertama di awal file (lihat detect_language())."""
+    # Lima menit pertama cukup untuk menemukan jendela ucapan pertama tanpa membaca seluruh file.
+    speech, _ = strip_non_speech(load_pcm(pcm_path)[:LANGUAGE_PROBE_SECONDS * SAMPLE_RATE])
+    if len(speech) == 0:
+        return None
+    cache = ResultCache() if use_cache else None
+    with use_model(_worker_state["model_name"], _worker_state["backend"]) as (model, _):
+        return detect_language(model, speech, file_path, _worker_state["backend"], cache)
+
+
+def submit_language_detection(pool, file_path, pcm_path, use_cache=True):
+    """
+    Mengirim deteksi bahasa satu file ke pool, agar semua potongan audio panjang memakai
+    bahasa yang sama tanpa mendeteksinya ulang per potongan.
+
+    Args:
+        pool (ProcessPoolExecutor): Pool dari create_worker_pool().
+        file_path (str): Path file sumber (untuk kunci cache bahasa).
+        pcm_path (str): Path file PCM dari masubs_common.media.extract_pcm().
+        use_cache (bool, optional): Simpan bahasa hasil deteksi di cache. Defaults to True.
+
+    Returns:
+        Future: Future yang menghasilkan kode bahasa, atau None jika tidak ada ucapan.
+    """
+    return pool.submit(_detect_language_job, file_path, pcm_path, use_cache)
+
+
+def _transcribe_chunk_job(chunk, pcm_path, skip_silence=False, options=None):
+    """
+    Job yang dijalankan di proses worker untuk satu potongan audio panjang.
+    File PCM dipetakan ke memori, dan hanya potongan milik job ini yang dibaca.
+    Mengembalikan segmen dengan waktu relatif terhadap awal potongan.
+    """
+    audio_chunk = load_pcm(pcm_path)[chunk["start"]:chunk["end"]]
+    time_map = None
+    if skip_silence:
+        # Bagian hening di dalam potongan tidak dikirim ke Whisper.
+        audio_chunk, time_map = strip_non_speech(audio_chunk)
+        if time_map.is_identity:
+            time_map = None
+    if len(audio_chunk) == 0:
+        return chunk, []
+    with use_model(_worker_state["model_name"], _worker_state["backend"]) as (model, _):
+        result = run_inference(model, audio_chunk, backend=_worker_state["backend"], options=options)
+    segments = [{key: seg[key] for key in ("start", "end", "text", "words") if key in seg}
+                for seg in result["segments"]]
+    if time_map:
+        segments = [time_map.remap_segment(segment) for segment in segments]
+    return chunk, segments
+
+
+def submit_chunk(pool, chunk, pcm_path, skip_silence=False, options=None):
+    """
+    Mengirim satu potongan audio (hasil plan_chunks) ke pool untuk ditranskripsi.
+    Yang dikirim hanya path file PCM dan batas potongannya, bukan sampel audionya.
+
+    Args:
+        pool (ProcessPoolExecutor): Pool dari create_worker_pool().
+        chunk (dict): Deskripsi potongan dengan kunci 'start' dan 'end' (indeks sampel).
+        pcm_path (str): Path file PCM dari masubs_common.media.extract_pcm().
+        skip_silence (bool, optional): Lewati bagian hening di dalam potongan. Defaults to False.
+        options (TranscribeOptions, optional): Opsi decoding (sebaiknya dengan bahasa yang sudah
+            ditentukan). Defaults to TranscribeOptions().
+
+    Returns:
+        Future: Future yang menghasilkan tuple (chunk, segmen_relatif).
+    """
+    return pool.submit(_transcribe_chunk_job, chunk, pcm_path, skip_silence, options)
+
+
+def create_worker_pool(model_name, max_workers, progress_queue=None, backend=DEFAULT_BACKEND):
+    """
+    Membuat pool proses worker yang masing-masing memuat model sendiri.
+    Jumlah thread inferensi per proses dibagi rata agar total thread tidak melebihi jumlah core.
+
+    Args:
+        model_name (str): Nama model Whisper yang dimuat di setiap worker.
+        max_workers (int): Jumlah proses worker.
+        progress_queue (multiprocessing.Queue, optional): Antrean untuk update progres dari worker.
+        backend (str, optional): Nama backend inferensi. Defaults to DEFAULT_BACKEND.
+
+    Returns:
+        ProcessPoolExecutor: Pool yang siap menerima job.
+    """
+    torch_threads = max(1, (os.cpu_count() or 1) // max_workers)
+    # 'spawn' dipakai di semua platform agar perilakunya sama dengan Windows
+    # dan proses worker tidak mewarisi state Qt dari proses utama.
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                               initializer=_init_worker,
+                               initargs=(model_name, progress_queue, torch_threads, backend))
+
+
+class BatchTranscriber:
+    """
+    Menjalankan transkripsi banyak file sekaligus menggunakan pool proses worker.
+    Setiap proses memegang model Whisper sendiri. Kegagalan pada satu file tidak
+    menghentikan file lainnya.
+
+    Event dilaporkan melalui callback 'on_event(kind, file_path, data)' dengan 'kind':
+        - "progress": data = (persen, pesan)
+        - "done":     data = path file .srt
+        - "failed":   data = pesan error
+        - "cancelled": data = None
+        - "stats":    data = dict berisi ringkasan throughput
+
+    Model di setiap proses worker dibebaskan saat pool ditutup di akhir run(), jadi tidak ada
+    opsi 'release_after'. Dengan 'incremental', setiap file memakai transkripsi inkremental
+    (lihat core_logic.transcribe_audio()). Dengan use_cache=False, cache hasil tidak dibaca maupun ditulis.
+    """
+    def __init__(self, file_paths, model_name, max_workers=None, on_event=None, backend=DEFAULT_BACKEND,
+                 skip_silence=True, options=None, export_formats=("srt",), layout=None, incremental=False,
+                 use_cache=True):
+        self.file_paths = list(file_paths)
+        self.model_name = model_name
+        self.backend = backend
+        self.skip_silence = skip_silence
+        self.options = options
+        self.export_formats = tuple(export_formats)
+        self.layout = layout
+        self.incremental = incremental
+        self.use_cache = use_cache
+        self.max_workers = max_workers or default_worker_count(model_name, backend)
+        self.on_event = on_event
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Membatalkan file yang belum mulai diproses. File yang sedang berjalan tetap diselesaikan."""
+        self._cancel_requested = True
+
+    def _emit(self, kind, file_path, data):
+        if self.on_event:
+            self.on_event(kind, file_path, data)
+
+    def _drain_progress(self, progress_queue):
+        """Meneruskan semua update progres yang menumpuk di antrean ke callback."""
+        while True:
+            try:
+                file_path, percent, message = progress_queue.get_nowait()
+            except Exception:
+                return
+            self._emit("progress", file_path, (percent, message))
+
+    def run(self) -> list:
+        """
+        Menjalankan seluruh antrean sampai selesai.
+
+        Returns:
+            list: Daftar dict per file berisi 'file_path', 'status' ("done"/"failed"/"cancelled"),
+                  'srt_path', 'error', dan 'elapsed' (detik).
+        """
+        results = {path: {"file_path": path, "status": "pending", "srt_path": None,
+                          "error": None, "elapsed": None} for path in self.file_paths}
+        if not self.file_paths:
+            return []
+
+        workers = min(self.max_workers, len(self.file_paths))
+        progress_queue = multiprocessing.get_context("spawn").Queue()
+
+        start_time = time.perf_counter()
+        completed = 0
+        failed = 0
+
+        with create_worker_pool(self.model_name, workers, progress_queue, self.backend) as pool:
+            futures = {pool.submit(_transcribe_job, path, self.skip_silence, self.options,
+                                   self.export_formats, self.layout, self.incremental, self.use_cache): path
+                       for path in self.file_paths}
+            pending = set(futures)
+
+            while pending:
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                self._drain_progress(progress_queue)
+
+                for future in done:
+                    path = futures[future]
+                    if future.cancelled():
+                        results[path]["status"] = "cancelled"
+                        self._emit("cancelled", path, None)
+                        continue
+                    try:
+                        srt_path, elapsed = future.result()
+                    except Exception as e:
+                        failed += 1
+                        results[path].update(status="failed", error=str(e))
+                        self._emit("failed", path, str(e))
+                    else:
+                        completed += 1
+                        results[path].update(status="done", srt_path=srt_path, elapsed=elapsed)
+                        self._emit("done", path, srt_path)
+
+                if self._cancel_requested:
+                    # Future yang belum berjalan bisa dibatalkan; yang sedang berjalan ditunggu.
+                    for future in list(pending):
+                        if future.cancel():
+                            pending.discard(future)
+                            path = futures[future]
+                            results[path]["status"] = "cancelled"
+                            self._emit("cancelled", path, None)
+
+                if done:
+                    wall_time = time.perf_counter() - start_time
+                    self._emit("stats", None, {
+                        "completed": completed,
+                        "failed": failed,
+                        "total": len(self.file_paths),
+                        "elapsed": wall_time,
+                        "files_per_minute": (completed + failed) / wall_time * 60 if wall_time > 0 else 0.0,
+                    })
+
+            self._drain_progress(progress_queue)
+
+        return [results[path] for path in self.file_paths]
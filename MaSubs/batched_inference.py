@@ -0,0 +1,266 @@
+import os
+import time
+
+from core_logic import use_model, plan_model, load_audio, export_transcript, AVAILABLE_MODELS, SAMPLE_RATE
+from audio_chunks import find_silence_split_points
+from speech_regions import strip_non_speech
+from result_cache import ResultCache, make_cache_key
+from backends import get_backend, DEFAULT_BACKEND
+from transcribe_options import TranscribeOptions
+from masubs_common.media import pcm_fingerprint
+from masubs_common.resegment import shift_words
+from masubs_common.instrumentation import span
+
+# Jumlah jendela 30 detik yang didekode dalam satu forward pass. Semakin besar, semakin
+# sedikit overhead per panggilan, tetapi memori aktivasi naik kira-kira linear.
+DEFAULT_BATCH_SIZE = 8
+
+# Target panjang jendela (detik) saat klip yang lebih panjang dari satu jendela Whisper
+# dipotong di bagian hening. Dengan target 20 detik dan pencarian ±4 detik, setiap
+# jendela (termasuk sisa di akhir) tidak pernah melebihi 30 detik.
+WINDOW_TARGET_SECONDS = 20.0
+WINDOW_SEARCH_SECONDS = 4.0
+
+
+def plan_windows(audio) -> list:
+    """
+    Membagi audio menjadi jendela yang masing-masing muat dalam satu input Whisper (≤ 30 detik).
+    Klip pendek menjadi satu jendela; klip yang lebih panjang dipotong di bagian hening.
+
+    Args:
+        audio (numpy.ndarray): Audio mono 16 kHz.
+
+    Returns:
+        list: Daftar tuple (awal, akhir) dalam indeks sampel.
+    """
+    split_points = find_silence_split_points(audio, target_chunk_seconds=WINDOW_TARGET_SECONDS,
+                                             search_seconds=WINDOW_SEARCH_SECONDS)
+    boundaries = [0] + split_points + [len(audio)]
+    return [(start, end) for start, end in zip(boundaries[:-1], boundaries[1:]) if end > start]
+
+
+class BatchedTranscriber:
+    """
+    Mentranskripsi banyak file pendek dengan satu model yang dimuat sekali di proses ini.
+    Jendela audio dari beberapa file dikemas menjadi satu batch per forward pass, lalu
+    segmennya dikembalikan ke file masing-masing. Cocok untuk banyak klip pendek, di mana
+    overhead per panggilan model lebih dominan daripada durasi audionya.
+
+    Berbeda dengan mode streaming, jendela tidak saling memberi konteks ('initial_prompt'),
+    karena semua jendela dalam satu batch didekode bersamaan. Hasilnya disimpan di cache
+    dengan kunci tersendiri.
+
+    Event dilaporkan dengan format yang sama seperti BatchTranscriber:
+        - "progress": data = (persen, pesan)
+        - "done":     data = path file .srt
+        - "failed":   data = pesan error
+        - "cancelled": data = None
+        - "stats":    data = dict berisi ringkasan throughput
+
+    Args:
+        file_paths (list): File audio/video yang akan diproses.
+        model_name (str): Nama model Whisper.
+        batch_size (int, optional): Jumlah jendela per forward pass. Defaults to DEFAULT_BATCH_SIZE.
+        on_event (callable, optional): Callback on_event(kind, file_path, data).
+        backend (str, optional): Nama backend inferensi. Defaults to DEFAULT_BACKEND.
+        use_cache (bool, optional): Memakai cache hasil transkripsi di disk. Defaults to True.
+        skip_silence (bool, optional): Bagian hening dibuang sebelum jendela disusun, sehingga
+            jendela yang hanya berisi dead air tidak ikut didekode. Defaults to True.
+        options (TranscribeOptions, optional): Opsi decoding untuk semua jendela. Jika bahasa tidak
+            ditentukan, bahasa dideteksi per jendela di dalam forward pass batch (file dalam satu
+            batch bisa berbeda bahasa). Defaults to TranscribeOptions().
+        export_formats (iterable, optional): Format subtitle yang ditulis per file ('srt', 'vtt',
+            'ass', 'json'). File .srt selalu ditulis. Defaults to ("srt",).
+        layout (LayoutRules, optional): Aturan tata letak subtitle yang diterapkan sebelum ditulis.
+            Tidak memengaruhi cache. Defaults to None (segmen mentah).
+        release_after (bool, optional): Bebaskan model dari memori setelah semua batch selesai.
+            Defaults to False.
+    """
+    def __init__(self, file_paths, model_name, batch_size=None, on_event=None, backend=DEFAULT_BACKEND,
+                 use_cache=True, skip_silence=True, options=None, export_formats=("srt",), layout=None,
+                 release_after=False):
+        if model_name not in AVAILABLE_MODELS:
+            raise ValueError(f"Model '{model_name}' tidak tersedia.")
+        get_backend(backend)
+        self.file_paths = list(file_paths)
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size or DEFAULT_BATCH_SIZE)
+        self.on_event = on_event
+        self.backend = backend
+        self.use_cache = use_cache
+        self.skip_silence = skip_silence
+        self.options = options or TranscribeOptions()
+        self.export_formats = ("srt",) + tuple(name for name in export_formats if name != "srt")
+        self.layout = layout
+        self.release_after = release_after
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Membatalkan file yang belum mulai didekode. Batch yang sedang berjalan tetap diselesaikan."""
+        self._cancel_requested = True
+
+    def _emit(self, kind, file_path, data):
+        if self.on_event:
+            self.on_event(kind, file_path, data)
+
+    def _cache_key(self, file_path, plan):
+        cache_options = {"mode": "batched", "window_seconds": WINDOW_TARGET_SECONDS, "fp16": False,
+                         "backend": self.backend, "precision": plan.precision, "skip_silence": self.skip_silence,
+                         **self.options.cache_options()}
+        return make_cache_key(pcm_fingerprint(file_path), plan.model_name, cache_options)
+
+    def _run(self) -> list:
+        results = {path: {"file_path": path, "status": "pending", "srt_path": None,
+                          "error": None, "elapsed": None} for path in self.file_paths}
+        start_time = time.perf_counter()
+        cache = ResultCache() if self.use_cache else None
+        # Model dan presisi yang akan dipakai menurut RAM yang tersedia (tanpa memuat model).
+        plan = plan_model(self.model_name, self.backend)
+
+        def finish(path, status, detail=None):
+            results[path]["status"] = status
+            results[path]["elapsed"] = time.perf_counter() - start_time
+            if status == "done":
+                results[path]["srt_path"] = detail
+            elif status == "failed":
+                results[path]["error"] = detail
+            self._emit(status, path, detail)
+            finished = [r for r in results.values() if r["status"] in ("done", "failed")]
+            wall_time = time.perf_counter() - start_time
+            self._emit("stats", None, {
+                "completed": sum(1 for r in finished if r["status"] == "done"),
+                "failed": sum(1 for r in finished if r["status"] == "failed"),
+                "total": len(self.file_paths),
+                "elapsed": wall_time,
+                "files_per_minute": len(finished) / wall_time * 60 if wall_time > 0 else 0.0,
+            })
+
+        # Tahap 1: dekode audio dan cek cache per file. File yang ada di cache langsung selesai
+        # tanpa menyentuh model; sisanya dipecah menjadi jendela.
+        windows = []
+        pending = {}
+        with span("audio_decode", files=len(self.file_paths)) as stage:
+            for path in self.file_paths:
+                if self._cancel_requested:
+                    finish(path, "cancelled")
+                    continue
+                try:
+                    audio = load_audio(path)
+                    output_srt_path = os.path.splitext(path)[0] + ".srt"
+                    cached = cache.get(self._cache_key(path, plan)) if cache else None
+                    if cached:
+                        export_transcript(cached["segments"], output_srt_path, self.export_formats,
+                                          {"model": cached["model"], "backend": self.backend}, self.layout)
+                        finish(path, "done", output_srt_path)
+                        continue
+                    # Jendela disusun dari audio ringkas (hanya wilayah ucapan); waktunya
+                    # dikembalikan ke posisi asli saat hasil file ditulis.
+                    time_map = None
+                    if self.skip_silence:
+                        audio, time_map = strip_non_speech(audio)
+                    file_windows = plan_windows(audio)
+                except Exception as e:
+                    finish(path, "failed", str(e))
+                    continue
+                if not file_windows:
+                    # Audio kosong: tetap hasilkan file .srt kosong agar perilakunya sama dengan mode lain.
+                    export_transcript([], output_srt_path, self.export_formats)
+                    finish(path, "done", output_srt_path)
+                    continue
+                pending[path] = {"remaining": len(file_windows), "pieces": [], "srt_path": output_srt_path,
+                                 "time_map": None if time_map is None or time_map.is_identity else time_map}
+                for start, end in file_windows:
+                    windows.append((path, start / SAMPLE_RATE, audio[start:end]))
+                self._emit("progress", path, (5, f"{len(file_windows)} jendela menunggu batch..."))
+            stage.set(windows=len(windows), files_to_decode=len(pending))
+
+        if not windows:
+            return [results[path] for path in self.file_paths]
+
+        engine = get_backend(self.backend)
+        batch_size = self.batch_size
+
+        def report(message):
+            for path in pending:
+                self._emit("progress", path, (5, message))
+
+        # Tahap 2: jendela diproses berurutan sesuai file, sehingga file pertama selesai lebih dulu
+        # dan hasilnya bisa langsung ditulis sementara batch berikutnya berjalan.
+        with use_model(self.model_name, self.backend, self.release_after, report=report) as (model, plan), \
+                span("inference", windows=len(windows), batch_size=batch_size, model=plan.model_name):
+            for batch_start in range(0, len(windows), batch_size):
+                batch = [item for item in windows[batch_start:batch_start + batch_size] if item[0] in pending]
+                if not batch:
+                    continue
+                if self._cancel_requested:
+                    for path in list(pending):
+                        pending.pop(path)
+                        finish(path, "cancelled")
+                    break
+                try:
+                    outputs = engine.transcribe_batch(model, [window for _, _, window in batch], self.options)
+                except Exception as e:
+                    # Kegagalan satu batch hanya menggagalkan file yang jendelanya ada di batch tersebut.
+                    for path in dict.fromkeys(path for path, _, _ in batch):
+                        if pending.pop(path, None) is not None:
+                            finish(path, "failed", str(e))
+                    continue
+
+                for (path, offset, _), output in zip(batch, outputs):
+                    state = pending[path]
+                    state["pieces"].append((offset, output["segments"]))
+                    state["remaining"] -= 1
+                    if state["remaining"]:
+                        total = len(state["pieces"]) + state["remaining"]
+                        percent = 10 + int(85 * len(state["pieces"]) / total)
+                        self._emit("progress", path, (percent, f"{len(state['pieces'])}/{total} jendela selesai"))
+                        continue
+                    pending.pop(path)
+                    try:
+                        srt_path = self._write_result(path, state, cache, plan)
+                    except Exception as e:
+                        finish(path, "failed", str(e))
+                    else:
+                        finish(path, "done", srt_path)
+
+        return [results[path] for path in self.file_paths]
+
+    def _write_result(self, path, state, cache, plan) -> str:
+        """Menyusun segmen global dari semua jendela satu file, menulis subtitle, dan menyimpan ke cache."""
+        segments = []
+        previous_end = 0.0
+        time_map = state["time_map"]
+        for offset, pieces in sorted(state["pieces"], key=lambda piece: piece[0]):
+            for segment in pieces:
+                # Waktu mulai tidak boleh mendahului akhir segmen sebelumnya.
+                seg_start = max(segment["start"] + offset, previous_end)
+                seg_end = max(segment["end"] + offset, seg_start)
+                previous_end = seg_end
+                item = {"start": seg_start, "end": seg_end, "text": segment["text"]}
+                if segment.get("words"):
+                    item["words"] = shift_words(segment["words"], offset)
+                segments.append(item)
+        if time_map:
+            segments = [time_map.remap_segment(segment) for segment in segments]
+        export_transcript(segments, state["srt_path"], self.export_formats,
+                          {"model": plan.model_name, "backend": self.backend, "language": self.options.language},
+                          self.layout)
+        if cache:
+            full_text = "".join(segment["text"] for segment in segments)
+            cache.put(self._cache_key(path, plan), {"model": plan.model_name, "backend": self.backend,
+                                                    "text": full_text, "segments": segments})
+        return state["srt_path"]
+
+    def run(self) -> list:
+        """
+        Menjalankan seluruh antrean sampai selesai.
+
+        Returns:
+            list: Daftar dict per file berisi 'file_path', 'status' ("done"/"failed"/"cancelled"),
+                  'srt_path', 'error', dan 'elapsed' (detik sejak antrean dimulai).
+        """
+        if not self.file_paths:
+            return []
+        with span("transcribe_batched", model_name=self.model_name, batch_size=self.batch_size,
+                  backend=self.backend, files=len(self.file_paths)):
+            return self._run()
@@ -1,12 +1,17 @@
 # cari_path.py
-import whisper
+import importlib.util
 import os
 
-# Menemukan direktori tempat pustaka whisper diinstal
-whisper_dir = os.path.dirname(whisper.__file__)
+# Menemukan direktori tempat pustaka whisper diinstal. find_spec() hanya mencari lokasi
+# paket tanpa mengimpornya, sehingga torch tidak ikut dimuat (bisa beberapa detik).
+spec = importlib.util.find_spec("whisper")
+if spec is None:
+    raise SystemExit("Pustaka whisper belum terpasang (pip install openai-whisper).")
+whisper_dir = list(spec.submodule_search_locations)[0] if spec.submodule_search_locations \
+    else os.path.dirname(spec.origin)
 
 # Membuat path ke folder assets di dalamnya
 assets_path = os.path.join(whisper_dir, 'assets')
 
 print("Salin dan gunakan path di bawah ini untuk file .spec Anda:")
-print(assets_path)
\ No newline at end of file
+print(assets_path)
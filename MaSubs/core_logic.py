@@ -1,45 +1,732 @@
-import whisper
+import gc
 import os
+import sys
+import time
+import ctypes
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 
-# Konstanta global untuk menyimpan nama model Whisper yang valid.
-# Digunakan untuk validasi input dan pengisian dropdown di GUI.
-AVAILABLE_MODELS = ["tiny", "base", "small", "medium", "large"]
+# Paket bersama 'masubs_common' berada di root repositori (satu tingkat di atas folder ini).
+# Saat dijalankan dari kode sumber, root tersebut perlu ditambahkan ke sys.path.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
 
-def format_timestamp(seconds: float) -> str:
+from masubs_common.media import probe_media, prepare_audio, pcm_fingerprint
+from masubs_common.subtitles import SrtStreamWriter
+from masubs_common.subtitle_export import export_subtitles
+from masubs_common.resegment import resegment, shift_words, LayoutRules
+from masubs_common.instrumentation import span, traced
+from audio_chunks import find_silence_split_points
+from speech_regions import strip_non_speech
+from transcribe_options import TranscribeOptions
+from result_cache import ResultCache, make_cache_key
+from incremental import (compute_fingerprint, encode_fingerprint, decode_fingerprint, align_fingerprints,
+                         plan_incremental, shift_segment)
+from backends import get_backend, DEFAULT_BACKEND, AVAILABLE_MODELS
+from memory_planner import MemoryPlan, plan_model_load, memory_guard_settings
+
+# Catatan: 'whisper' (dan torch di belakangnya) sengaja TIDAK diimpor di level modul.
+# Impor keduanya memakan beberapa detik, padahal banyak jalur (cache hit, CLI, GUI
+# yang baru dibuka) tidak membutuhkannya. Pustaka backend diimpor secara lazy saat
+# model pertama kali dimuat (lihat backends.py).
+
+# Sample rate audio yang diharapkan oleh Whisper (mono, 16 kHz).
+SAMPLE_RATE = 16000
+
+# Panjang target setiap potongan pada mode streaming (detik). Potongan dipotong di
+# bagian hening terdekat; semakin pendek, semakin cepat subtitle pertama muncul.
+STREAM_CHUNK_SECONDS = 60.0
+
+# --- Cache Model (Registry) ---
+# Memuat model Whisper bisa memakan waktu puluhan detik dan beberapa GB RAM untuk
+# model 'medium'/'large'. Model yang sudah dimuat disimpan di sini agar job berikutnya
+# dalam proses yang sama dapat langsung memakainya. Urutan OrderedDict merepresentasikan
+# urutan pemakaian (paling lama di depan) sehingga eviksi LRU cukup dengan popitem(last=False).
+# Kuncinya adalah tuple (nama_backend, nama_model, presisi), karena model yang sama dari
+# backend atau presisi berbeda adalah objek yang berbeda.
+_model_cache = OrderedDict()
+# Ukuran (dalam MB) dari setiap model yang ada di cache, dilaporkan oleh backend-nya.
+_model_sizes_mb = {}
+# Lock ini melindungi cache dari akses bersamaan (misal: preload di thread latar
+# belakang berjalan bersamaan dengan transkripsi). Pemuatan model juga dilakukan
+# di dalam lock agar model yang sama tidak pernah dimuat dua kali.
+_model_cache_lock = threading.Lock()
+# Jumlah job yang sedang memakai setiap model (lihat use_model()). Model yang sedang dipakai
+# tidak pernah dikeluarkan dari cache. Condition ini memberi tahu job yang menunggu memori
+# setiap kali sebuah job selesai memakai model.
+_model_users = {}
+_model_released = threading.Condition(_model_cache_lock)
+
+# Interval (detik) pengecekan ulang RAM saat job menunggu memori; RAM juga bisa dibebaskan
+# oleh proses lain di luar aplikasi ini.
+MEMORY_POLL_SECONDS = 5.0
+
+# Batas cache. 'max_models' membatasi jumlah model yang tetap tinggal di memori,
+# 'max_memory_mb' (opsional) membatasi total ukuran bobot model. Nilai None berarti tanpa batas.
+_model_cache_limits = {"max_models": 2, "max_memory_mb": None}
+
+
+def configure_model_cache(max_models=None, max_memory_mb=None):
+    """
+    Mengatur batas cache model. Model yang paling lama tidak dipakai akan dikeluarkan
+    (LRU) ketika salah satu batas terlampaui.
+
+    Args:
+        max_models (int, optional): Jumlah maksimal model yang disimpan. None = tanpa batas.
+        max_memory_mb (float, optional): Total maksimal ukuran bobot model dalam MB. None = tanpa batas.
     """
-    Mengonversi total detik dalam format float ke format timestamp SRT (HH:MM:SS,ms).
+    if max_models is not None and max_models < 1:
+        raise ValueError("max_models minimal 1.")
+    with _model_cache_lock:
+        _model_cache_limits["max_models"] = max_models
+        _model_cache_limits["max_memory_mb"] = max_memory_mb
+        _evict_models()
+
+
+def _evict_models(keep=None):
+    """
+    Mengeluarkan model yang paling lama tidak dipakai sampai batas cache terpenuhi.
+    Harus dipanggil saat '_model_cache_lock' sedang dipegang.
 
     Args:
-        seconds (float): Waktu dalam detik yang akan diformat.
+        keep (tuple, optional): Kunci (backend, model, presisi) yang tidak boleh dikeluarkan (model yang baru dimuat).
+    """
+    max_models = _model_cache_limits["max_models"]
+    max_memory_mb = _model_cache_limits["max_memory_mb"]
+
+    def over_limit():
+        if max_models is not None and len(_model_cache) > max_models:
+            return True
+        if max_memory_mb is not None and sum(_model_sizes_mb.values()) > max_memory_mb:
+            return True
+        return False
+
+    while over_limit():
+        # Cari model LRU yang boleh dikeluarkan. Model 'keep' dan model yang sedang dipakai
+        # tetap dipertahankan walaupun ukurannya sendiri melebihi batas memori.
+        candidates = [key for key in _model_cache if key != keep and not _model_users.get(key)]
+        if not candidates:
+            break
+        victim = candidates[0]
+        del _model_cache[victim]
+        _model_sizes_mb.pop(victim, None)
+
+
+def _model_key(model_name: str, backend: str, precision=None) -> tuple:
+    return (backend, model_name, precision or get_backend(backend).default_precision)
+
+
+def get_model(model_name: str, backend: str = DEFAULT_BACKEND, precision: str = None):
+    """
+    Mengambil model dari cache, atau memuatnya jika belum ada.
+    Fungsi ini tidak memeriksa RAM; job transkripsi sebaiknya memakai use_model().
+
+    Args:
+        model_name (str): Nama model Whisper (harus ada di AVAILABLE_MODELS).
+        backend (str, optional): Nama backend inferensi (lihat backends.BACKENDS).
+            Defaults to DEFAULT_BACKEND.
+        precision (str, optional): 'fp32' atau 'int8'. Defaults to presisi bawaan backend.
 
     Returns:
-        str: String timestamp yang sudah diformat sesuai standar SRT.
+        object: Objek model milik backend tersebut, siap dipakai oleh run_inference().
     """
-    # Memastikan input tidak negatif untuk menghindari error perhitungan.
-    assert seconds >= 0, "non-negative timestamp expected"
-    
-    # Konversi detik ke milidetik untuk perhitungan yang lebih mudah.
-    milliseconds = round(seconds * 1000.0)
+    if model_name not in AVAILABLE_MODELS:
+        raise ValueError(f"Model '{model_name}' tidak tersedia.")
+    engine = get_backend(backend)
+    key = _model_key(model_name, backend, precision)
+
+    with _model_cache_lock:
+        if key in _model_cache:
+            # Tandai sebagai model yang paling baru dipakai.
+            _model_cache.move_to_end(key)
+            return _model_cache[key]
+
+        # Memuat model. Proses ini bisa memakan waktu dan memori yang signifikan,
+        # terutama saat pertama kali dijalankan karena model perlu diunduh.
+        with span("model_load", model=model_name, backend=backend, precision=key[2]):
+            model = engine.load(model_name, key[2])
+        _model_cache[key] = model
+        _model_sizes_mb[key] = engine.model_size_mb(model, model_name)
+        _evict_models(keep=key)
+        return model
+
+
+def is_model_loaded(model_name: str, backend: str = DEFAULT_BACKEND) -> bool:
+    """Mengecek apakah model sudah ada di cache dalam presisi apa pun (tanpa memuatnya)."""
+    with _model_cache_lock:
+        return any(key[:2] == (backend, model_name) for key in _model_cache)
+
+
+def plan_model(model_name: str, backend: str = DEFAULT_BACKEND):
+    """
+    Merencanakan pemuatan model berdasarkan RAM yang tersedia dan isi cache saat ini,
+    tanpa memuat apa pun. Model yang sudah ada di cache selalu dipakai apa adanya.
+
+    Args:
+        model_name (str): Nama model yang diminta.
+        backend (str, optional): Nama backend inferensi. Defaults to DEFAULT_BACKEND.
+
+    Returns:
+        MemoryPlan: Lihat memory_planner.plan_model_load().
+    """
+    if model_name not in AVAILABLE_MODELS:
+        raise ValueError(f"Model '{model_name}' tidak tersedia.")
+    with _model_cache_lock:
+        for key in _model_cache:
+            if key[:2] == (backend, model_name):
+                return MemoryPlan(model_name, model_name, backend, key[2], "load", _model_sizes_mb.get(key, 0.0))
+        reclaimable_mb = sum(size for key, size in _model_sizes_mb.items() if not _model_users.get(key))
+        busy = any(_model_users.values())
+    return plan_model_load(model_name, backend, reclaimable_mb=reclaimable_mb, busy=busy)
+
+
+def _release_idle_models(key_filter=None) -> int:
+    """
+    Mengeluarkan model yang sedang tidak dipakai dari cache. Harus dipanggil saat
+    '_model_cache_lock' sedang dipegang. Mengembalikan jumlah model yang dikeluarkan.
+    """
+    victims = [key for key in _model_cache
+               if not _model_users.get(key) and (key_filter is None or key_filter(key))]
+    for key in victims:
+        del _model_cache[key]
+        _model_sizes_mb.pop(key, None)
+    return len(victims)
+
+
+def _trim_process_memory():
+    """
+    Menjalankan garbage collector lalu mengembalikan heap yang sudah bebas ke sistem operasi
+    (glibc malloc_trim), agar RAM benar-benar turun setelah model dibebaskan.
+    """
+    gc.collect()
+    if sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+def release_model(model_name: str = None, backend: str = None) -> int:
+    """
+    Membebaskan model dari cache secara langsung (bukan menunggu eviksi LRU), misalnya
+    setelah job besar selesai di mesin dengan RAM terbatas. Model yang masih dipakai job
+    lain tidak dibebaskan.
+
+    Args:
+        model_name (str, optional): Hanya model ini. Defaults to semua model.
+        backend (str, optional): Hanya model dari backend ini. Defaults to semua backend.
 
-    # Gunakan divmod untuk mendapatkan jam dan sisa milidetik secara efisien.
-    hours, milliseconds = divmod(milliseconds, 3_600_000)
-    minutes, milliseconds = divmod(milliseconds, 60_000)
-    seconds = milliseconds // 1_000
-    milliseconds %= 1_000
+    Returns:
+        int: Jumlah model yang dibebaskan.
+    """
+    def matches(key):
+        return (backend is None or key[0] == backend) and (model_name is None or key[1] == model_name)
+
+    with _model_released:
+        released = _release_idle_models(matches)
+        _model_released.notify_all()
+    if released:
+        _trim_process_memory()
+    return released
 
-    # Format output string dengan padding nol agar sesuai standar (misal: 01, 007).
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
 
-def transcribe_audio(file_path: str, model_name: str, progress_signal=None):
+@contextmanager
+def use_model(model_name: str, backend: str = DEFAULT_BACKEND, release_after: bool = False, report=None):
+    """
+    Memakai model untuk satu job dengan guard memori. Sebelum model dimuat, RAM yang
+    tersedia diperiksa: jika tidak cukup, model lain yang tidak dipakai dikeluarkan, model
+    dimuat dalam int8, diturunkan ke model yang lebih kecil, atau job menunggu sampai job
+    lain selesai (lihat memory_planner). Job tidak pernah dibiarkan membuat sistem OOM.
+
+    Contoh:
+        with use_model("large") as (model, plan):
+            result = run_inference(model, audio)
+
+    Args:
+        model_name (str): Nama model yang diminta.
+        backend (str, optional): Nama backend inferensi. Defaults to DEFAULT_BACKEND.
+        release_after (bool, optional): Bebaskan model dari memori setelah job selesai.
+        report (callable, optional): Dipanggil dengan pesan saat model diturunkan atau job menunggu.
+
+    Yields:
+        tuple: (model, MemoryPlan) — 'plan.model_name' dan 'plan.precision' adalah model
+               yang benar-benar dipakai.
+
+    Raises:
+        RuntimeError: Jika memori tidak kunjung tersedia dalam batas waktu tunggu.
+    """
+    deadline = time.monotonic() + memory_guard_settings()["wait_timeout"]
+    plan = plan_model(model_name, backend)
+    reported = None
+    while plan.action == "wait":
+        if report and plan.reason != reported:
+            report(plan.reason)
+            reported = plan.reason
+        with _model_released:
+            _release_idle_models()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError(f"{plan.reason} (batas waktu tunggu habis).")
+            _model_released.wait(timeout=min(remaining, MEMORY_POLL_SECONDS))
+        plan = plan_model(model_name, backend)
+
+    if plan.evict_idle:
+        with _model_cache_lock:
+            _release_idle_models()
+        _trim_process_memory()
+    if plan.reason and report and plan.reason != reported:
+        report(plan.reason)
+
+    key = _model_key(plan.model_name, backend, plan.precision)
+    with _model_cache_lock:
+        # Tandai sebagai dipakai sebelum memuat agar tidak dikeluarkan oleh job lain.
+        _model_users[key] = _model_users.get(key, 0) + 1
+    released = False
+    try:
+        model = get_model(plan.model_name, backend, plan.precision)
+        yield model, plan
+    finally:
+        with _model_released:
+            _model_users[key] -= 1
+            if not _model_users[key]:
+                del _model_users[key]
+                if release_after:
+                    released = bool(_release_idle_models(lambda candidate: candidate == key))
+            _model_released.notify_all()
+        if released:
+            _trim_process_memory()
+
+
+def preload_model(model_name: str, backend: str = DEFAULT_BACKEND):
+    """
+    Memuat model ke cache lebih awal (warm-up), misalnya saat aplikasi baru dibuka,
+    sehingga transkripsi pertama tidak perlu menunggu pemuatan model. Jika RAM tidak
+    cukup untuk model tersebut, warm-up dilewati (job nanti yang memutuskan).
+
+    Args:
+        model_name (str): Nama model Whisper yang akan dimuat.
+        backend (str, optional): Nama backend inferensi. Defaults to DEFAULT_BACKEND.
+
+    Returns:
+        MemoryPlan: Rencana pemuatan; model hanya dimuat jika 'action' adalah 'load' atau 'quantize'.
+    """
+    plan = plan_model(model_name, backend)
+    if plan.action in ("load", "quantize"):
+        get_model(plan.model_name, backend, plan.precision)
+    return plan
+
+
+def clear_model_cache():
+    """Mengosongkan cache model sehingga memorinya dapat dibebaskan."""
+    with _model_cache_lock:
+        _model_cache.clear()
+        _model_sizes_mb.clear()
+    _trim_process_memory()
+
+def probe_duration(file_path: str):
+    """
+    Membaca durasi media (detik) menggunakan ffprobe tanpa mendekode isinya.
+    Metadata disimpan di cache bersama sehingga MaSubsBurner bisa memakainya ulang.
+
+    Args:
+        file_path (str): Path ke file audio atau video.
+
+    Returns:
+        float | None: Durasi dalam detik, atau None jika tidak dapat ditentukan.
+    """
+    try:
+        return probe_media(file_path)["duration"]
+    except RuntimeError:
+        return None
+
+def format_duration(seconds: float) -> str:
+    """Mengubah detik menjadi teks durasi singkat (M:SS atau H:MM:SS) untuk status bar."""
+    seconds = max(0, int(round(seconds)))
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+class ProgressTracker:
+    """
+    Menghitung progres transkripsi dari posisi audio yang sudah didekode dibandingkan
+    durasi total, beserta estimasi sisa waktu (ETA) dan real-time factor (RTF,
+    detik audio yang diproses per detik waktu nyata).
+
+    Args:
+        total_seconds (float): Durasi total media.
+        report (callable): Fungsi report_progress(persen, pesan).
+        start_percent (int): Persentase saat transkripsi dimulai.
+        end_percent (int): Persentase saat seluruh audio selesai didekode.
+    """
+    def __init__(self, total_seconds, report, start_percent=30, end_percent=95):
+        self.total_seconds = max(total_seconds or 0.0, 1e-6)
+        self.report = report
+        self.start_percent = start_percent
+        self.end_percent = end_percent
+        self.start_time = time.perf_counter()
+        self.decoded_seconds = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    @property
+    def rtf(self) -> float:
+        """Real-time factor: detik audio per detik waktu nyata (lebih besar = lebih cepat)."""
+        elapsed = self.elapsed
+        return self.decoded_seconds / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """Estimasi sisa waktu dalam detik, atau None jika belum bisa dihitung."""
+        rtf = self.rtf
+        if rtf <= 0:
+            return None
+        return (self.total_seconds - self.decoded_seconds) / rtf
+
+    def update(self, decoded_seconds: float):
+        """Memperbarui posisi audio yang sudah didekode lalu melaporkan progres."""
+        self.decoded_seconds = min(max(decoded_seconds, self.decoded_seconds), self.total_seconds)
+        fraction = self.decoded_seconds / self.total_seconds
+        percent = self.start_percent + int((self.end_percent - self.start_percent) * fraction)
+        eta = self.eta
+        eta_text = format_duration(eta) if eta is not None else "-"
+        self.report(percent, (
+            f"Mentranskripsi {format_duration(self.decoded_seconds)}/{format_duration(self.total_seconds)}"
+            f" — ETA {eta_text} — RTF {self.rtf:.2f}x"
+        ))
+
+def load_audio(file_path: str):
+    """
+    Mendekode file audio/video menjadi array float32 mono 16 kHz menggunakan ffmpeg.
+    Hasil dekode disimpan sebagai file PCM di cache dan dipetakan ke memori, sehingga
+    file yang sama tidak perlu didekode ulang (termasuk oleh proses worker lain).
+
+    Args:
+        file_path (str): Path ke file audio atau video.
+
+    Returns:
+        numpy.ndarray: Sampel audio dalam rentang [-1.0, 1.0] (numpy.memmap).
+    """
+    return prepare_audio(file_path)
+
+def run_inference(model, audio, initial_prompt=None, backend: str = DEFAULT_BACKEND,
+                  progress_callback=None, options: TranscribeOptions = None) -> dict:
+    """
+    Menjalankan inferensi Whisper pada sebuah array audio melalui backend yang dipilih.
+    Semua jalur transkripsi (satu file, batch, potongan audio panjang) memakai fungsi ini
+    agar opsi decoding-nya selalu sama.
+
+    Args:
+        model: Objek model yang sudah dimuat oleh get_model() dengan backend yang sama.
+        audio (numpy.ndarray): Array audio mono 16 kHz.
+        initial_prompt (str, optional): Teks konteks sebelumnya untuk menjaga kesinambungan.
+        backend (str, optional): Nama backend inferensi. Defaults to DEFAULT_BACKEND.
+        progress_callback (callable, optional): Dipanggil dengan posisi (detik, relatif
+            terhadap awal 'audio') yang sudah didekode.
+        options (TranscribeOptions, optional): Opsi decoding. Defaults to TranscribeOptions().
+
+    Returns:
+        dict: Hasil dengan kunci 'text', 'segments' (list dict 'start', 'end', 'text'), dan 'language'.
+    """
+    return get_backend(backend).transcribe(model, audio, initial_prompt=initial_prompt,
+                                           progress_callback=progress_callback, options=options)
+
+def iter_transcribe(model, audio, chunk_seconds: float = STREAM_CHUNK_SECONDS, progress_callback=None,
+                    backend: str = DEFAULT_BACKEND, options: TranscribeOptions = None):
+    """
+    Generator yang menghasilkan segmen satu per satu selama transkripsi berjalan.
+
+    Audio dipotong di bagian hening terdekat dari setiap kelipatan 'chunk_seconds' lalu
+    ditranskripsi berurutan. Segmen setiap potongan langsung di-yield dengan timestamp
+    global, sehingga pemanggil bisa menulis/menampilkan subtitle sebelum seluruh file selesai.
+    Teks akhir potongan sebelumnya dipakai sebagai 'initial_prompt' agar konteks antar-potongan
+    tetap terjaga seperti pada transkripsi utuh.
+
+    Args:
+        model: Objek model Whisper yang sudah dimuat.
+        audio (numpy.ndarray): Audio mono 16 kHz dari load_audio().
+        chunk_seconds (float): Panjang target setiap potongan.
+        progress_callback (callable, optional): Dipanggil dengan posisi audio (detik, global)
+            yang sudah didekode, setiap kali Whisper menyelesaikan satu jendela 30 detik.
+        backend (str, optional): Nama backend inferensi. Defaults to DEFAULT_BACKEND.
+        options (TranscribeOptions, optional): Opsi decoding untuk setiap potongan. Sebaiknya
+            bahasanya sudah ditentukan, agar deteksi bahasa tidak diulang per potongan.
+
+    Yields:
+        dict: Segmen dengan kunci 'start', 'end', dan 'text' (waktu dalam detik, global),
+              ditambah 'words' jika options.word_timestamps aktif.
+    """
+    boundaries = [0] + find_silence_split_points(audio, target_chunk_seconds=chunk_seconds,
+                                                 search_seconds=chunk_seconds / 6) + [len(audio)]
+    previous_end = 0.0
+    previous_text = ""
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        if end <= start:
+            # Audio kosong (misal seluruh file hening setelah bagian non-ucapan dibuang).
+            continue
+        offset = start / SAMPLE_RATE
+        # Backend melaporkan posisi relatif terhadap potongan; ubah menjadi posisi global.
+        piece_callback = (lambda seconds, offset=offset: progress_callback(offset + seconds)) \
+            if progress_callback else None
+        result = run_inference(model, audio[start:end], initial_prompt=previous_text[-200:] or None,
+                               backend=backend, progress_callback=piece_callback, options=options)
+        for segment in result["segments"]:
+            text = segment["text"]
+            if not text.strip():
+                continue
+            # Waktu mulai tidak boleh mendahului akhir segmen sebelumnya.
+            seg_start = max(segment["start"] + offset, previous_end)
+            seg_end = max(segment["end"] + offset, seg_start)
+            previous_end = seg_end
+            item = {"start": seg_start, "end": seg_end, "text": text}
+            if segment.get("words"):
+                item["words"] = shift_words(segment["words"], offset)
+            yield item
+        previous_text += result["text"]
+
+def _stream_cache_key(file_path: str, plan, skip_silence: bool = True, options: TranscribeOptions = None) -> str:
+    """Kunci cache mode streaming untuk model dan presisi yang dipilih oleh rencana memori."""
+    # Backend dan presisi ikut menjadi bagian kunci karena hasil int8 bisa sedikit berbeda dari FP32.
+    cache_options = {"mode": "stream", "chunk_seconds": STREAM_CHUNK_SECONDS, "fp16": False,
+                     "backend": plan.backend, "precision": plan.precision, "skip_silence": skip_silence,
+                     **(options or TranscribeOptions()).cache_options()}
+    return make_cache_key(pcm_fingerprint(file_path), plan.model_name, cache_options)
+
+def _incremental_cache_key(source_path: str, plan, skip_silence: bool = True,
+                           options: TranscribeOptions = None) -> str:
+    """
+    Kunci transkripsi terakhir untuk sebuah path file (bukan isinya), dipakai mode inkremental:
+    setelah file diedit dan diekspor ulang ke path yang sama, hasil lamanya tetap bisa ditemukan.
+    """
+    cache_options = {"mode": "incremental", "backend": plan.backend, "precision": plan.precision,
+                     "skip_silence": skip_silence, **(options or TranscribeOptions()).cache_options()}
+    source = "path:" + os.path.normcase(os.path.abspath(source_path))
+    return make_cache_key(source, plan.model_name, cache_options)
+
+def _remember_transcript(cache, file_path: str, audio, plan, skip_silence: bool, options: TranscribeOptions,
+                         entry: dict, fingerprint=None):
+    """
+    Menyimpan transkripsi beserta sidik jari audionya sebagai versi terakhir file ini, agar
+    transkripsi inkremental berikutnya bisa memakai ulang bagian yang tidak berubah.
+    """
+    key = _incremental_cache_key(file_path, plan, skip_silence, options)
+    pcm_hash = pcm_fingerprint(file_path)
+    current = cache.get(key)
+    if current and current.get("pcm_hash") == pcm_hash:
+        return
+    if fingerprint is None:
+        with span("fingerprint") as stage:
+            fingerprint = compute_fingerprint(audio)
+            stage.set(frames=len(fingerprint))
+    cache.put(key, {"model": entry["model"], "backend": entry.get("backend"), "language": entry.get("language"),
+                    "text": entry["text"], "segments": entry["segments"], "pcm_hash": pcm_hash,
+                    "fingerprint": encode_fingerprint(fingerprint)})
+
+def _transcribe_changed_regions(model, audio, regions, tracker, skip_silence: bool = True,
+                                backend: str = DEFAULT_BACKEND, options: TranscribeOptions = None):
+    """
+    Mentranskripsi hanya bagian audio yang berubah (hasil plan_incremental()).
+
+    Args:
+        model: Model yang sudah dimuat.
+        audio (numpy.ndarray): Audio lengkap file baru.
+        regions (iterable): Tuple (awal, akhir) dalam detik.
+        tracker (ProgressTracker): Penerima progres; total detiknya diisi ulang di sini.
+        skip_silence (bool): Lewati bagian tanpa ucapan di dalam setiap bagian.
+        backend (str, optional): Nama backend inferensi.
+        options (TranscribeOptions, optional): Opsi decoding (sebaiknya bahasanya sudah ditentukan).
+
+    Returns:
+        list: Segmen baru dengan waktu pada file lengkap.
+    """
+    pieces = []
+    for start, end in regions:
+        piece = audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+        time_map = None
+        if skip_silence:
+            piece, time_map = strip_non_speech(piece)
+            if time_map.is_identity:
+                time_map = None
+        if len(piece):
+            pieces.append((start, piece, time_map))
+    tracker.total_seconds = max(sum(len(piece) for _, piece, _ in pieces) / SAMPLE_RATE, 1e-6)
+
+    segments = []
+    decoded = 0.0
+    for start, piece, time_map in pieces:
+        callback = lambda seconds, decoded=decoded: tracker.update(decoded + seconds)
+        for segment in iter_transcribe(model, piece, progress_callback=callback, backend=backend, options=options):
+            if time_map:
+                segment = time_map.remap_segment(segment)
+            segments.append(shift_segment(segment, start))
+        decoded += len(piece) / SAMPLE_RATE
+    return segments
+
+def _transcribe_incremental(previous: dict, audio, fingerprint, file_path: str, model_name: str, backend: str,
+                            release_after: bool, skip_silence: bool, options: TranscribeOptions, cache,
+                            report_progress):
+    """
+    Transkripsi ulang sebagian: audio file baru dicocokkan dengan sidik jari versi sebelumnya,
+    segmen lama pada bagian yang tidak berubah digeser ke posisi barunya, dan model hanya
+    dijalankan pada bagian yang disisipkan atau di sekitar titik potong.
+
+    Returns:
+        tuple | None: (segmen, MemoryPlan, bahasa, detik_dipakai_ulang), atau None jika tidak ada
+                      bagian yang cocok (file lain sama sekali) sehingga transkripsi biasa lebih tepat.
+    """
+    plan = plan_model(model_name, backend)
+    with span("align") as stage:
+        runs = align_fingerprints(decode_fingerprint(previous["fingerprint"]), fingerprint)
+        edit_plan = plan_incremental(previous["segments"], runs, len(audio) / SAMPLE_RATE)
+        stage.set(runs=len(runs), regions=len(edit_plan.regions), reused_seconds=edit_plan.reused_seconds,
+                  changed_seconds=edit_plan.changed_seconds)
+    if edit_plan.regions and not edit_plan.kept_segments:
+        return None
+    report_progress(8, f"{format_duration(edit_plan.reused_seconds)} tidak berubah; mentranskripsi ulang "
+                       f"{format_duration(edit_plan.changed_seconds)}...")
+
+    # Bahasa versi lama tetap berlaku untuk file hasil editnya.
+    language = options.language or previous.get("language")
+    new_segments = []
+    if edit_plan.regions:
+        report_progress(10, f"Mempersiapkan model '{model_name}'...")
+        with use_model(model_name, backend, release_after, report=lambda message: report_progress(10, message)) \
+                as (model, plan):
+            if language is None:
+                language = detect_language(model, audio, file_path, backend, cache)
+            tracker = ProgressTracker(edit_plan.changed_seconds, report_progress)
+            with span("inference", audio_seconds=edit_plan.changed_seconds, model=plan.model_name,
+                      precision=plan.precision, incremental=True) as stage:
+                new_segments = _transcribe_changed_regions(model, audio, edit_plan.regions, tracker, skip_silence,
+                                                           backend, options.with_language(language))
+                stage.set(segments=len(new_segments), rtf=tracker.rtf)
+
+    # Segmen lama dan baru digabung berurutan; waktu mulai tidak boleh mendahului segmen sebelumnya.
+    segments = []
+    for segment in sorted(list(edit_plan.kept_segments) + new_segments, key=lambda item: item["start"]):
+        if segments and segment["start"] < segments[-1]["end"]:
+            previous_end = segments[-1]["end"]
+            segment = {**segment, "start": previous_end, "end": max(segment["end"], previous_end)}
+        segments.append(segment)
+    return segments, plan, language, edit_plan.reused_seconds
+
+def _language_cache_key(file_path: str) -> str:
+    # Bahasa adalah sifat sumber audionya, jadi kuncinya tidak bergantung pada model atau opsi.
+    return make_cache_key(pcm_fingerprint(file_path), "*", {"mode": "language"})
+
+def cached_language(file_path: str, cache=None):
+    """
+    Mengambil bahasa hasil deteksi sebelumnya untuk sumber audio ini.
+
+    Args:
+        file_path (str): Path file audio/video.
+        cache (ResultCache, optional): Cache yang dipakai. Defaults to ResultCache().
+
+    Returns:
+        str | None: Kode bahasa, atau None jika belum pernah dideteksi.
+    """
+    entry = (cache or ResultCache()).get(_language_cache_key(file_path))
+    return entry.get("language") if entry else None
+
+def detect_language(model, audio, file_path: str, backend: str = DEFAULT_BACKEND, cache=None) -> str:
+    """
+    Mendeteksi bahasa sekali per sumber audio. Hasilnya disimpan di cache sehingga transkripsi
+    berikutnya (model, backend, atau opsi lain) tidak perlu menjalankan deteksi lagi.
+
+    Args:
+        model: Model yang sudah dimuat dengan backend yang sama.
+        audio (numpy.ndarray): Audio untuk deteksi; sebaiknya sudah tanpa bagian hening agar
+            jendela pertama berisi ucapan.
+        file_path (str): Path file sumber (untuk kunci cache).
+        backend (str, optional): Nama backend inferensi. Defaults to DEFAULT_BACKEND.
+        cache (ResultCache, optional): Cache untuk menyimpan hasil. None = tanpa cache.
+
+    Returns:
+        str: Kode bahasa.
+    """
+    language = cached_language(file_path, cache) if cache else None
+    with span("language_detect", cached=bool(language)) as stage:
+        if not language:
+            language = get_backend(backend).detect_language(model, audio)
+            if cache:
+                cache.put(_language_cache_key(file_path), {"language": language})
+        stage.set(language=language)
+    return language
+
+def export_transcript(segments, output_srt_path: str, formats, metadata: dict = None,
+                      layout: LayoutRules = None) -> dict:
+    """
+    Menulis segmen ke format subtitle yang diminta di samping file .srt (nama sama,
+    ekstensi berbeda). Dipanggil setelah inferensi selesai atau saat hasil diambil dari cache.
+
+    Args:
+        segments (list): Daftar dict segmen dengan kunci 'start', 'end', dan 'text'.
+        output_srt_path (str): Path file .srt; ekstensinya diganti sesuai format.
+        formats (iterable): Format yang ditulis ('srt', 'vtt', 'ass', 'json').
+        metadata (dict, optional): Informasi tambahan untuk format 'json'.
+        layout (LayoutRules, optional): Jika diisi, segmen disusun ulang dengan resegment()
+            sebelum ditulis (panjang baris, durasi, kecepatan baca). Segmen mentah tidak diubah.
+
+    Returns:
+        dict: Nama format -> path file yang ditulis.
+    """
+    formats = tuple(formats)
+    if not formats:
+        return {}
+    if layout:
+        with span("resegment", segments=len(segments)) as stage:
+            segments = resegment(segments, layout)
+            stage.set(cues=len(segments))
+    with span("export", formats=",".join(formats), segments=len(segments)):
+        return export_subtitles(segments, os.path.splitext(output_srt_path)[0], formats, metadata=metadata)
+
+@traced("transcribe", "file_path", "model_name", "backend")
+def transcribe_audio(file_path: str, model_name: str, progress_signal=None, segment_signal=None,
+                     use_cache: bool = True, backend: str = DEFAULT_BACKEND, release_after: bool = False,
+                     skip_silence: bool = True, options: TranscribeOptions = None, export_formats=("srt",),
+                     layout: LayoutRules = None, incremental: bool = False, previous_path: str = None):
     """
     Fungsi utama untuk melakukan transkripsi pada file audio/video.
     Fungsi ini juga akan membuat file .srt secara otomatis dan melaporkan progresnya 
-    kembali ke GUI melalui sinyal PyQt.
+    kembali ke GUI melalui sinyal PyQt. Segmen ditulis ke file .srt segera setelah
+    didekode, sehingga subtitle pertama tersedia jauh sebelum transkripsi selesai.
 
     Args:
         file_path (str): Path absolut ke file audio atau video yang akan diproses.
         model_name (str): Nama model Whisper yang akan digunakan (harus ada di AVAILABLE_MODELS).
         progress_signal (pyqtSignal, optional): Objek sinyal dari PyQt untuk mengirim progres. Defaults to None.
+        segment_signal (pyqtSignal, optional): Sinyal yang menerima setiap segmen (dict) begitu
+            selesai didekode, untuk pratinjau langsung. Defaults to None.
+        use_cache (bool, optional): Memakai cache hasil transkripsi di disk. Jika audio yang sama
+            sudah pernah ditranskripsi dengan model dan opsi yang sama, model tidak dijalankan lagi.
+            Defaults to True.
+        backend (str, optional): Mesin inferensi yang dipakai, misal 'openai-whisper' (FP32) atau
+            'faster-whisper' (int8). Segmen keluarannya berbentuk sama sehingga file .srt tetap
+            ditulis dengan cara yang sama. Defaults to DEFAULT_BACKEND.
+        release_after (bool, optional): Bebaskan model dari memori setelah job selesai, untuk
+            mesin dengan RAM terbatas. Defaults to False.
+        skip_silence (bool, optional): Hanya wilayah yang berisi ucapan yang dikirim ke Whisper;
+            bagian hening panjang dilewati dan timestamp dikembalikan ke posisi aslinya.
+            Mempercepat file dengan banyak dead air dan mencegah subtitle halusinasi. Defaults to True.
+        options (TranscribeOptions, optional): Opsi decoding (bahasa, beam size, fallback temperatur,
+            konteks teks sebelumnya). Jika bahasa tidak ditentukan, bahasa dideteksi sekali per file
+            dan di-cache per sumber audio. Defaults to TranscribeOptions() (jalur cepat).
+        export_formats (iterable, optional): Format subtitle yang ditulis di samping file input
+            ('srt', 'vtt', 'ass', 'json'). File .srt selalu ditulis. Defaults to ("srt",).
+        layout (LayoutRules, optional): Aturan tata letak subtitle. Jika diisi, semua file subtitle
+            (termasuk .srt hasil streaming) ditulis ulang dari segmen yang disusun ulang setelah
+            inferensi. Tidak memengaruhi cache, jadi tata letak bisa diubah tanpa transkripsi ulang.
+        incremental (bool, optional): Jika file ini (atau 'previous_path') pernah ditranskripsi dengan
+            model dan opsi yang sama lalu diedit (dipotong/disisipi), audio baru dicocokkan dengan
+            sidik jari versi lama dan model hanya dijalankan pada bagian yang berubah; segmen lainnya
+            dipakai ulang dengan timestamp yang digeser. Butuh use_cache. Defaults to False.
+        previous_path (str, optional): Path versi lama jika file hasil edit disimpan dengan nama lain.
+            Defaults to file_path (file diekspor ulang ke path yang sama).
 
     Returns:
         tuple: Sebuah tuple berisi (string_transkripsi_penuh, path_ke_file_srt).
@@ -51,42 +738,160 @@ def transcribe_audio(file_path: str, model_name: str, progress_signal=None):
         if progress_signal:
             progress_signal.emit(percent, message)
 
-    # Melaporkan tahap awal proses ke GUI.
-    report_progress(10, f"Mempersiapkan model '{model_name}'...")
     if model_name not in AVAILABLE_MODELS:
         raise ValueError(f"Model '{model_name}' tidak tersedia.")
+    # Validasi nama backend sebelum audio didekode.
+    get_backend(backend)
+    options = options or TranscribeOptions()
+    # File .srt ditulis langsung selama inferensi; format lain dibuat sekali setelahnya.
+    # Dengan aturan tata letak, .srt mentah hasil streaming juga ditimpa setelah inferensi.
+    extra_formats = tuple(name for name in export_formats if name != "srt")
+    final_formats = ("srt",) + extra_formats if layout else extra_formats
 
-    # Memuat model Whisper. Proses ini bisa memakan waktu dan memori yang signifikan,
-    # terutama saat pertama kali dijalankan karena model perlu diunduh.
-    model = whisper.load_model(model_name)
-    report_progress(30, f"Model '{model_name}' dimuat. Memulai transkripsi...")
+    # Durasi total diperiksa sekali di awal agar progres dan ETA bisa dihitung dari posisi
+    # audio yang sudah didekode. Jika ffprobe gagal, panjang audio hasil dekode dipakai.
+    report_progress(5, "Mendekode audio...")
+    with span("audio_decode") as stage:
+        total_seconds = probe_duration(file_path)
 
-    # Menjalankan proses transkripsi utama.
-    # 'fp16=False' digunakan untuk kompatibilitas CPU yang lebih luas.
-    # 'verbose=False' untuk mencegah Whisper mencetak log progresnya sendiri ke konsol.
-    result = model.transcribe(file_path, fp16=False, verbose=False)
-    report_progress(60, "Transkripsi audio selesai. Memformat output...")
+        # Mendekode audio sekali menjadi array 16 kHz agar bisa diproses per potongan.
+        audio = load_audio(file_path)
+        stage.set(audio_seconds=len(audio) / SAMPLE_RATE)
 
     # Menentukan nama dan path file output .srt.
     # Dibuat di direktori yang sama dengan file input dengan mengganti ekstensinya.
     output_srt_path = os.path.splitext(file_path)[0] + ".srt"
-    
-    # Membuka file .srt untuk ditulis dan melakukan iterasi pada hasil transkripsi.
-    with open(output_srt_path, "w", encoding="utf-8") as srt_file:
-        # 'result["segments"]' berisi daftar segmen teks beserta waktu mulai dan selesainya.
-        for i, segment in enumerate(result["segments"]):
-            # Menulis setiap blok subtitle sesuai format standar SRT.
-            # 1. Nomor urut
-            srt_file.write(f"{i + 1}\n")
-            # 2. Timestamp (Mulai --> Selesai)
-            start_time = format_timestamp(segment['start'])
-            end_time = format_timestamp(segment['end'])
-            srt_file.write(f"{start_time} --> {end_time}\n")
-            # 3. Teks subtitle
-            srt_file.write(f"{segment['text'].strip()}\n\n")
-
-    # Melaporkan bahwa proses penyimpanan file telah selesai.
-    report_progress(95, f"File SRT disimpan di: {output_srt_path}")
+
+    # Rencana pemuatan model (tanpa memuatnya) menentukan model dan presisi yang akan dipakai,
+    # sehingga kunci cache sesuai dengan model yang benar-benar menjalankan inferensi.
+    plan = plan_model(model_name, backend)
+
+    # Cek cache hasil sebelum memuat model: jika audio ini sudah pernah ditranskripsi,
+    # file .srt cukup dibuat ulang dari segmen yang tersimpan.
+    cache = ResultCache() if use_cache else None
+    # Versi sebelumnya disimpan di cache hasil, jadi mode inkremental hanya berlaku dengan cache.
+    incremental = incremental and cache is not None
+    if cache:
+        with span("cache_lookup") as stage:
+            cached = cache.get(_stream_cache_key(file_path, plan, skip_silence, options))
+            stage.set(hit=bool(cached))
+        if cached:
+            if incremental:
+                _remember_transcript(cache, file_path, audio, plan, skip_silence, options, cached)
+            export_transcript(cached["segments"], output_srt_path, ("srt",) + extra_formats,
+                              {"model": cached["model"], "backend": backend, "language": cached.get("language")},
+                              layout)
+            if segment_signal:
+                for segment in cached["segments"]:
+                    segment_signal.emit(segment)
+            report_progress(95, f"Hasil diambil dari cache. File SRT disimpan di: {output_srt_path}")
+            return (cached["text"], output_srt_path)
+
+    # Mode inkremental: cocokkan audio dengan versi sebelumnya, lalu transkripsi hanya bagian yang berubah.
+    fingerprint = None
+    if incremental:
+        with span("fingerprint") as stage:
+            fingerprint = compute_fingerprint(audio)
+            stage.set(frames=len(fingerprint))
+        previous = cache.get(_incremental_cache_key(previous_path or file_path, plan, skip_silence, options))
+        result = _transcribe_incremental(previous, audio, fingerprint, file_path, model_name, backend, release_after,
+                                         skip_silence, options, cache, report_progress) if previous else None
+        if result:
+            segments, plan, language, reused_seconds = result
+            full_text = "".join(segment["text"] for segment in segments)
+            entry = {"model": plan.model_name, "backend": backend, "language": language,
+                     "text": full_text, "segments": segments}
+            export_transcript(segments, output_srt_path, ("srt",) + extra_formats,
+                              {"model": plan.model_name, "backend": backend, "language": language}, layout)
+            if segment_signal:
+                for segment in segments:
+                    segment_signal.emit(segment)
+            with span("cache_store"):
+                cache.put(_stream_cache_key(file_path, plan, skip_silence, options), entry)
+                _remember_transcript(cache, file_path, audio, plan, skip_silence, options, entry, fingerprint)
+            report_progress(95, f"File SRT disimpan di: {output_srt_path} "
+                                f"({format_duration(reused_seconds)} dipakai ulang dari transkripsi sebelumnya)")
+            return (full_text, output_srt_path)
+
+    # Pra-proses: buang bagian hening panjang agar Whisper hanya mendekode wilayah ucapan.
+    # Waktu segmen dari audio ringkas dipetakan kembali ke waktu asli dengan time_map.
+    time_map = None
+    speech_audio = audio
+    if skip_silence:
+        with span("speech_detect") as stage:
+            speech_audio, time_map = strip_non_speech(audio)
+            skipped_seconds = (len(audio) - len(speech_audio)) / SAMPLE_RATE
+            stage.set(speech_seconds=len(speech_audio) / SAMPLE_RATE, skipped_seconds=skipped_seconds)
+        if time_map.is_identity:
+            time_map = None
+        else:
+            report_progress(8, f"Melewati {format_duration(max(skipped_seconds, 0.0))} bagian tanpa ucapan...")
+        if len(speech_audio) == 0:
+            # Tidak ada ucapan sama sekali: hasilnya kosong, model tidak perlu dimuat.
+            entry = {"model": plan.model_name, "backend": backend, "language": options.language,
+                     "text": "", "segments": []}
+            export_transcript([], output_srt_path, ("srt",) + extra_formats,
+                              {"model": plan.model_name, "backend": backend, "language": options.language}, layout)
+            if cache:
+                with span("cache_store"):
+                    cache.put(_stream_cache_key(file_path, plan, skip_silence, options), entry)
+                    if incremental:
+                        _remember_transcript(cache, file_path, audio, plan, skip_silence, options, entry,
+                                             fingerprint)
+            report_progress(95, f"Tidak ada ucapan yang terdeteksi. File SRT kosong disimpan di: {output_srt_path}")
+            return ("", output_srt_path)
+
+    # Melaporkan tahap persiapan model ke GUI.
+    report_progress(10, f"Mempersiapkan model '{model_name}'...")
+
+    # Mengambil model dari cache melalui guard memori. Hanya job pertama (atau setelah model
+    # dikeluarkan dari cache) yang benar-benar membayar biaya pemuatan model.
+    with use_model(model_name, backend, release_after, report=lambda message: report_progress(10, message)) \
+            as (model, plan):
+        # Bahasa ditentukan sekali untuk seluruh file, bukan dideteksi ulang di setiap potongan.
+        decode_options = options
+        if options.language is None and len(speech_audio):
+            decode_options = options.with_language(detect_language(model, speech_audio, file_path, backend, cache))
+        language_text = f" (bahasa: {decode_options.language})" if decode_options.language else ""
+        report_progress(30, f"Model '{plan.model_name}' dimuat{language_text}. Memulai transkripsi...")
+        # Progres dan ETA dihitung dari audio yang benar-benar didekode.
+        tracker_seconds = len(speech_audio) / SAMPLE_RATE if time_map else total_seconds or len(audio) / SAMPLE_RATE
+        tracker = ProgressTracker(tracker_seconds, report_progress)
+
+        # Menjalankan proses transkripsi utama secara streaming: setiap segmen langsung
+        # ditulis ke file .srt dan dikirim ke GUI.
+        # Penulisan .srt terjadi di sela inferensi, jadi waktunya dijumlahkan sebagai atribut span.
+        segments = []
+        write_seconds = 0.0
+        with span("inference", audio_seconds=len(speech_audio) / SAMPLE_RATE, model=plan.model_name,
+                  precision=plan.precision) as stage:
+            with SrtStreamWriter(output_srt_path) as writer:
+                for segment in iter_transcribe(model, speech_audio, progress_callback=tracker.update,
+                                               backend=backend, options=decode_options):
+                    if time_map:
+                        segment = time_map.remap_segment(segment)
+                    write_start = time.perf_counter()
+                    writer.write_segment(segment)
+                    write_seconds += time.perf_counter() - write_start
+                    segments.append(segment)
+                    if segment_signal:
+                        segment_signal.emit(segment)
+            stage.set(segments=len(segments), srt_write_seconds=write_seconds, rtf=tracker.rtf)
+    full_text = "".join(segment["text"] for segment in segments)
+    export_transcript(segments, output_srt_path, final_formats,
+                      {"model": plan.model_name, "backend": backend, "language": decode_options.language}, layout)
+
+    # Menyimpan segmen mentah ke cache agar ekspor ulang tidak perlu menjalankan model lagi.
+    if cache:
+        with span("cache_store"):
+            entry = {"model": plan.model_name, "backend": backend, "language": decode_options.language,
+                     "text": full_text, "segments": segments}
+            cache.put(_stream_cache_key(file_path, plan, skip_silence, options), entry)
+            if incremental:
+                _remember_transcript(cache, file_path, audio, plan, skip_silence, options, entry, fingerprint)
+
+    # Melaporkan bahwa proses penyimpanan file telah selesai, beserta RTF keseluruhan.
+    report_progress(95, f"File SRT disimpan di: {output_srt_path} (RTF {tracker.rtf:.2f}x)")
     
     # Mengembalikan hasil akhir sebagai tuple yang akan digunakan oleh GUI.
-    return (result["text"], output_srt_path)
\ No newline at end of file
+    return (full_text, output_srt_path)
@@ -0,0 +1,315 @@
+import base64
+from dataclasses import dataclass
+
+import numpy as np
+
+from masubs_common.resegment import shift_words
+from audio_chunks import SAMPLE_RATE
+
+# Sidik jari audio dihitung per frame: energi di beberapa pita frekuensi dibandingkan dengan
+# pita tetangganya dan frame sebelumnya, lalu setiap perbandingan menjadi satu bit. Hasilnya
+# (16 bit per frame) tetap mirip setelah audio di-encode ulang atau bergeser sedikit, jadi
+# bagian yang sama pada file lama dan file hasil edit bisa ditemukan tanpa menjalankan model.
+FRAME_SAMPLES = 4096
+HOP_SECONDS = 0.02
+HOP_SAMPLES = int(HOP_SECONDS * SAMPLE_RATE)
+# 17 pita (skala logaritmik, rentang utama ucapan) -> 16 selisih antar-pita -> 16 bit.
+BAND_EDGES_HZ = np.geomspace(300.0, 4000.0, 18)
+FINGERPRINT_BITS = len(BAND_EDGES_HZ) - 2
+
+# Frame yang lebih pelan dari ini (RMS, dBFS) dianggap hening dan bernilai 0. Bagian hening
+# pada kedua file dianggap sama, jadi room tone di sela ucapan tidak ikut ditranskripsi ulang.
+SILENCE_DB = -50.0
+
+# Jumlah frame yang diproses sekaligus saat menghitung sidik jari (membatasi memori FFT).
+FINGERPRINT_BATCH_FRAMES = 2048
+
+# Satuan pencocokan. File baru dibagi menjadi blok sepanjang ini; setiap blok dicari posisinya
+# di file lama. Blok yang memuat titik potong editan tidak cocok dan ikut ditranskripsi ulang.
+BLOCK_SECONDS = 2.0
+# Blok dianggap sama jika proporsi bit yang berbeda di bawah batas ini (audio acak ~0.5).
+MATCH_BIT_ERROR = 0.3
+# Batas bagian yang cocok diperhalus per frame dengan rata-rata selisih bit sepanjang sekian
+# frame (0.2 detik), karena titik edit jarang tepat di batas blok.
+EDGE_FRAMES = 10
+# Nilai sidik jari yang muncul terlalu sering di file lama (misal bagian hening) tidak dipakai
+# sebagai kandidat posisi, karena hanya menambah kandidat tanpa informasi.
+MAX_VALUE_OCCURRENCES = 64
+# Kandidat pergeseran terbanyak yang diperiksa per blok (selain pergeseran blok sebelumnya).
+MAX_CANDIDATES = 3
+
+# Toleransi (detik) segmen lama yang sedikit melewati batas bagian yang cocok tetapi tetap dipakai.
+SEGMENT_TOLERANCE_SECONDS = 0.1
+# Bagian yang ditranskripsi ulang diperlebar sekian detik ke kiri dan kanan agar kata di
+# sekitar titik potong tidak terpotong.
+EDGE_PADDING_SECONDS = 0.5
+
+# Tabel jumlah bit 1 untuk setiap nilai 16 bit, untuk menghitung selisih bit secara vektor.
+_POPCOUNT = np.array([bin(value).count("1") for value in range(1 << 16)], dtype=np.uint8)
+
+
+def compute_fingerprint(audio, sample_rate: int = SAMPLE_RATE):
+    """
+    Menghitung sidik jari audio per frame (setiap HOP_SECONDS).
+
+    Args:
+        audio (numpy.ndarray): Sampel audio mono float32 16 kHz.
+        sample_rate (int): Sample rate audio.
+
+    Returns:
+        numpy.ndarray: Array uint16, satu nilai per frame. Frame hening (di bawah SILENCE_DB) bernilai 0.
+    """
+    frame_count = (len(audio) - FRAME_SAMPLES) // HOP_SAMPLES + 1 if len(audio) >= FRAME_SAMPLES else 0
+    fingerprint = np.zeros(frame_count, dtype=np.uint16)
+    if frame_count == 0:
+        return fingerprint
+
+    frames = np.lib.stride_tricks.sliding_window_view(np.asarray(audio), FRAME_SAMPLES)[::HOP_SAMPLES]
+    window = np.hanning(FRAME_SAMPLES).astype(np.float32)
+    window_power = float(np.mean(window * window))
+    bins = np.searchsorted(np.fft.rfftfreq(FRAME_SAMPLES, 1.0 / sample_rate), BAND_EDGES_HZ)
+    weights = (1 << np.arange(FINGERPRINT_BITS)).astype(np.uint32)
+    previous = None
+    for start in range(0, frame_count, FINGERPRINT_BATCH_FRAMES):
+        batch = frames[start:start + FINGERPRINT_BATCH_FRAMES] * window
+        spectrum = np.fft.rfft(batch, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        # Energi per pita (dalam log); batas bawah kecil membuat bagian hening bernilai konstan.
+        bands = np.log10(np.add.reduceat(power, bins, axis=1)[:, :-1] + 1e-10)
+        band_diff = bands[:, :-1] - bands[:, 1:]
+        # Selisih antar-pita dibandingkan dengan frame sebelumnya (termasuk frame terakhir batch lalu).
+        if previous is None:
+            previous = band_diff[:1]
+        time_diff = band_diff - np.concatenate((previous, band_diff[:-1]))
+        previous = band_diff[-1:]
+        values = ((time_diff > 0) @ weights).astype(np.uint16)
+        loudness = 10.0 * np.log10(np.mean(batch * batch, axis=1) / window_power + 1e-20)
+        values[loudness < SILENCE_DB] = 0
+        fingerprint[start:start + len(batch)] = values
+    return fingerprint
+
+
+def encode_fingerprint(fingerprint) -> str:
+    """Sidik jari dalam bentuk teks (base64) agar bisa disimpan di entri cache JSON."""
+    return base64.b64encode(np.asarray(fingerprint, dtype="<u2").tobytes()).decode("ascii")
+
+
+def decode_fingerprint(text: str):
+    return np.frombuffer(base64.b64decode(text), dtype="<u2").astype(np.uint16)
+
+
+def _bit_error(old, new, offset: int, start: int, end: int):
+    """Proporsi bit yang berbeda antara new[start:end] dan old[start+offset:end+offset]."""
+    length = end - start
+    start = max(start, -offset)
+    end = min(end, len(old) - offset)
+    # Blok yang lebih dari separuhnya berada di luar file lama tidak bisa diverifikasi.
+    if end - start <= 0 or end - start < length / 2:
+        return None
+    differing = _POPCOUNT[old[start + offset:end + offset] ^ new[start:end]]
+    return float(differing.sum()) / ((end - start) * FINGERPRINT_BITS)
+
+
+def _refine_edges(old, new, start: int, end: int, offset: int, lower: int, upper: int) -> tuple:
+    """
+    Menggeser awal dan akhir satu bagian yang cocok ke titik edit yang sebenarnya: dipangkas
+    jika tepi bloknya ternyata berisi audio lain, diperluas jika audio yang sama berlanjut
+    melewati batas blok. Bagian tidak pernah melewati batas 'lower'/'upper' (bagian tetangga).
+    """
+    lower = max(lower, -offset)
+    upper = min(upper, len(old) - offset)
+    if upper <= lower:
+        return start, start
+    errors = _POPCOUNT[old[lower + offset:upper + offset] ^ new[lower:upper]] / FINGERPRINT_BITS
+    good = np.convolve(errors, np.ones(EDGE_FRAMES) / EDGE_FRAMES, mode="same") <= MATCH_BIT_ERROR
+    first = min(max(start - lower, 0), len(good))
+    last = min(max(end - lower, first), len(good))
+    while first < last and not good[first]:
+        first += 1
+    while first > 0 and good[first - 1]:
+        first -= 1
+    while last > first and not good[last - 1]:
+        last -= 1
+    while last < len(good) and good[last]:
+        last += 1
+    return lower + first, lower + last
+
+
+def align_fingerprints(old, new) -> list:
+    """
+    Mencari bagian file baru yang juga ada di file lama (mungkin di posisi lain).
+
+    Setiap nilai sidik jari file baru dicocokkan dengan posisi nilai yang sama di file lama;
+    selisih posisinya menjadi "suara" untuk pergeseran. Per blok, pergeseran dengan suara
+    terbanyak (ditambah pergeseran blok sebelumnya) diverifikasi dengan membandingkan semua bit
+    di blok itu. Bagian yang disisipkan, dihapus, atau dipindah menghasilkan pergeseran baru.
+
+    Args:
+        old (numpy.ndarray): Sidik jari file lama (compute_fingerprint()).
+        new (numpy.ndarray): Sidik jari file baru.
+
+    Returns:
+        list: Daftar tuple (awal, akhir, pergeseran) dalam frame: new[awal:akhir] sama dengan
+              old[awal+pergeseran:akhir+pergeseran]. Terurut dan tidak tumpang tindih.
+    """
+    old = np.asarray(old, dtype=np.uint16)
+    new = np.asarray(new, dtype=np.uint16)
+    if len(old) == 0 or len(new) == 0:
+        return []
+
+    # Indeks posisi setiap nilai di file lama (diurutkan, dicari dengan searchsorted).
+    order = np.argsort(old, kind="stable")
+    sorted_values = old[order]
+    left = np.searchsorted(sorted_values, new, side="left")
+    counts = np.searchsorted(sorted_values, new, side="right") - left
+    usable = np.flatnonzero((counts > 0) & (counts <= MAX_VALUE_OCCURRENCES) & (new != 0))
+    usable_counts = counts[usable]
+    # Semua pasangan (posisi_baru, posisi_lama) dengan nilai yang sama, tanpa loop Python.
+    new_positions = np.repeat(usable, usable_counts)
+    within = np.arange(len(new_positions)) - np.repeat(np.cumsum(usable_counts) - usable_counts, usable_counts)
+    offsets = order[np.repeat(left[usable], usable_counts) + within] - new_positions
+
+    block_frames = int(BLOCK_SECONDS / HOP_SECONDS)
+    block_ids = new_positions // block_frames
+    runs = []
+    previous_offset = None
+    for block_start in range(0, len(new), block_frames):
+        block_end = min(block_start + block_frames, len(new))
+        block = block_start // block_frames
+        low, high = np.searchsorted(block_ids, [block, block + 1])
+        candidates = []
+        if high > low:
+            values, votes = np.unique(offsets[low:high], return_counts=True)
+            # Satu suara bisa kebetulan; minimal dua frame harus menunjuk pergeseran yang sama.
+            for index in np.argsort(votes)[::-1][:MAX_CANDIDATES]:
+                if votes[index] >= 2:
+                    candidates.append(int(values[index]))
+        # Pergeseran blok sebelumnya selalu dicoba (bagian yang tidak berubah biasanya panjang);
+        # di awal file, pergeseran nol.
+        fallback = previous_offset if previous_offset is not None else 0
+        if fallback not in candidates:
+            candidates.append(fallback)
+
+        best_offset, best_error = None, MATCH_BIT_ERROR
+        for offset in candidates:
+            error = _bit_error(old, new, offset, block_start, block_end)
+            if error is not None and error < best_error:
+                best_offset, best_error = offset, error
+        previous_offset = best_offset if best_offset is not None else previous_offset
+        if best_offset is None:
+            continue
+        # Blok berurutan dengan pergeseran sama (toleransi satu frame) digabung menjadi satu bagian.
+        if runs and runs[-1][1] == block_start and abs(runs[-1][2] - best_offset) <= 1:
+            runs[-1][1] = block_end
+        else:
+            runs.append([block_start, block_end, best_offset])
+
+    refined = []
+    for index, (start, end, offset) in enumerate(runs):
+        lower = refined[-1][1] if refined else 0
+        upper = runs[index + 1][0] if index + 1 < len(runs) else len(new)
+        start, end = _refine_edges(old, new, start, end, offset, lower, upper)
+        if end <= start:
+            continue
+        if refined and refined[-1][1] == start and abs(refined[-1][2] - offset) <= 1:
+            refined[-1][1] = end
+        else:
+            refined.append([start, end, offset])
+    return [tuple(int(value) for value in run) for run in refined]
+
+
+def shift_segment(segment: dict, offset: float) -> dict:
+    """Salinan segmen (termasuk timestamp per kata) yang digeser sejauh 'offset' detik."""
+    shifted = {**segment, "start": segment["start"] + offset, "end": segment["end"] + offset}
+    if segment.get("words"):
+        shifted["words"] = shift_words(segment["words"], offset)
+    return shifted
+
+
+def _merge_regions(regions) -> list:
+    merged = []
+    for start, end in sorted(regions):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        elif end > start:
+            merged.append((start, end))
+    return merged
+
+
+@dataclass(frozen=True)
+class IncrementalPlan:
+    """
+    Rencana transkripsi ulang sebagian untuk file yang sudah diedit.
+
+    Attributes:
+        kept_segments (tuple): Segmen dari transkripsi lama yang masih berlaku, sudah digeser
+            ke waktu file baru.
+        regions (tuple): Tuple (awal, akhir) dalam detik pada file baru yang harus ditranskripsi ulang.
+        duration (float): Durasi file baru (detik).
+    """
+    kept_segments: tuple
+    regions: tuple
+    duration: float
+
+    @property
+    def changed_seconds(self) -> float:
+        return sum(end - start for start, end in self.regions)
+
+    @property
+    def reused_seconds(self) -> float:
+        return max(self.duration - self.changed_seconds, 0.0)
+
+
+def plan_incremental(old_segments, runs, duration: float) -> IncrementalPlan:
+    """
+    Menentukan segmen lama yang bisa dipakai ulang dan bagian yang harus ditranskripsi ulang.
+
+    Segmen lama dipakai hanya jika seluruhnya berada di dalam satu bagian yang cocok. Segmen
+    yang terpotong oleh titik edit, bagian baru, dan sekitar titik potong ditranskripsi ulang.
+
+    Args:
+        old_segments (list): Segmen transkripsi file lama (waktu file lama).
+        runs (list): Hasil align_fingerprints().
+        duration (float): Durasi file baru (detik).
+
+    Returns:
+        IncrementalPlan: Rencana transkripsi.
+    """
+    tolerance = SEGMENT_TOLERANCE_SECONDS
+    kept = []
+    changed = []
+    position = 0.0
+    for start_frame, end_frame, offset_frames in runs:
+        start, end, offset = (float(start_frame * HOP_SECONDS), float(end_frame * HOP_SECONDS),
+                              float(offset_frames * HOP_SECONDS))
+        # Frame terakhir mewakili audio sampai akhir file, bukan hanya sampai awal frame itu.
+        if end_frame * HOP_SECONDS + FRAME_SAMPLES / SAMPLE_RATE >= duration:
+            end = duration
+        if start > position:
+            changed.append((position, start))
+        position = max(position, end)
+        for segment in old_segments:
+            if segment["end"] <= start + offset or segment["start"] >= end + offset:
+                continue
+            if segment["start"] >= start + offset - tolerance and segment["end"] <= end + offset + tolerance:
+                kept.append(shift_segment(segment, -offset))
+            else:
+                # Segmen yang terpotong batas bagian ini: bagian di dalamnya harus didengar ulang.
+                changed.append((max(start, segment["start"] - offset), min(end, segment["end"] - offset)))
+    if position < duration:
+        changed.append((position, duration))
+
+    regions = _merge_regions((max(0.0, start - EDGE_PADDING_SECONDS), min(duration, end + EDGE_PADDING_SECONDS))
+                             for start, end in changed)
+    # Segmen lama yang tersentuh bagian yang ditranskripsi ulang dibuang (akan muncul lagi dari
+    # hasil transkripsi ulang), dan bagiannya diperluas menutup segmen itu seluruhnya.
+    while True:
+        overlapping = [segment for segment in kept
+                       if any(segment["start"] < end and segment["end"] > start for start, end in regions)]
+        if not overlapping:
+            break
+        kept = [segment for segment in kept if segment not in overlapping]
+        regions = _merge_regions(regions + [(max(0.0, segment["start"]), min(duration, segment["end"]))
+                                            for segment in overlapping])
+    kept.sort(key=lambda segment: segment["start"])
+    return IncrementalPlan(tuple(kept), tuple(regions), duration)
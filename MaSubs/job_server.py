@@ -0,0 +1,416 @@
+import os
+import sys
+import hmac
+import json
+import time
+import threading
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Server bisa dijalankan langsung dari folder ini; root repositori (tempat 'masubs_common')
+# dan folder 'MaSubsBurner' (untuk job burn) perlu ada di sys.path.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (_REPO_ROOT, os.path.join(_REPO_ROOT, "MaSubsBurner")):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+from masubs_common.job_store import JobStore, JOB_STATUSES
+from masubs_common.job_client import DEFAULT_HOST, DEFAULT_PORT
+
+# Catatan: modul transkripsi/burn (dan whisper/torch di belakangnya) hanya diimpor di proses
+# worker. Proses server cukup membaca/menulis antrean, jadi startup-nya instan.
+
+# Jenis job yang diterima beserta parameter path yang wajib ada di mesin server.
+JOB_KINDS = {"transcribe": ("file_path",), "pipeline": ("file_path",), "burn": ("file_path", "subtitle_path")}
+# Job burn hanya butuh ffmpeg. Worker khusus untuk job ini mencegah encode panjang menahan
+# worker yang memegang model Whisper.
+MODEL_JOB_KINDS = ("transcribe", "pipeline")
+BURN_JOB_KINDS = ("burn",)
+
+# Jeda polling antrean saat kosong, dan interval minimal update progres ke database.
+POLL_SECONDS = 0.5
+PROGRESS_INTERVAL_SECONDS = 0.5
+# Worker yang tidak mengirim heartbeat selama ini dianggap mati di endpoint status.
+HEARTBEAT_TIMEOUT_SECONDS = 30.0
+
+
+class JobCancelled(Exception):
+    """Dilempar dari callback progres saat job dibatalkan lewat API."""
+
+
+class _JobProgress:
+    """
+    Meniru antarmuka 'pyqtSignal.emit' untuk fungsi transkripsi, sekaligus menjadi callback
+    progres burn-in. Update ditulis ke antrean (dibatasi beberapa kali per detik), dan
+    pembatalan dari API diperiksa di setiap update.
+
+    'cancel_event' juga di-set oleh fungsi yang dipanggil saat gagal (untuk menghentikan
+    thread lain), jadi pembatalan oleh pengguna dibaca dari 'cancelled', bukan dari event itu.
+    """
+    def __init__(self, store: JobStore, job_id: int, worker: str, model: str = None):
+        self.store = store
+        self.job_id = job_id
+        self.worker = worker
+        self.model = model
+        self.cancel_event = threading.Event()
+        # Hanya di-set oleh jalur pembatalan API.
+        self.cancelled = False
+        self._last_update = 0.0
+
+    def emit(self, percent, message):
+        now = time.monotonic()
+        if now - self._last_update >= PROGRESS_INTERVAL_SECONDS or percent >= 95:
+            self._last_update = now
+            self.store.update_progress(self.job_id, percent, message)
+            self.store.heartbeat(self.worker, self.model, self.job_id)
+            if self.store.cancel_requested(self.job_id):
+                self.cancelled = True
+                self.cancel_event.set()
+        if self.cancelled:
+            raise JobCancelled()
+
+    def is_cancelled(self) -> bool:
+        """True jika job dibatalkan lewat API (termasuk permintaan yang belum terbaca oleh emit())."""
+        if not self.cancelled and self.store.cancel_requested(self.job_id):
+            self.cancelled = True
+        return self.cancelled
+
+    def burn_progress(self, info: dict):
+        # Encode dihentikan oleh ffmpeg sendiri lewat cancel_event; callback tidak boleh melempar.
+        from burner_logic import format_progress_message
+        try:
+            self.emit(int(info.get("percent") or 0), format_progress_message(info))
+        except JobCancelled:
+            pass
+
+
+def _decode_params(params: dict) -> dict:
+    """Mengubah opsi decoding/tata letak (dict JSON) kembali menjadi dataclass-nya."""
+    from transcribe_options import TranscribeOptions
+    from masubs_common.resegment import LayoutRules
+    return {
+        "options": TranscribeOptions(**params["options"]) if params.get("options") else None,
+        "layout": LayoutRules(**params["layout"]) if params.get("layout") else None,
+        "export_formats": tuple(params.get("export_formats") or ("srt",)),
+    }
+
+
+def _encoding_profile(params: dict):
+    from encoding_profiles import get_preset, DEFAULT_PRESET
+    overrides = {"threads": params.get("threads", 0),
+                 "audio_mode": "copy" if params.get("copy_audio") else "encode"}
+    if params.get("encoder"):
+        overrides["vcodec"] = params["encoder"]
+    return get_preset(params.get("preset") or DEFAULT_PRESET, **overrides)
+
+
+def run_job(kind: str, params: dict, progress: _JobProgress) -> dict:
+    """
+    Menjalankan satu job di proses worker.
+
+    Args:
+        kind (str): Jenis job (lihat JOB_KINDS).
+        params (dict): Parameter job dari antrean.
+        progress (_JobProgress): Penerima progres dan sumber sinyal pembatalan.
+
+    Returns:
+        dict: Hasil job (path file yang dibuat dan ringkasan teks).
+
+    Raises:
+        JobCancelled: Jika job dibatalkan lewat API.
+        RuntimeError: Jika job gagal.
+    """
+    from backends import DEFAULT_BACKEND
+    backend = params.get("backend") or DEFAULT_BACKEND
+    if kind == "transcribe":
+        decoded = _decode_params(params)
+        if params.get("long"):
+            from long_audio import transcribe_long_audio
+            text, srt_path = transcribe_long_audio(params["file_path"], params["model"], params.get("jobs"),
+                                                   progress, use_cache=params.get("use_cache", True),
+                                                   backend=backend, skip_silence=params.get("skip_silence", True),
+                                                   **decoded)
+        else:
+            from core_logic import transcribe_audio
+            # Model tidak dibebaskan setelah job: worker ini tetap "hangat" untuk job berikutnya.
+            text, srt_path = transcribe_audio(params["file_path"], params["model"], progress,
+                                              use_cache=params.get("use_cache", True), backend=backend,
+                                              skip_silence=params.get("skip_silence", True),
+                                              incremental=params.get("incremental", False),
+                                              previous_path=params.get("previous_path"), **decoded)
+        return {"text": text, "srt_path": srt_path}
+    if kind == "pipeline":
+        from pipeline import transcribe_and_burn
+        text, srt_path, output_path = transcribe_and_burn(
+            params["file_path"], params["model"], params.get("output_path"), _encoding_profile(params),
+            params.get("part_seconds", 300.0), progress_signal=progress, cancel_event=progress.cancel_event,
+            use_cache=params.get("use_cache", True), backend=backend,
+            skip_silence=params.get("skip_silence", True), **_decode_params(params))
+        return {"text": text, "srt_path": srt_path, "output_path": output_path}
+    if kind == "burn":
+        from batch_burn import default_output_path
+        from burner_logic import burn_subtitles
+        from segment_burn import burn_subtitles_parallel
+        output_path = params.get("output_path") or default_output_path(params["file_path"])
+        burn = burn_subtitles_parallel if params.get("parallel") else burn_subtitles
+        success, message = burn(params["file_path"], params["subtitle_path"], output_path,
+                                _encoding_profile(params), progress_callback=progress.burn_progress,
+                                cancel_event=progress.cancel_event)
+        if progress.is_cancelled():
+            raise JobCancelled()
+        if not success:
+            raise RuntimeError(message)
+        return {"output_path": output_path, "message": message}
+    raise RuntimeError(f"Jenis job '{kind}' tidak dikenal.")
+
+
+def _worker_main(db_path: str, name: str, kinds, stop_event, preload_model: str = None, backend: str = None):
+    """
+    Loop proses worker: ambil job dari antrean, jalankan, catat hasilnya, ulangi.
+    Model yang sudah dimuat tetap di cache proses ini, dan job untuk model yang sama
+    didahulukan, sehingga job berikutnya tidak membayar biaya pemuatan model lagi.
+    """
+    store = JobStore(db_path)
+    loaded_model = None
+    if preload_model:
+        from core_logic import preload_model as warm_up
+        from backends import DEFAULT_BACKEND
+        store.heartbeat(name, None, None)
+        # Preload gagal (misal model tidak bisa diunduh) tidak boleh mematikan worker: supervisor
+        # akan menjalankannya ulang dan gagal lagi terus-menerus. Model dimuat saat job pertama.
+        try:
+            warm_up(preload_model, backend or DEFAULT_BACKEND)
+            loaded_model = preload_model
+        except Exception as e:
+            print(f"Worker {name}: preload model '{preload_model}' gagal: {e}", file=sys.stderr, flush=True)
+
+    while not stop_event.is_set():
+        store.heartbeat(name, loaded_model, None)
+        job = store.claim(name, kinds, preferred_model=loaded_model)
+        if job is None:
+            stop_event.wait(POLL_SECONDS)
+            continue
+        model = job["params"].get("model")
+        progress = _JobProgress(store, job["id"], name, model or loaded_model)
+        store.heartbeat(name, progress.model, job["id"])
+        try:
+            store.finish(job["id"], run_job(job["kind"], job["params"], progress))
+        except JobCancelled:
+            store.fail(job["id"], "Dibatalkan.", cancelled=True)
+        except Exception as e:
+            # Pembatalan di tengah pipeline dilaporkan sebagai RuntimeError oleh transcribe_and_burn().
+            store.fail(job["id"], str(e), cancelled=progress.is_cancelled())
+        if model:
+            loaded_model = model
+    store.close()
+
+
+def _is_inside(path, folder: str) -> bool:
+    """Mengecek apakah 'path' absolut dan berada di dalam 'folder' (setelah symlink diselesaikan)."""
+    if not isinstance(path, str) or not os.path.isabs(path):
+        return False
+    folder = os.path.realpath(folder)
+    try:
+        return os.path.commonpath([folder, os.path.realpath(path)]) == folder
+    except ValueError:
+        # Drive berbeda di Windows.
+        return False
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    """
+    API JSON:
+        GET  /status                 ringkasan antrean dan worker
+        GET  /jobs?status=&limit=    daftar job terbaru
+        POST /jobs                   {"kind": ..., "params": {...}} -> {"id": ...}
+        GET  /jobs/<id>              detail satu job
+        POST /jobs/<id>/cancel       batalkan job
+    """
+    server_version = "MaSubsJobServer/1.0"
+
+    def log_message(self, format, *args):
+        # Log akses bawaan http.server terlalu ramai untuk polling status dari GUI.
+        pass
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if not token:
+            return True
+        header = self.headers.get("Authorization", "")
+        return hmac.compare_digest(header, f"Bearer {token}")
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length).decode("utf-8")) if length else {}
+
+    def _job_id(self, part: str):
+        try:
+            return int(part)
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        if not self._authorized():
+            return self._send(401, {"error": "Token tidak valid."})
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        store = self.server.store
+        if parts == ["status"]:
+            return self._send(200, self.server.status())
+        if parts == ["jobs"]:
+            query = parse_qs(url.query)
+            status = query.get("status", [None])[0]
+            if status and status not in JOB_STATUSES:
+                return self._send(400, {"error": f"Status '{status}' tidak dikenal."})
+            try:
+                limit = int(query.get("limit", ["100"])[0])
+            except ValueError:
+                return self._send(400, {"error": "Parameter 'limit' harus berupa bilangan bulat."})
+            if limit < 1:
+                return self._send(400, {"error": "Parameter 'limit' harus lebih dari 0."})
+            return self._send(200, {"jobs": store.list(status, limit)})
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = store.get(self._job_id(parts[1]))
+            return self._send(200, job) if job else self._send(404, {"error": "Job tidak ditemukan."})
+        return self._send(404, {"error": "Endpoint tidak dikenal."})
+
+    def do_POST(self):
+        if not self._authorized():
+            return self._send(401, {"error": "Token tidak valid."})
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        store = self.server.store
+        try:
+            payload = self._read_json()
+        except ValueError:
+            return self._send(400, {"error": "Body bukan JSON yang valid."})
+        if parts == ["jobs"]:
+            kind = payload.get("kind")
+            params = payload.get("params")
+            if kind not in JOB_KINDS or not isinstance(params, dict):
+                return self._send(400, {"error": f"Job harus berisi 'kind' ({', '.join(JOB_KINDS)}) dan 'params'."})
+            # Path divalidasi di sini agar kesalahan path langsung terlihat oleh pengirim,
+            # bukan baru muncul saat job diambil worker.
+            for key in JOB_KINDS[kind]:
+                path = params.get(key)
+                if not path or not os.path.isabs(path) or not os.path.isfile(path):
+                    return self._send(400, {"error": f"'{key}' harus path absolut yang ada di server: {path}"})
+            # Klien hanya boleh menulis hasil di folder file sumbernya (atau subfolder-nya),
+            # agar job tidak bisa menimpa file sembarang di server.
+            output_path = params.get("output_path")
+            if output_path is not None:
+                if not _is_inside(output_path, os.path.dirname(params["file_path"])):
+                    return self._send(400, {"error": "'output_path' harus path absolut di dalam folder file sumber: "
+                                                     f"{output_path}"})
+            if kind in MODEL_JOB_KINDS and not params.get("model"):
+                return self._send(400, {"error": "Parameter 'model' wajib diisi."})
+            return self._send(201, {"id": store.submit(kind, params)})
+        if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            job = store.cancel(self._job_id(parts[1]))
+            return self._send(200, job) if job else self._send(404, {"error": "Job tidak ditemukan."})
+        return self._send(404, {"error": "Endpoint tidak dikenal."})
+
+
+class JobServer(ThreadingHTTPServer):
+    """
+    Server job lokal: API HTTP di atas antrean SQLite, ditambah proses worker yang memegang
+    model tetap termuat di antara job. Beberapa editor bisa mengirim job ke satu mesin yang kuat
+    (lewat GUI, CLI, atau JobClient) alih-alih masing-masing memuat model besar di laptopnya.
+
+    Args:
+        host (str): Alamat bind. Pakai '0.0.0.0' agar bisa diakses dari jaringan (sebaiknya dengan token).
+        port (int): Port HTTP.
+        model_workers (int): Jumlah worker untuk job transkripsi/pipeline (masing-masing memuat model).
+        burn_workers (int): Jumlah worker khusus job burn-in.
+        db_path (str, optional): File database antrean. Defaults to default_db_path().
+        token (str, optional): Jika diisi, setiap request wajib membawa 'Authorization: Bearer <token>'.
+        preload_model (str, optional): Model yang dimuat worker saat start, sebelum job pertama datang.
+        backend (str, optional): Backend untuk preload.
+        log (callable, optional): Penerima pesan log server.
+    """
+    daemon_threads = True
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, model_workers: int = 1,
+                 burn_workers: int = 1, db_path: str = None, token: str = None, preload_model: str = None,
+                 backend: str = None, log=None):
+        super().__init__((host, port), _ApiHandler)
+        self.store = JobStore(db_path)
+        self.token = token
+        self.log = log or (lambda message: None)
+        self.started = time.time()
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._worker_specs = [(f"model-{index + 1}", MODEL_JOB_KINDS, preload_model, backend)
+                              for index in range(max(0, model_workers))]
+        self._worker_specs += [(f"burn-{index + 1}", BURN_JOB_KINDS, None, None) for index in range(max(0, burn_workers))]
+        self._processes = {}
+
+    def start_workers(self):
+        """Mengembalikan job yang terputus ke antrean lalu menjalankan semua proses worker."""
+        resumed = self.store.requeue_interrupted()
+        if resumed:
+            self.log(f"{resumed} job yang terputus dikembalikan ke antrean.")
+        for spec in self._worker_specs:
+            self._spawn(*spec)
+
+    def _spawn(self, name, kinds, preload_model, backend):
+        # Bukan proses daemon: mode audio panjang membuat pool proses di dalam worker, dan proses
+        # daemon tidak boleh punya proses anak. Worker dihentikan oleh stop() (stop event + join).
+        process = self._context.Process(target=_worker_main, name=name,
+                                        args=(self.store.path, name, kinds, self._stop_event, preload_model, backend))
+        process.start()
+        self._processes[name] = (process, kinds, preload_model, backend)
+
+    def _supervise(self):
+        # Worker yang mati (misal kehabisan memori) dijalankan ulang; job-nya dikembalikan ke antrean
+        # (atau dianggap gagal setelah MAX_ATTEMPTS kali).
+        while not self._stop_event.wait(5.0):
+            for name, (process, kinds, preload_model, backend) in list(self._processes.items()):
+                if not process.is_alive() and not self._stop_event.is_set():
+                    self.log(f"Worker {name} berhenti (exit code {process.exitcode}), dijalankan ulang.")
+                    self.store.requeue_interrupted(worker=name)
+                    self._spawn(name, kinds, preload_model, backend)
+
+    def status(self) -> dict:
+        now = time.time()
+        workers = [{**worker, "alive": now - (worker["heartbeat"] or 0) < HEARTBEAT_TIMEOUT_SECONDS}
+                   for worker in self.store.workers()]
+        return {"server": _ApiHandler.server_version, "uptime": now - self.started, "db_path": self.store.path,
+                "jobs": self.store.counts(), "workers": workers}
+
+    def run(self):
+        """Menjalankan worker dan melayani API sampai dihentikan (Ctrl+C)."""
+        self.start_workers()
+        threading.Thread(target=self._supervise, name="job-supervisor", daemon=True).start()
+        host, port = self.server_address[:2]
+        self.log(f"Server job MaSubs berjalan di http://{host}:{port} ({len(self._worker_specs)} worker, "
+                 f"antrean: {self.store.path})")
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Menghentikan worker. Worker yang tidak berhenti dalam 'timeout' detik (masih menjalankan
+        job) dihentikan paksa; job tersebut dilanjutkan saat server dijalankan lagi.
+        """
+        self._stop_event.set()
+        for process, *_ in self._processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout)
+        self.server_close()
+        self.store.close()
+
@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import as_completed
+
+from core_logic import export_transcript, plan_model, cached_language, ProgressTracker, AVAILABLE_MODELS, SAMPLE_RATE
+from audio_chunks import find_silence_split_points, plan_chunks, stitch_segments
+from batch_queue import create_worker_pool, default_worker_count, submit_chunk, submit_language_detection
+from memory_planner import max_workers_for_memory
+from result_cache import ResultCache, make_cache_key
+from transcribe_options import TranscribeOptions
+from backends import get_backend, DEFAULT_BACKEND
+from masubs_common.media import extract_pcm, load_pcm, pcm_fingerprint
+from masubs_common.instrumentation import span, traced
+
+# Batas bawah dan atas panjang potongan (detik). Potongan terlalu pendek membuang
+# konteks, potongan terlalu panjang membuat pembagian kerja antar-worker tidak merata.
+MIN_CHUNK_SECONDS = 120.0
+MAX_CHUNK_SECONDS = 600.0
+
+
+def choose_chunk_seconds(total_seconds: float, max_workers: int) -> float:
+    """
+    Memilih panjang potongan agar setiap worker mendapat minimal satu potongan.
+
+    Args:
+        total_seconds (float): Durasi total audio.
+        max_workers (int): Jumlah proses worker.
+
+    Returns:
+        float: Panjang target potongan dalam detik.
+    """
+    return min(MAX_CHUNK_SECONDS, max(MIN_CHUNK_SECONDS, total_seconds / max(1, max_workers)))
+
+
+@traced("transcribe_long", "file_path", "model_name", "max_workers", "backend")
+def transcribe_long_audio(file_path: str, model_name: str, max_workers=None, progress_signal=None,
+                          use_cache: bool = True, backend: str = DEFAULT_BACKEND, skip_silence: bool = True,
+                          options: TranscribeOptions = None, export_formats=("srt",), layout=None):
+    """
+    Mode audio panjang: memotong audio di bagian hening, mentranskripsi potongan-potongan
+    secara paralel di pool proses, lalu menyambung segmen dengan timestamp global sebelum
+    menulis file .srt.
+
+    Args:
+        file_path (str): Path absolut ke file audio atau video yang akan diproses.
+        model_name (str): Nama model Whisper yang akan digunakan (harus ada di AVAILABLE_MODELS).
+        max_workers (int, optional): Jumlah proses worker. Defaults to default_worker_count().
+        progress_signal (pyqtSignal, optional): Objek sinyal untuk mengirim progres. Defaults to None.
+        use_cache (bool, optional): Memakai cache hasil transkripsi di disk. Defaults to True.
+        backend (str, optional): Nama backend inferensi yang dipakai setiap worker.
+            Defaults to DEFAULT_BACKEND.
+        skip_silence (bool, optional): Setiap worker melewati bagian hening di dalam potongannya
+            sebelum inferensi. Defaults to True.
+        options (TranscribeOptions, optional): Opsi decoding. Jika bahasa tidak ditentukan, bahasa
+            dideteksi sekali (atau diambil dari cache) sebelum potongan dibagikan ke worker.
+            Defaults to TranscribeOptions().
+        export_formats (iterable, optional): Format subtitle yang ditulis ('srt', 'vtt', 'ass',
+            'json'). File .srt selalu ditulis. Defaults to ("srt",).
+        layout (LayoutRules, optional): Aturan tata letak subtitle yang diterapkan dengan resegment()
+            sebelum ditulis. Tidak memengaruhi cache. Defaults to None (segmen mentah).
+
+    Returns:
+        tuple: Sebuah tuple berisi (string_transkripsi_penuh, path_ke_file_srt).
+    """
+    def report_progress(percent, message):
+        if progress_signal:
+            progress_signal.emit(percent, message)
+
+    if model_name not in AVAILABLE_MODELS:
+        raise ValueError(f"Model '{model_name}' tidak tersedia.")
+    get_backend(backend)
+    options = options or TranscribeOptions()
+    export_formats = ("srt",) + tuple(name for name in export_formats if name != "srt")
+    max_workers = max_workers or default_worker_count(model_name, backend)
+
+    # Audio didekode sekali ke file PCM di cache. Proses utama dan semua worker
+    # memetakan file yang sama ke memori, jadi potongan audio tidak perlu dikirim antar-proses.
+    report_progress(5, "Mendekode audio...")
+    with span("audio_decode") as stage:
+        pcm_path = extract_pcm(file_path)
+        audio = load_pcm(pcm_path)
+        total_seconds = len(audio) / SAMPLE_RATE
+        stage.set(audio_seconds=total_seconds)
+    output_srt_path = os.path.splitext(file_path)[0] + ".srt"
+
+    # Setiap worker memuat model sendiri, jadi model dan presisinya diputuskan sekali di sini
+    # berdasarkan RAM yang tersedia, lalu jumlah worker dibatasi agar semuanya muat.
+    plan = plan_model(model_name, backend)
+    if plan.action == "wait":
+        raise RuntimeError(plan.reason)
+    if plan.reason:
+        report_progress(5, plan.reason)
+
+    # Hasil mode audio panjang disimpan dengan kunci terpisah dari mode streaming
+    # karena pemotongan audionya berbeda.
+    cache = ResultCache() if use_cache else None
+    cache_key = None
+    if cache:
+        with span("cache_lookup") as stage:
+            cache_options = {"mode": "long", "fp16": False, "backend": backend, "precision": plan.precision,
+                             "skip_silence": skip_silence, **options.cache_options()}
+            cache_key = make_cache_key(pcm_fingerprint(file_path), plan.model_name, cache_options)
+            cached = cache.get(cache_key)
+            stage.set(hit=bool(cached))
+        if cached:
+            export_transcript(cached["segments"], output_srt_path, export_formats,
+                              {"model": cached["model"], "backend": backend, "language": cached.get("language")},
+                              layout)
+            report_progress(95, f"Hasil diambil dari cache. File SRT disimpan di: {output_srt_path}")
+            return (cached["text"], output_srt_path)
+
+    with span("split") as stage:
+        chunk_seconds = choose_chunk_seconds(total_seconds, max_workers)
+        split_points = find_silence_split_points(audio, target_chunk_seconds=chunk_seconds)
+        chunks = plan_chunks(len(audio), split_points)
+        stage.set(chunks=len(chunks))
+    workers = min(max_workers, len(chunks), max_workers_for_memory(plan.model_name, backend, plan.precision))
+    report_progress(10, f"Audio dibagi menjadi {len(chunks)} potongan, diproses oleh {workers} worker...")
+
+    # Progres dihitung dari total durasi wilayah inti potongan yang sudah selesai,
+    # sehingga ETA dan RTF mencerminkan throughput seluruh pool.
+    tracker = ProgressTracker(total_seconds, report_progress, start_percent=10, end_percent=90)
+    decoded_seconds = 0.0
+    chunk_results = []
+    # Model dimuat di setiap proses worker, jadi waktunya termasuk dalam span inferensi ini.
+    with span("inference", audio_seconds=total_seconds, workers=workers) as stage:
+        with create_worker_pool(plan.model_name, workers, backend=backend) as pool:
+            # Bahasa ditentukan sekali untuk semua potongan; tanpa ini setiap worker mendeteksinya
+            # sendiri, dan potongan yang diawali musik bisa salah terdeteksi.
+            decode_options = options
+            if options.language is None:
+                language = cached_language(file_path, cache) if cache else None
+                if not language:
+                    report_progress(10, "Mendeteksi bahasa...")
+                    language = submit_language_detection(pool, file_path, pcm_path, use_cache).result()
+                if language:
+                    decode_options = options.with_language(language)
+            futures = [submit_chunk(pool, chunk, pcm_path, skip_silence, decode_options) for chunk in chunks]
+            for future in as_completed(futures):
+                chunk, segments = future.result()
+                chunk_results.append((chunk, segments))
+                decoded_seconds += (chunk["core_end"] - chunk["core_start"]) / SAMPLE_RATE
+                tracker.update(decoded_seconds)
+        stage.set(rtf=tracker.rtf)
+
+    report_progress(90, "Menyambung segmen dan memformat output...")
+    with span("stitch"):
+        segments = stitch_segments(chunk_results)
+    full_text = "".join(segment["text"] for segment in segments)
+
+    export_transcript(segments, output_srt_path, export_formats,
+                      {"model": plan.model_name, "backend": backend, "language": decode_options.language}, layout)
+    if cache:
+        with span("cache_store"):
+            cache.put(cache_key, {"model": plan.model_name, "backend": backend, "language": decode_options.language,
+                                  "text": full_text, "segments": segments})
+    report_progress(95, f"File SRT disimpan di: {output_srt_path} (RTF {tracker.rtf:.2f}x)")
+
+    return (full_text, output_srt_path)
@@ -1,5 +1,8 @@
 import sys
 import os
+import time
+import multiprocessing
+from dataclasses import replace
 
 # --- BLOK KODE UNTUK MEMBUNDEL FFMPEG ---
 # Blok ini sangat penting agar aplikasi yang sudah menjadi .exe dapat menemukan ffmpeg.
@@ -12,19 +15,53 @@ if getattr(sys, 'frozen', False):
     # sebelum mencarinya di tempat lain di sistem.
     os.environ['PATH'] = application_path + os.pathsep + os.environ.get('PATH', '')
 
+# Paket bersama 'masubs_common' berada di root repositori. Sebelumnya path ini ditambahkan
+# oleh core_logic, tetapi core_logic kini baru diimpor setelah jendela tampil.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+# Diimpor paling awal: titik nol pengukuran waktu startup ada di modul ini.
+from masubs_common.startup import report_startup_event, startup_benchmark_enabled
+
 # --- Impor Pustaka ---
 # Impor komponen-komponen yang dibutuhkan dari PyQt6 untuk membangun GUI.
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout,
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QComboBox, QTextEdit, QStatusBar,
-    QFileDialog, QMessageBox, QProgressBar
+    QFileDialog, QMessageBox, QProgressBar, QSpinBox, QListWidget, QCheckBox
 )
 # Impor komponen inti PyQt6 untuk threading dan sinyal.
-from PyQt6.QtCore import QThread, QObject, pyqtSignal
+from PyQt6.QtCore import QThread, QObject, QTimer, pyqtSignal
 # Impor untuk ikon aplikasi.
 from PyQt6.QtGui import QIcon
-# Impor fungsi logika inti dan konstanta dari file lokal.
-from core_logic import transcribe_audio, AVAILABLE_MODELS
+# Impor konstanta dan modul ringan dari file lokal. Modul logika (core_logic, batch_queue,
+# long_audio, pipeline, ...) menarik numpy dan ffmpeg-python sehingga TIDAK diimpor di sini:
+# modul tersebut diimpor di thread latar belakang setelah jendela tampil (lihat STARTUP_MODULES)
+# dan di dalam worker yang memakainya.
+from backends import BACKENDS, DEFAULT_BACKEND, AVAILABLE_MODELS, available_backends
+from transcribe_options import DECODE_PRESETS
+from masubs_common.subtitles import format_timestamp
+from masubs_common.diagnostics_panel import DiagnosticsDialog
+from masubs_common.startup_panel import StartupWorker, ReadinessIndicator
+from masubs_common.subtitle_export import EXPORT_FORMATS
+from masubs_common.resegment import LayoutRules
+from masubs_common.job_client import JobClient, JobServerError, job_params, server_url, SERVER_URL_ENV
+from masubs_common.job_store import FINAL_STATUSES
+
+# Pilihan bahasa di GUI (kode, label). Kode None berarti bahasa dideteksi sekali per file.
+LANGUAGE_CHOICES = [
+    (None, "Deteksi otomatis"), ("id", "Indonesia"), ("en", "Inggris"), ("ms", "Melayu"),
+    ("jv", "Jawa"), ("ar", "Arab"), ("ja", "Jepang"), ("ko", "Korea"), ("zh", "Mandarin"),
+]
+
+# Jika True, model yang terpilih di combo box akan dimuat di latar belakang saat
+# aplikasi dibuka (warm-up), sehingga transkripsi pertama tidak menunggu pemuatan model.
+PRELOAD_MODEL_ON_START = True
+
+# Modul yang diimpor di latar belakang setelah jendela tampil, agar job pertama tidak
+# menunggu impor. Urutannya mengikuti dependensi (core_logic dulu).
+STARTUP_MODULES = ("core_logic", "batch_queue", "batched_inference", "long_audio", "pipeline")
 
 
 # --- Kelas Worker untuk Threading ---
@@ -42,12 +79,35 @@ class Worker(QObject):
     error = pyqtSignal(str)
     # 'progress' akan mengirim update (persentase, pesan) selama proses berjalan.
     progress = pyqtSignal(int, str)
+    # 'segment' mengirim setiap segmen (dict start/end/text) begitu selesai didekode.
+    segment = pyqtSignal(dict)
 
-    def __init__(self, file_path, model_name):
+    def __init__(self, file_path, model_name, long_form=False, max_workers=None, burn=False,
+                 backend=DEFAULT_BACKEND, release_after=False, skip_silence=True, options=None,
+                 export_formats=("srt",), layout=None, incremental=False):
         super().__init__()
         # Menyimpan informasi yang dibutuhkan untuk tugas dari thread utama.
         self.file_path = file_path
         self.model_name = model_name
+        # Mesin inferensi (lihat backends.py), dipilih per job dari combo box.
+        self.backend = backend
+        # Bebaskan model dari memori setelah job selesai (untuk mesin dengan RAM terbatas).
+        self.release_after = release_after
+        # Lewati bagian hening/tanpa ucapan sebelum inferensi (timestamp tetap sesuai video asli).
+        self.skip_silence = skip_silence
+        # Opsi decoding Whisper (TranscribeOptions): bahasa, beam size, fallback temperatur.
+        self.options = options
+        # Format subtitle yang ditulis di samping file input (.srt selalu ditulis).
+        self.export_formats = export_formats
+        # Aturan tata letak subtitle (LayoutRules); None = segmen Whisper ditulis apa adanya.
+        self.layout_rules = layout
+        # Pakai ulang transkripsi versi sebelumnya untuk bagian yang tidak berubah.
+        self.incremental = incremental
+        # Mode audio panjang: audio dipotong di bagian hening dan diproses paralel.
+        self.long_form = long_form
+        self.max_workers = max_workers
+        # Mode pipeline: subtitle langsung dibakar ke video setelah (dan selama) transkripsi.
+        self.burn = burn
 
     def run(self):
         """
@@ -55,14 +115,161 @@ class Worker(QObject):
         Semua logika yang memakan waktu lama ditempatkan di sini.
         """
         try:
-            # Memanggil fungsi transkripsi dari core_logic dan melewatkan sinyal progress.
-            result_tuple = transcribe_audio(self.file_path, self.model_name, self.progress)
+            # Impor lazy; biasanya sudah dimuat oleh StartupWorker sehingga tidak menambah waktu.
+            from core_logic import transcribe_audio
+            from long_audio import transcribe_long_audio
+            from pipeline import transcribe_and_burn
+            # Memanggil fungsi transkripsi dan melewatkan sinyal progress.
+            if self.burn:
+                result_tuple = transcribe_and_burn(self.file_path, self.model_name,
+                                                   progress_signal=self.progress, segment_signal=self.segment,
+                                                   backend=self.backend, release_after=self.release_after,
+                                                   skip_silence=self.skip_silence, options=self.options,
+                                                   export_formats=self.export_formats, layout=self.layout_rules)
+            elif self.long_form:
+                result_tuple = transcribe_long_audio(self.file_path, self.model_name,
+                                                     self.max_workers, self.progress, backend=self.backend,
+                                                     skip_silence=self.skip_silence, options=self.options,
+                                                     export_formats=self.export_formats, layout=self.layout_rules)
+            else:
+                result_tuple = transcribe_audio(self.file_path, self.model_name, self.progress, self.segment,
+                                                backend=self.backend, release_after=self.release_after,
+                                                skip_silence=self.skip_silence, options=self.options,
+                                                export_formats=self.export_formats, layout=self.layout_rules,
+                                                incremental=self.incremental)
             # Jika berhasil, kirim sinyal 'finished' beserta hasilnya.
             self.finished.emit(result_tuple)
         except Exception as e:
             # Jika terjadi error apapun selama proses, tangkap dan kirim sinyal 'error'.
             self.error.emit(str(e))
 
+# --- Kelas Worker untuk Antrean Batch ---
+class BatchWorker(QObject):
+    """
+    Menjalankan antrean transkripsi banyak file (BatchTranscriber) di thread terpisah.
+    Event dari pool proses diteruskan ke GUI melalui sinyal.
+    """
+    # 'file_progress' mengirim (path_file, persentase, pesan).
+    file_progress = pyqtSignal(str, int, str)
+    # 'file_finished' mengirim (path_file, status, detail) dengan status "done"/"failed"/"cancelled".
+    file_finished = pyqtSignal(str, str, str)
+    # 'stats' mengirim ringkasan throughput keseluruhan.
+    stats = pyqtSignal(dict)
+    # 'finished' mengirim daftar hasil per file saat seluruh antrean selesai.
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    def __init__(self, file_paths, model_name, max_workers, backend=DEFAULT_BACKEND, batched=False, options=None,
+                 export_formats=("srt",), layout=None, skip_silence=True, release_after=False, incremental=False):
+        super().__init__()
+        from batch_queue import BatchTranscriber
+        from batched_inference import BatchedTranscriber
+        if batched:
+            # Satu model di thread ini; jendela dari beberapa file didekode dalam satu forward pass.
+            # Mode ini tidak mendukung transkripsi inkremental (checkbox-nya dinonaktifkan).
+            self.batch = BatchedTranscriber(file_paths, model_name, on_event=self.on_event, backend=backend,
+                                            skip_silence=skip_silence, options=options,
+                                            export_formats=export_formats, layout=layout,
+                                            release_after=release_after)
+        else:
+            # Model di proses worker selalu dibebaskan saat pool selesai, jadi release_after tidak diperlukan.
+            self.batch = BatchTranscriber(file_paths, model_name, max_workers, on_event=self.on_event,
+                                          backend=backend, skip_silence=skip_silence, options=options,
+                                          export_formats=export_formats, layout=layout, incremental=incremental)
+
+    def on_event(self, kind, file_path, data):
+        """Callback dari BatchTranscriber; dipanggil di thread worker ini."""
+        if kind == "progress":
+            percent, message = data
+            self.file_progress.emit(file_path, percent, message)
+        elif kind == "stats":
+            self.stats.emit(data)
+        else:
+            self.file_finished.emit(file_path, kind, data or "")
+
+    def run(self):
+        try:
+            self.finished.emit(self.batch.run())
+        except Exception as e:
+            self.error.emit(str(e))
+
+# --- Kelas Worker untuk Server Job ---
+class ServerJobWorker(QObject):
+    """
+    Mengirim job ke server job MaSubs (lihat job_server.py) lalu memantau progresnya.
+    Sinyalnya sama dengan BatchWorker, jadi tampilan daftar batch dipakai ulang. Model
+    dimuat (dan tetap termuat) di mesin server, bukan di komputer ini.
+    """
+    file_progress = pyqtSignal(str, int, str)
+    file_finished = pyqtSignal(str, str, str)
+    stats = pyqtSignal(dict)
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    # Jeda polling status job di server (detik).
+    POLL_SECONDS = 1.0
+
+    def __init__(self, kind, jobs):
+        super().__init__()
+        self.kind = kind
+        # Daftar (path_file_di_daftar, parameter_job).
+        self.jobs = jobs
+        self.client = JobClient()
+
+    def run(self):
+        try:
+            pending = {self.client.submit(self.kind, params): file_path for file_path, params in self.jobs}
+            results = []
+            while pending:
+                for job_id, file_path in list(pending.items()):
+                    job = self.client.job(job_id)
+                    if job["status"] in FINAL_STATUSES:
+                        del pending[job_id]
+                        result = job["result"] or {}
+                        results.append({"file_path": file_path, "status": job["status"],
+                                        "srt_path": result.get("output_path") or result.get("srt_path"),
+                                        "error": job["error"]})
+                        self.file_finished.emit(file_path, job["status"], job["error"] or "")
+                    else:
+                        status = "antre di server" if job["status"] == "queued" else job["message"]
+                        self.file_progress.emit(file_path, job["progress"], status)
+                if pending:
+                    time.sleep(self.POLL_SECONDS)
+            self.finished.emit(results)
+        except JobServerError as e:
+            self.error.emit(str(e))
+        except Exception as e:
+            # Misal respons server yang tidak lengkap; tanpa ini GUI tertahan di status sibuk.
+            self.error.emit(f"{type(e).__name__}: {e}")
+
+# --- Kelas Worker untuk Warm-up Model ---
+class PreloadWorker(QObject):
+    """
+    Memuat model Whisper ke cache di thread terpisah saat aplikasi baru dibuka.
+    Kegagalan warm-up tidak fatal; model akan dimuat ulang saat transkripsi dimulai.
+    """
+    # 'finished' mengirim nama model yang berhasil dimuat.
+    finished = pyqtSignal(str)
+    # 'error' mengirim pesan jika pemuatan gagal (misal: tidak ada koneksi internet).
+    error = pyqtSignal(str)
+
+    def __init__(self, model_name, backend=DEFAULT_BACKEND):
+        super().__init__()
+        self.model_name = model_name
+        self.backend = backend
+
+    def run(self):
+        try:
+            from core_logic import preload_model
+            plan = preload_model(self.model_name, self.backend)
+            if plan.action in ("load", "quantize"):
+                self.finished.emit(plan.model_name)
+            else:
+                # RAM tidak cukup: warm-up dilewati, job nanti yang menurunkan model atau menunggu.
+                self.error.emit(plan.reason)
+        except Exception as e:
+            self.error.emit(str(e))
+
 # --- Kelas Utama Aplikasi ---
 class MaSubsApp(QMainWindow):
     """
@@ -74,10 +281,79 @@ class MaSubsApp(QMainWindow):
         
         # Properti untuk menyimpan path file yang dipilih oleh pengguna.
         self.selected_file_path = None
+        # Daftar file untuk mode batch (lebih dari satu file atau satu folder).
+        self.batch_file_paths = []
+        # Progres terakhir per file pada mode batch, untuk menghitung progres keseluruhan.
+        self.batch_progress = {}
+        self.listed_file_paths = []
+        self.diagnostics_dialog = None
         
         # Panggil metode untuk menginisialisasi dan mengatur semua elemen UI.
         self.init_ui()
 
+        # Persiapan (impor modul logika, cek ffmpeg) baru dimulai setelah event loop berjalan,
+        # sehingga jendela tampil lebih dulu. Warm-up model menyusul setelah persiapan selesai.
+        QTimer.singleShot(0, self.start_startup_checks)
+
+    def start_startup_checks(self):
+        """Menjalankan StartupWorker di thread terpisah; hasilnya ditampilkan di indikator status bar."""
+        self.startup_thread = QThread()
+        self.startup_worker = StartupWorker(STARTUP_MODULES, ("ffmpeg", "ffprobe"))
+        self.startup_worker.moveToThread(self.startup_thread)
+
+        self.startup_thread.started.connect(self.startup_worker.run)
+        self.startup_worker.finished.connect(self.on_startup_finished)
+        self.startup_thread.finished.connect(self.startup_thread.deleteLater)
+        self.startup_worker.finished.connect(self.startup_thread.quit)
+        self.startup_thread.start()
+
+    def on_startup_finished(self, report):
+        """Slot yang dipanggil saat persiapan latar belakang selesai."""
+        self.lbl_readiness.set_report(report)
+        if "batch_queue" not in report["errors"]:
+            from batch_queue import default_worker_count
+            # Nilai bawaan hanya diisi jika pengguna belum mengubahnya selama persiapan.
+            if not self.spin_workers_edited:
+                self.spin_workers.setValue(default_worker_count(self.combo_model.currentText()))
+        report_startup_event("ready", seconds_warm_up=report["seconds"], missing=report["missing"])
+        if startup_benchmark_enabled():
+            # Mode benchmark: waktu sudah dicatat, aplikasi ditutup tanpa memuat model.
+            QApplication.instance().quit()
+            return
+        # Mulai warm-up model di latar belakang jika diaktifkan. Jika job dikirim ke server,
+        # model dimuat di sana, jadi RAM komputer ini tidak perlu dipakai.
+        if PRELOAD_MODEL_ON_START and not self.chk_server.isChecked() and "core_logic" not in report["errors"]:
+            self.start_model_preload()
+
+    def start_model_preload(self):
+        """Memuat model yang dipilih di combo box ke cache di thread terpisah."""
+        model_name = self.combo_model.currentText()
+        self.preload_thread = QThread()
+        self.preload_worker = PreloadWorker(model_name, self.selected_backend())
+        self.preload_worker.moveToThread(self.preload_thread)
+
+        self.preload_thread.started.connect(self.preload_worker.run)
+        self.preload_worker.finished.connect(self.on_preload_finished)
+        self.preload_worker.error.connect(self.on_preload_error)
+
+        self.preload_thread.finished.connect(self.preload_thread.deleteLater)
+        self.preload_worker.finished.connect(self.preload_thread.quit)
+        self.preload_worker.error.connect(self.preload_thread.quit)
+
+        self.update_status(f"Memuat model '{model_name}' di latar belakang...")
+        self.preload_thread.start()
+
+    def on_preload_finished(self, model_name):
+        """Slot yang dipanggil saat warm-up model selesai."""
+        # Jangan menimpa status jika transkripsi sudah berjalan.
+        if self.btn_start.isEnabled():
+            self.update_status(f"Siap (model '{model_name}' sudah dimuat)")
+
+    def on_preload_error(self, error_message):
+        """Slot yang dipanggil saat warm-up model gagal."""
+        if self.btn_start.isEnabled():
+            self.update_status(f"Siap (warm-up model gagal: {error_message})")
+
     def init_ui(self):
         """Menginisialisasi semua komponen antarmuka pengguna (UI)."""
         self.setWindowTitle("MaSubs - Auto Subtitle Generator")
@@ -95,6 +371,10 @@ class MaSubsApp(QMainWindow):
         self.btn_browse.clicked.connect(self.open_file_dialog) # Menghubungkan klik tombol ke metode.
         self.layout.addWidget(self.btn_browse)
 
+        self.btn_browse_folder = QPushButton("Atau Pilih Folder (Batch)...")
+        self.btn_browse_folder.clicked.connect(self.open_folder_dialog)
+        self.layout.addWidget(self.btn_browse_folder)
+
         self.lbl_file_path = QLabel("Belum ada file yang dipilih.")
         self.lbl_file_path.setStyleSheet("font-style: italic; color: grey;")
         self.layout.addWidget(self.lbl_file_path)
@@ -108,6 +388,98 @@ class MaSubsApp(QMainWindow):
         self.combo_model.setCurrentText("base") # Set nilai default.
         self.layout.addWidget(self.combo_model)
 
+        # --- Bagian UI: Pemilihan Backend Inferensi ---
+        # Hanya backend yang pustakanya terpasang yang ditampilkan; nama backend disimpan
+        # sebagai data item, teks yang terlihat adalah labelnya.
+        backend_row = QHBoxLayout()
+        backend_row.addWidget(QLabel("Mesin inferensi:"))
+        self.combo_backend = QComboBox()
+        for name in available_backends() or [DEFAULT_BACKEND]:
+            self.combo_backend.addItem(BACKENDS[name].label, name)
+        backend_row.addWidget(self.combo_backend)
+        self.layout.addLayout(backend_row)
+
+        # --- Bagian UI: Bahasa dan Mode Decoding ---
+        # Menentukan bahasa di sini melewati deteksi bahasa. Mode 'Cepat' memakai decoding greedy
+        # tanpa fallback temperatur; 'Akurat' memakai beam search + fallback (2-3x lebih lambat).
+        decode_row = QHBoxLayout()
+        decode_row.addWidget(QLabel("Bahasa:"))
+        self.combo_language = QComboBox()
+        for code, label in LANGUAGE_CHOICES:
+            self.combo_language.addItem(label, code)
+        decode_row.addWidget(self.combo_language)
+        decode_row.addWidget(QLabel("Decoding:"))
+        self.combo_decode = QComboBox()
+        self.combo_decode.addItem("Cepat", "cepat")
+        self.combo_decode.addItem("Akurat (lebih lambat)", "akurat")
+        decode_row.addWidget(self.combo_decode)
+        self.layout.addLayout(decode_row)
+
+        # --- Bagian UI: Jumlah Proses Worker (mode batch) ---
+        worker_row = QHBoxLayout()
+        worker_row.addWidget(QLabel("Jumlah proses worker (batch / audio panjang):"))
+        self.spin_workers = QSpinBox()
+        self.spin_workers.setRange(1, max(1, os.cpu_count() or 1))
+        # Nilai bawaan (berdasarkan RAM dan ukuran model) diisi setelah batch_queue selesai diimpor.
+        self.spin_workers.setValue(1)
+        self.spin_workers_edited = False
+        self.spin_workers.valueChanged.connect(self.on_spin_workers_edited)
+        worker_row.addWidget(self.spin_workers)
+        self.layout.addLayout(worker_row)
+
+        # --- Bagian UI: Mode Audio Panjang ---
+        self.chk_long_form = QCheckBox("Mode audio panjang (dipotong di bagian hening, diproses paralel)")
+        self.layout.addWidget(self.chk_long_form)
+
+        # --- Bagian UI: Mode Batch Klip Pendek ---
+        self.chk_batched = QCheckBox("Batch: gabungkan klip pendek dalam satu proses model (banyak file < 1 menit)")
+        self.layout.addWidget(self.chk_batched)
+
+        # --- Bagian UI: Mode Pipeline (Transkripsi + Burn-in) ---
+        self.chk_burn = QCheckBox("Langsung burn subtitle ke video (tanpa membuka MaSubsBurner)")
+        self.layout.addWidget(self.chk_burn)
+
+        # --- Bagian UI: Server Job ---
+        # Job dikirim ke server job bersama (python masubs.py serve) yang modelnya selalu termuat.
+        # Alamat server diambil dari environment variable MASUBS_SERVER_URL (bawaan: komputer ini).
+        self.chk_server = QCheckBox(f"Kirim ke server job ({server_url()})")
+        self.chk_server.setChecked(bool(os.environ.get(SERVER_URL_ENV)))
+        self.layout.addWidget(self.chk_server)
+
+        # --- Bagian UI: Hemat Memori ---
+        self.chk_release_model = QCheckBox("Bebaskan memori model setelah selesai (untuk RAM terbatas)")
+        self.layout.addWidget(self.chk_release_model)
+
+        # --- Bagian UI: Lewati Bagian Hening ---
+        # Hanya wilayah berisi ucapan yang dikirim ke Whisper: lebih cepat untuk rekaman dengan
+        # banyak jeda/musik, dan mencegah subtitle "halusinasi" di bagian kosong.
+        self.chk_skip_silence = QCheckBox("Lewati bagian hening / tanpa ucapan")
+        self.chk_skip_silence.setChecked(True)
+        self.layout.addWidget(self.chk_skip_silence)
+
+        # --- Bagian UI: Transkripsi Inkremental ---
+        # Setelah video diedit lalu diekspor ulang, audionya dicocokkan dengan versi sebelumnya
+        # dan hanya bagian yang berubah yang ditranskripsi ulang (per file, juga di antrean batch;
+        # tidak untuk audio panjang dan batch klip pendek).
+        self.chk_incremental = QCheckBox("Transkripsi inkremental (hanya bagian yang berubah setelah diedit)")
+        self.layout.addWidget(self.chk_incremental)
+        # Batch klip pendek tidak mendukung mode inkremental; checkbox dinonaktifkan selama mode itu aktif.
+        self.chk_batched.toggled.connect(self.update_incremental_enabled)
+        self.chk_server.toggled.connect(self.update_incremental_enabled)
+
+        # --- Bagian UI: Format Ekspor ---
+        # Format tambahan dibuat dari segmen yang sama setelah transkripsi (hitungan milidetik).
+        # .ass sudah diberi gaya untuk MaSubsBurner, .vtt untuk pemutar web.
+        self.chk_export_all = QCheckBox("Ekspor juga .vtt, .ass, dan .json")
+        self.layout.addWidget(self.chk_export_all)
+
+        # --- Bagian UI: Tata Letak Subtitle ---
+        # Whisper menyimpan waktu setiap kata, lalu segmen panjang dipecah menjadi subtitle
+        # maksimal dua baris yang nyaman dibaca. Penyusunan ulang berjalan setelah inferensi,
+        # jadi hasil dari cache juga bisa dirapikan tanpa transkripsi ulang.
+        self.chk_relayout = QCheckBox("Timestamp per kata + rapikan baris subtitle (maks. 2 baris, 42 karakter)")
+        self.layout.addWidget(self.chk_relayout)
+
         # --- Bagian UI: Indikator Progres ---
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False) # Sembunyikan sampai proses dimulai.
@@ -127,20 +499,71 @@ class MaSubsApp(QMainWindow):
         self.text_result.setReadOnly(True) # Agar pengguna tidak bisa mengedit hasil.
         self.layout.addWidget(self.text_result)
 
+        # Daftar status per file untuk mode batch. Disembunyikan pada mode satu file.
+        self.list_batch = QListWidget()
+        self.list_batch.setVisible(False)
+        self.layout.addWidget(self.list_batch)
+
         # --- Status Bar di bagian bawah jendela ---
         self.setStatusBar(QStatusBar(self))
         self.update_status("Siap")
-        
+        # Tombol panel diagnostik: waktu setiap tahap dari job terakhir.
+        self.btn_diagnostics = QPushButton("Diagnostik...")
+        self.btn_diagnostics.setFlat(True)
+        self.btn_diagnostics.clicked.connect(self.show_diagnostics)
+        self.statusBar().addPermanentWidget(self.btn_diagnostics)
+        # Indikator kesiapan: modul logika dan ffmpeg diperiksa di latar belakang setelah jendela tampil.
+        self.lbl_readiness = ReadinessIndicator()
+        self.statusBar().addPermanentWidget(self.lbl_readiness)
+
+    def on_spin_workers_edited(self):
+        """Menandai bahwa jumlah worker sudah diatur pengguna, agar tidak ditimpa nilai bawaan."""
+        self.spin_workers_edited = True
+
+    def selected_backend(self) -> str:
+        """Mengembalikan nama backend inferensi yang dipilih di combo box."""
+        return self.combo_backend.currentData() or DEFAULT_BACKEND
+
+    def selected_export_formats(self) -> tuple:
+        """Format subtitle yang ditulis untuk setiap file."""
+        return EXPORT_FORMATS if self.chk_export_all.isChecked() else ("srt",)
+
+    def selected_decode_options(self):
+        """Menyusun TranscribeOptions dari pilihan bahasa dan mode decoding."""
+        options = DECODE_PRESETS[self.combo_decode.currentData() or "cepat"]
+        if self.chk_relayout.isChecked():
+            options = replace(options, word_timestamps=True)
+        return options.with_language(self.combo_language.currentData())
+
+    def selected_layout(self):
+        """Aturan tata letak subtitle, atau None jika segmen ditulis apa adanya."""
+        return LayoutRules() if self.chk_relayout.isChecked() else None
+
+    def show_diagnostics(self):
+        """Membuka panel diagnostik performa (tidak modal, bisa dibiarkan terbuka selama proses)."""
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+
     def start_transcription(self):
         """Metode ini dipanggil saat tombol 'Mulai Transkripsi' diklik."""
+        if self.chk_server.isChecked() and (self.batch_file_paths or self.selected_file_path):
+            self.start_server_jobs(self.batch_file_paths or [self.selected_file_path])
+            return
+
+        # Mode batch dipakai jika pengguna memilih lebih dari satu file atau sebuah folder.
+        if self.batch_file_paths:
+            self.start_batch_transcription()
+            return
+
         # 1. Validasi: Pastikan pengguna sudah memilih file.
         if not self.selected_file_path:
             QMessageBox.warning(self, "Peringatan", "Silakan pilih file terlebih dahulu!")
             return
 
         # 2. Persiapan UI: Nonaktifkan tombol untuk mencegah klik ganda dan siapkan area progres.
-        self.btn_start.setEnabled(False)
-        self.btn_browse.setEnabled(False)
+        self.set_ui_enabled(False)
         self.text_result.clear()
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
@@ -150,7 +573,17 @@ class MaSubsApp(QMainWindow):
         
         # 4. Inisialisasi Threading: Buat objek thread dan worker.
         self.thread = QThread()
-        self.worker = Worker(self.selected_file_path, selected_model)
+        self.worker = Worker(self.selected_file_path, selected_model,
+                             long_form=self.chk_long_form.isChecked(),
+                             max_workers=self.spin_workers.value(),
+                             burn=self.chk_burn.isChecked(),
+                             backend=self.selected_backend(),
+                             release_after=self.chk_release_model.isChecked(),
+                             skip_silence=self.chk_skip_silence.isChecked(),
+                             options=self.selected_decode_options(),
+                             export_formats=self.selected_export_formats(),
+                             layout=self.selected_layout(),
+                             incremental=self.chk_incremental.isChecked())
         self.worker.moveToThread(self.thread) # Pindahkan worker ke thread baru.
 
         # 5. Hubungkan Sinyal ke Slot: Ini adalah inti dari komunikasi antar-thread.
@@ -162,6 +595,7 @@ class MaSubsApp(QMainWindow):
         self.worker.finished.connect(self.on_transcription_finished)
         self.worker.error.connect(self.on_transcription_error)
         self.worker.progress.connect(self.update_progress)
+        self.worker.segment.connect(self.append_segment)
 
         # 6. Atur pembersihan (cleanup) setelah thread selesai.
         self.thread.finished.connect(self.thread.deleteLater)
@@ -171,24 +605,159 @@ class MaSubsApp(QMainWindow):
         # 7. Mulai eksekusi thread. Proses 'run' di worker akan dimulai.
         self.thread.start()
 
+    def start_batch_transcription(self):
+        """Menjalankan antrean transkripsi untuk semua file pada mode batch."""
+        self.set_ui_enabled(False)
+        self.text_result.clear()
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.batch_progress = {path: 0 for path in self.batch_file_paths}
+        self.populate_batch_list()
+
+        self.thread = QThread()
+        self.worker = BatchWorker(self.batch_file_paths, self.combo_model.currentText(),
+                                  self.spin_workers.value(), self.selected_backend(),
+                                  batched=self.chk_batched.isChecked(),
+                                  options=self.selected_decode_options(),
+                                  export_formats=self.selected_export_formats(),
+                                  layout=self.selected_layout(),
+                                  skip_silence=self.chk_skip_silence.isChecked(),
+                                  release_after=self.chk_release_model.isChecked(),
+                                  incremental=self.chk_incremental.isChecked())
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.file_progress.connect(self.on_batch_file_progress)
+        self.worker.file_finished.connect(self.on_batch_file_finished)
+        self.worker.stats.connect(self.on_batch_stats)
+        self.worker.finished.connect(self.on_batch_finished)
+        self.worker.error.connect(self.on_transcription_error)
+
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.error.connect(self.thread.quit)
+
+        if self.chk_batched.isChecked():
+            self.update_status(f"Memproses {len(self.batch_file_paths)} file dalam batch inferensi...")
+        else:
+            self.update_status(f"Memproses {len(self.batch_file_paths)} file dengan {self.spin_workers.value()} proses worker...")
+        self.thread.start()
+
+    def start_server_jobs(self, file_paths):
+        """Mengirim file ke server job; progres setiap file ditampilkan di daftar batch."""
+        kind = "pipeline" if self.chk_burn.isChecked() else "transcribe"
+        jobs = [(path, job_params(file_path=path, model=self.combo_model.currentText(),
+                                  backend=self.selected_backend(), long=self.chk_long_form.isChecked(),
+                                  skip_silence=self.chk_skip_silence.isChecked(),
+                                  options=self.selected_decode_options(), layout=self.selected_layout(),
+                                  export_formats=self.selected_export_formats(),
+                                  incremental=self.chk_incremental.isChecked()))
+                for path in file_paths]
+
+        self.set_ui_enabled(False)
+        self.text_result.clear()
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.batch_progress = {path: 0 for path in file_paths}
+        self.populate_batch_list(file_paths)
+
+        self.thread = QThread()
+        self.worker = ServerJobWorker(kind, jobs)
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.file_progress.connect(self.on_batch_file_progress)
+        self.worker.file_finished.connect(self.on_batch_file_finished)
+        self.worker.finished.connect(self.on_batch_finished)
+        self.worker.error.connect(self.on_transcription_error)
+
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.error.connect(self.thread.quit)
+
+        self.update_status("Mengirim job ke server...")
+        self.thread.start()
+
+    def populate_batch_list(self, file_paths=None):
+        """Mengisi daftar status batch dengan semua file yang menunggu."""
+        # File yang sedang ditampilkan di daftar (batch lokal atau job di server).
+        self.listed_file_paths = list(file_paths or self.batch_file_paths)
+        self.list_batch.clear()
+        for path in self.listed_file_paths:
+            self.list_batch.addItem(f"[menunggu] {os.path.basename(path)}")
+        self.list_batch.setVisible(True)
+
+    def set_batch_item_text(self, file_path, text):
+        """Memperbarui teks baris daftar batch untuk file tertentu."""
+        row = self.listed_file_paths.index(file_path)
+        self.list_batch.item(row).setText(f"{text} {os.path.basename(file_path)}")
+
+    def update_batch_overall_progress(self):
+        """Menghitung progres keseluruhan sebagai rata-rata progres semua file."""
+        total = len(self.batch_progress) or 1
+        self.progress_bar.setValue(int(sum(self.batch_progress.values()) / total))
+
+    def on_batch_file_progress(self, file_path, percent, message):
+        self.batch_progress[file_path] = percent
+        self.set_batch_item_text(file_path, f"[{percent}%] {message} —")
+        self.update_batch_overall_progress()
+
+    def on_batch_file_finished(self, file_path, status, detail):
+        labels = {"done": "[selesai]", "failed": "[gagal]", "cancelled": "[dibatalkan]"}
+        self.batch_progress[file_path] = 100
+        text = labels.get(status, f"[{status}]")
+        if status == "failed":
+            text = f"{text} ({detail})"
+        self.set_batch_item_text(file_path, text)
+        self.update_batch_overall_progress()
+
+    def on_batch_stats(self, stats):
+        self.update_status(
+            f"{stats['completed']} selesai, {stats['failed']} gagal dari {stats['total']} file "
+            f"— {stats['files_per_minute']:.1f} file/menit"
+        )
+
+    def on_batch_finished(self, results):
+        """Slot yang dipanggil saat seluruh antrean batch selesai."""
+        self.progress_bar.setValue(100)
+        done = [r for r in results if r["status"] == "done"]
+        failed = [r for r in results if r["status"] == "failed"]
+        self.update_status(f"Batch selesai: {len(done)} berhasil, {len(failed)} gagal.")
+        self.text_result.setText("\n".join(
+            f"{os.path.basename(r['file_path'])}: {r['srt_path'] or r['error'] or r['status']}" for r in results
+        ))
+        QMessageBox.information(self, "Batch Selesai",
+                                f"{len(done)} file berhasil ditranskripsi, {len(failed)} gagal.")
+        self.set_ui_enabled(True)
+        self.progress_bar.setVisible(False)
+
     def update_progress(self, percent, message):
         """Slot yang menerima sinyal progres dan memperbarui UI."""
         self.progress_bar.setValue(percent)
         self.update_status(message)
 
+    def append_segment(self, segment):
+        """Slot yang menambahkan segmen baru ke area hasil selama transkripsi berjalan."""
+        start_time = format_timestamp(segment["start"])
+        end_time = format_timestamp(segment["end"])
+        self.text_result.append(f"[{start_time} --> {end_time}] {segment['text'].strip()}")
+
     def on_transcription_finished(self, result_tuple):
         """Slot yang menerima sinyal 'finished' dan menampilkan hasil."""
         self.progress_bar.setValue(100)
         self.update_status("Transkripsi Selesai!")
 
-        plain_text, saved_path = result_tuple
+        plain_text, saved_path = result_tuple[:2]
         self.text_result.setText(plain_text)
         
-        QMessageBox.information(self, "Sukses", f"Proses transkripsi telah selesai!\n\nFile subtitle disimpan di:\n{saved_path}")
+        message = f"Proses transkripsi telah selesai!\n\nFile subtitle disimpan di:\n{saved_path}"
+        # Mode pipeline mengembalikan path video hasil burn-in sebagai elemen ketiga.
+        if len(result_tuple) > 2:
+            message += f"\n\nVideo dengan subtitle disimpan di:\n{result_tuple[2]}"
+        QMessageBox.information(self, "Sukses", message)
         
         # Aktifkan kembali UI setelah proses selesai.
-        self.btn_start.setEnabled(True)
-        self.btn_browse.setEnabled(True)
+        self.set_ui_enabled(True)
         self.progress_bar.setVisible(False)
 
     def on_transcription_error(self, error_message):
@@ -198,19 +767,65 @@ class MaSubsApp(QMainWindow):
         QMessageBox.critical(self, "Error", f"Terjadi kesalahan:\n{error_message}")
         
         # Aktifkan kembali UI setelah terjadi error.
-        self.btn_start.setEnabled(True)
-        self.btn_browse.setEnabled(True)
+        self.set_ui_enabled(True)
+
+    def set_ui_enabled(self, is_enabled):
+        """Metode utilitas untuk mengaktifkan/menonaktifkan tombol-tombol UI."""
+        self.btn_start.setEnabled(is_enabled)
+        self.btn_browse.setEnabled(is_enabled)
+        self.btn_browse_folder.setEnabled(is_enabled)
+        self.combo_backend.setEnabled(is_enabled)
+        self.combo_language.setEnabled(is_enabled)
+        self.combo_decode.setEnabled(is_enabled)
+        self.chk_relayout.setEnabled(is_enabled)
+        self.chk_incremental.setEnabled(is_enabled and self.incremental_available())
+        self.chk_server.setEnabled(is_enabled)
 
     def open_file_dialog(self):
-        """Membuka dialog file sistem untuk memilih file input."""
-        # 'QFileDialog.getOpenFileName' mengembalikan tuple (nama_file, filter_dipilih).
-        file_name, _ = QFileDialog.getOpenFileName(self, "Pilih File Audio/Video", "", "All Files (*);;Audio Files (*.mp3 *.wav *.m4a);;Video Files (*.mp4 *.mkv)")
-        if file_name:
+        """Membuka dialog file sistem untuk memilih satu atau beberapa file input."""
+        # 'QFileDialog.getOpenFileNames' mengembalikan tuple (daftar_nama_file, filter_dipilih).
+        file_names, _ = QFileDialog.getOpenFileNames(self, "Pilih File Audio/Video", "", "All Files (*);;Audio Files (*.mp3 *.wav *.m4a);;Video Files (*.mp4 *.mkv)")
+        if len(file_names) == 1:
+            file_name = file_names[0]
             self.selected_file_path = file_name
+            self.batch_file_paths = []
+            self.list_batch.setVisible(False)
+            self.update_incremental_enabled()
             self.lbl_file_path.setText(f"File: {file_name}")
             self.lbl_file_path.setStyleSheet("font-style: normal; color: black;")
             self.update_status(f"File dipilih: {file_name}")
-            
+        elif file_names:
+            self.set_batch_files(file_names)
+
+    def open_folder_dialog(self):
+        """Membuka dialog untuk memilih folder; semua file media di dalamnya masuk antrean batch."""
+        folder = QFileDialog.getExistingDirectory(self, "Pilih Folder Audio/Video")
+        if folder:
+            from batch_queue import collect_media_files
+            self.set_batch_files(collect_media_files([folder]))
+
+    def set_batch_files(self, file_paths):
+        """Menyimpan daftar file untuk mode batch dan memperbarui label."""
+        if not file_paths:
+            QMessageBox.warning(self, "Peringatan", "Tidak ada file audio/video yang didukung.")
+            return
+        self.selected_file_path = None
+        self.batch_file_paths = list(file_paths)
+        self.lbl_file_path.setText(f"Batch: {len(self.batch_file_paths)} file dipilih")
+        self.lbl_file_path.setStyleSheet("font-style: normal; color: black;")
+        self.populate_batch_list()
+        self.update_incremental_enabled()
+        self.update_status(f"{len(self.batch_file_paths)} file masuk antrean batch.")
+
+    def incremental_available(self) -> bool:
+        """Mode inkremental diabaikan oleh batch klip pendek (BatchedTranscriber) yang berjalan di komputer ini."""
+        return not (self.batch_file_paths and self.chk_batched.isChecked() and not self.chk_server.isChecked())
+
+    def update_incremental_enabled(self):
+        """Menyesuaikan checkbox inkremental dengan mode yang dipilih (hanya jika UI sedang aktif)."""
+        if self.btn_start.isEnabled():
+            self.chk_incremental.setEnabled(self.incremental_available())
+
     def update_status(self, message):
         """Metode utilitas untuk menampilkan pesan di status bar."""
         self.statusBar().showMessage(message)
@@ -218,11 +833,16 @@ class MaSubsApp(QMainWindow):
 # --- Titik Masuk Eksekusi Aplikasi ---
 # '__name__ == "__main__"' memastikan kode ini hanya berjalan saat file ini dieksekusi secara langsung.
 if __name__ == '__main__':
+    # Wajib untuk build PyInstaller: proses worker batch dibuat dengan metode 'spawn'
+    # dan harus berhenti di sini alih-alih membuka jendela baru.
+    multiprocessing.freeze_support()
     # Membuat instance aplikasi utama.
     app = QApplication(sys.argv)
     # Membuat instance dari kelas jendela utama kita.
     window = MaSubsApp()
     # Menampilkan jendela ke layar.
     window.show()
+    # Dicatat saat event loop mulai berjalan, yaitu setelah jendela pertama kali digambar.
+    QTimer.singleShot(0, lambda: report_startup_event("shown"))
     # Memulai event loop aplikasi dan menunggu interaksi pengguna.
     sys.exit(app.exec())
\ No newline at end of file
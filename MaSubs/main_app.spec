@@ -7,7 +7,9 @@ whisper_assets_path = r'D:\Ramadhan\python\MaSubs\venv\Lib\site-packages\whisper
 
 a = Analysis(
     ['main_app.py'],
-    pathex=[],
+    # Root repositori ditambahkan agar paket bersama 'masubs_common' ikut dibundel,
+    # dan folder MaSubsBurner untuk modul burn-in yang dipakai mode pipeline.
+    pathex=['..', '../MaSubsBurner'],
     # --- PERUBAHAN PENTING ADA DI SINI ---
     # Kita tambahkan ffmpeg.exe dan ffprobe.exe ke daftar binaries
     binaries=[('ffmpeg.exe', '.'), ('ffprobe.exe', '.')],
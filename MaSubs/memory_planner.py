@@ -0,0 +1,234 @@
+import os
+import sys
+import threading
+from dataclasses import dataclass
+
+from backends import get_backend, DEFAULT_BACKEND
+
+# Jumlah parameter setiap model Whisper (juta). Dipakai untuk memperkirakan kebutuhan
+# memori SEBELUM model dimuat, karena memuat model yang terlalu besar bisa membuat
+# sistem swap berat atau proses dihentikan oleh OOM killer.
+MODEL_PARAMETERS_M = {"tiny": 39, "base": 74, "small": 244, "medium": 769, "large": 1550}
+
+# Perkiraan memori kerja saat inferensi di luar bobot model (aktivasi encoder, KV cache
+# decoder, buffer mel), dalam MB.
+RUNTIME_OVERHEAD_MB = {"tiny": 250, "base": 300, "small": 450, "medium": 700, "large": 1100}
+
+# Byte per parameter untuk setiap presisi. Kuantisasi int8 dinamis hanya mengecilkan
+# lapisan Linear; embedding dan LayerNorm tetap FP32, sehingga rata-ratanya di atas 1 byte.
+BYTES_PER_PARAMETER = {"fp32": 4.0, "int8": 1.4}
+
+# Sisa RAM (MB) yang selalu disisakan untuk sistem operasi, GUI, dan ffmpeg.
+DEFAULT_HEADROOM_MB = 1024
+
+# Environment variable untuk mematikan guard memori ('0'), juga berlaku di proses worker (spawn).
+MEMORY_GUARD_ENV = "MASUBS_MEMORY_GUARD"
+
+# Pengaturan guard memori yang berlaku di seluruh proses (lihat configure_memory_guard()).
+_settings = {
+    "enabled": os.environ.get(MEMORY_GUARD_ENV) != "0",
+    "allow_quantize": True,
+    "allow_downgrade": True,
+    # Lama maksimal (detik) sebuah job menunggu memori dibebaskan job lain sebelum gagal.
+    "wait_timeout": 600.0,
+    "headroom_mb": DEFAULT_HEADROOM_MB,
+}
+_settings_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class MemoryPlan:
+    """
+    Keputusan cara memuat model untuk satu job.
+
+    Attributes:
+        requested_model (str): Model yang diminta pengguna.
+        model_name (str): Model yang akan benar-benar dimuat (bisa lebih kecil jika diturunkan).
+        backend (str): Nama backend inferensi.
+        precision (str): 'fp32' atau 'int8'.
+        action (str): 'load' (muat apa adanya), 'quantize' (muat dalam int8), 'downgrade'
+            (pakai model yang lebih kecil), atau 'wait' (tunggu memori dibebaskan job lain).
+        required_mb (float): Perkiraan kebutuhan memori model tersebut.
+        available_mb (float | None): RAM yang tersedia saat perencanaan (None = tidak diketahui).
+        evict_idle (bool): Model lain yang sedang tidak dipakai harus dikeluarkan dari cache dulu.
+        reason (str): Penjelasan singkat untuk status bar / log.
+    """
+    requested_model: str
+    model_name: str
+    backend: str
+    precision: str
+    action: str
+    required_mb: float
+    available_mb: float = None
+    evict_idle: bool = False
+    reason: str = ""
+
+
+def configure_memory_guard(enabled=None, allow_quantize=None, allow_downgrade=None, wait_timeout=None,
+                           headroom_mb=None):
+    """
+    Mengubah perilaku guard memori. Argumen yang bernilai None tidak diubah.
+
+    Args:
+        enabled (bool, optional): Jika False, model selalu dimuat apa adanya (perilaku lama).
+        allow_quantize (bool, optional): Boleh memuat model dalam int8 jika FP32 tidak muat.
+        allow_downgrade (bool, optional): Boleh memakai model yang lebih kecil jika tetap tidak muat.
+        wait_timeout (float, optional): Batas waktu menunggu memori (detik).
+        headroom_mb (float, optional): RAM yang selalu disisakan untuk sistem.
+    """
+    with _settings_lock:
+        for key, value in (("enabled", enabled), ("allow_quantize", allow_quantize),
+                           ("allow_downgrade", allow_downgrade), ("wait_timeout", wait_timeout),
+                           ("headroom_mb", headroom_mb)):
+            if value is not None:
+                _settings[key] = value
+
+
+def memory_guard_settings() -> dict:
+    """Mengembalikan salinan pengaturan guard memori saat ini."""
+    with _settings_lock:
+        return dict(_settings)
+
+
+def available_memory_mb():
+    """
+    Membaca RAM yang masih bisa dipakai tanpa swap (MB).
+
+    Returns:
+        float | None: RAM tersedia, atau None jika tidak dapat ditentukan di platform ini.
+    """
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 * 1024)
+    except ImportError:
+        pass
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/meminfo", "r") as meminfo:
+                for line in meminfo:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) / 1024
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        import ctypes
+
+        class _MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = _MemoryStatus()
+        status.dwLength = ctypes.sizeof(_MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys / (1024 * 1024)
+    return None
+
+
+def estimate_model_memory_mb(model_name: str, backend: str = DEFAULT_BACKEND, precision: str = None) -> float:
+    """
+    Memperkirakan puncak memori untuk memuat dan menjalankan satu model.
+
+    Args:
+        model_name (str): Nama model Whisper.
+        backend (str): Nama backend inferensi.
+        precision (str, optional): 'fp32' atau 'int8'. Defaults to presisi bawaan backend.
+
+    Returns:
+        float: Perkiraan kebutuhan memori dalam MB.
+    """
+    precision = precision or get_backend(backend).default_precision
+    parameters = MODEL_PARAMETERS_M.get(model_name, MODEL_PARAMETERS_M["large"]) * 1e6
+    weights_mb = parameters * BYTES_PER_PARAMETER[precision] / (1024 * 1024)
+    if precision == "int8" and backend == DEFAULT_BACKEND:
+        # Kuantisasi dilakukan setelah bobot FP32 dimuat. Checkpoint di-memory-map, jadi
+        # hanya sebagian bobot FP32 yang sempat tinggal di RAM selama konversi.
+        weights_mb += parameters * 4.0 / (1024 * 1024) * 0.25
+    return weights_mb + RUNTIME_OVERHEAD_MB.get(model_name, RUNTIME_OVERHEAD_MB["large"])
+
+
+def plan_model_load(model_name: str, backend: str = DEFAULT_BACKEND, available_mb=None,
+                    reclaimable_mb: float = 0.0, busy: bool = False) -> MemoryPlan:
+    """
+    Menentukan cara memuat model agar tidak melebihi RAM yang tersedia. Urutan pilihan:
+    muat apa adanya -> keluarkan model lain yang tidak dipakai -> muat dalam int8 ->
+    turunkan ke model yang lebih kecil -> tunggu job lain selesai.
+
+    Args:
+        model_name (str): Model yang diminta.
+        backend (str): Nama backend inferensi.
+        available_mb (float, optional): RAM tersedia. Defaults to available_memory_mb().
+        reclaimable_mb (float): Memori yang bisa dibebaskan dengan mengeluarkan model yang
+            sedang tidak dipakai dari cache.
+        busy (bool): Ada job lain yang sedang memakai model; jika True, menunggu lebih
+            baik daripada menurunkan model.
+
+    Returns:
+        MemoryPlan: Keputusan pemuatan model.
+    """
+    settings = memory_guard_settings()
+    engine = get_backend(backend)
+    default_precision = engine.default_precision
+
+    def plan(action, name, precision, evict_idle=False, reason=""):
+        return MemoryPlan(model_name, name, backend, precision, action,
+                          estimate_model_memory_mb(name, backend, precision), available_mb, evict_idle, reason)
+
+    if available_mb is None:
+        available_mb = available_memory_mb()
+    if not settings["enabled"] or available_mb is None:
+        return plan("load", model_name, default_precision)
+
+    budget = available_mb - settings["headroom_mb"]
+    precisions = [default_precision]
+    if settings["allow_quantize"] and "int8" in engine.precisions and "int8" not in precisions:
+        precisions.append("int8")
+
+    # Model yang diminta: coba dengan RAM bebas saat ini, lalu dengan RAM dari model yang dikeluarkan.
+    for precision in precisions:
+        for evict_idle, limit in ((False, budget), (True, budget + reclaimable_mb)):
+            if evict_idle and not reclaimable_mb:
+                continue
+            if estimate_model_memory_mb(model_name, backend, precision) <= limit:
+                action = "load" if precision == default_precision else "quantize"
+                reason = "" if action == "load" else f"RAM terbatas, model '{model_name}' dimuat dalam int8"
+                return plan(action, model_name, precision, evict_idle, reason)
+
+    # Jika job lain sedang memakai memori, lebih baik menunggu daripada menurunkan akurasi.
+    if busy:
+        return plan("wait", model_name, precisions[-1], True,
+                    f"Menunggu memori dibebaskan job lain untuk model '{model_name}'")
+
+    if settings["allow_downgrade"] and model_name in MODEL_PARAMETERS_M:
+        smaller = [name for name in MODEL_PARAMETERS_M
+                   if MODEL_PARAMETERS_M[name] < MODEL_PARAMETERS_M[model_name]]
+        for name in reversed(smaller):
+            for precision in precisions:
+                if estimate_model_memory_mb(name, backend, precision) <= budget + reclaimable_mb:
+                    return plan("downgrade", name, precision, bool(reclaimable_mb),
+                                f"RAM tidak cukup untuk '{model_name}', memakai model '{name}' ({precision})")
+
+    return plan("wait", model_name, precisions[-1], True,
+                f"RAM tidak cukup untuk model '{model_name}'; menunggu memori tersedia")
+
+
+def max_workers_for_memory(model_name: str, backend: str = DEFAULT_BACKEND, precision: str = None) -> int:
+    """
+    Jumlah proses worker yang muat di RAM, karena setiap proses memuat model sendiri.
+
+    Args:
+        model_name (str): Nama model Whisper.
+        backend (str): Nama backend inferensi.
+        precision (str, optional): Presisi model di setiap worker. Defaults to presisi bawaan backend.
+
+    Returns:
+        int: Minimal 1 (job tetap dijalankan; worker itu sendiri yang akan menurunkan model bila perlu).
+    """
+    settings = memory_guard_settings()
+    available_mb = available_memory_mb()
+    if not settings["enabled"] or available_mb is None:
+        return os.cpu_count() or 1
+    per_worker = estimate_model_memory_mb(model_name, backend, precision)
+    return max(1, int((available_mb - settings["headroom_mb"]) // per_worker))
@@ -0,0 +1,216 @@
+import os
+import sys
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Mode pipeline memakai modul burn-in dari folder 'MaSubsBurner' (bersebelahan dengan folder ini).
+_BURNER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "MaSubsBurner")
+if _BURNER_DIR not in sys.path:
+    sys.path.append(_BURNER_DIR)
+
+from core_logic import transcribe_audio
+from backends import DEFAULT_BACKEND
+from masubs_common.media import probe_media
+from burner_logic import format_progress_message
+from encoding_profiles import get_preset, DEFAULT_PRESET
+from segment_burn import burn_video_part, concat_parts
+from batch_burn import default_output_path
+from masubs_common.instrumentation import traced, bind_span
+from masubs_common.resegment import resegment, extend_for_reading
+
+# Panjang satu potongan video (detik) yang di-encode begitu subtitle-nya lengkap.
+# Potongan yang lebih pendek membuat encode mulai lebih awal, tetapi menambah jumlah
+# proses ffmpeg dan file sementara.
+DEFAULT_PART_SECONDS = 300.0
+
+# Jumlah encode potongan yang boleh berjalan bersamaan dengan transkripsi. Whisper
+# sudah memakai sebagian besar core, jadi cukup satu encode di latar belakang.
+PIPELINE_ENCODE_JOBS = 1
+
+
+class _PipelineCancelled(Exception):
+    """Dipakai untuk menghentikan transkripsi dari dalam callback segmen saat dibatalkan."""
+
+
+class _Emitter:
+    """Meniru antarmuka 'pyqtSignal.emit' agar transcribe_audio() bisa memanggil fungsi biasa."""
+    def __init__(self, callback):
+        self.callback = callback
+
+    def emit(self, *args):
+        self.callback(*args)
+
+
+@traced("pipeline", "video_path", "model_name", "backend")
+def transcribe_and_burn(video_path: str, model_name: str, output_path: str = None, profile=None,
+                        part_seconds: float = DEFAULT_PART_SECONDS, progress_signal=None,
+                        segment_signal=None, cancel_event=None, use_cache: bool = True,
+                        backend: str = DEFAULT_BACKEND, release_after: bool = False, skip_silence: bool = True,
+                        options=None, export_formats=("srt",), layout=None):
+    """
+    Mentranskripsi video lalu langsung membakar subtitle-nya ke video dalam satu proses.
+
+    Video dibagi menjadi potongan sepanjang 'part_seconds'. Begitu transkripsi melewati
+    akhir sebuah potongan, subtitle potongan itu sudah final dan encode-nya dimulai di
+    latar belakang sementara transkripsi berlanjut. Setelah semua potongan selesai,
+    potongan digabung tanpa encode ulang dan audio asli dimasukkan sekali. Metadata
+    media (ffprobe) dan audio hasil dekode diambil dari cache bersama, jadi sumber
+    hanya dibaca ulang untuk video-nya.
+
+    Args:
+        video_path (str): Path video sumber.
+        model_name (str): Nama model Whisper.
+        output_path (str, optional): Path video hasil. Defaults to '<nama>_hardsub<ext>'.
+        profile (EncodingProfile, optional): Profil encoding. Defaults to preset DEFAULT_PRESET.
+        part_seconds (float): Panjang potongan video dalam detik.
+        progress_signal (pyqtSignal, optional): Menerima (persentase, pesan) untuk seluruh pipeline.
+        segment_signal (pyqtSignal, optional): Menerima setiap segmen (dict) begitu didekode.
+        cancel_event (threading.Event, optional): Jika di-set, transkripsi dan encode dihentikan.
+        use_cache (bool): Memakai cache hasil transkripsi.
+        backend (str): Nama backend inferensi untuk tahap transkripsi.
+        release_after (bool): Bebaskan model dari memori begitu transkripsi selesai, sehingga
+            RAM-nya tersedia untuk encode potongan terakhir.
+        skip_silence (bool): Lewati bagian tanpa ucapan saat transkripsi. Segmen tetap dilaporkan
+            dengan waktu asli, jadi batas potongan video tidak terpengaruh.
+        options (TranscribeOptions, optional): Opsi decoding untuk tahap transkripsi.
+        export_formats (iterable): Format subtitle yang ditulis di samping video sumber.
+        layout (LayoutRules, optional): Aturan tata letak subtitle. Setiap segmen disusun ulang
+            begitu didekode; subtitle terakhirnya ditahan sampai segmen berikutnya datang agar
+            perpanjangan kecepatan bacanya sama dengan resegment() pada transkrip penuh. Subtitle
+            yang dibakar sama dengan yang ditulis ke file.
+
+    Returns:
+        tuple: (string_transkripsi_penuh, path_file_srt, path_video_hasil).
+
+    Raises:
+        RuntimeError: Jika video tidak valid, encode gagal, atau proses dibatalkan.
+    """
+    def report_progress(percent, message):
+        if progress_signal:
+            progress_signal.emit(percent, message)
+
+    profile = profile or get_preset(DEFAULT_PRESET)
+    output_path = output_path or default_output_path(video_path)
+    cancel_event = cancel_event or threading.Event()
+
+    media_info = probe_media(video_path)
+    if media_info["video"] is None:
+        raise RuntimeError("File yang dipilih tidak memiliki stream video.")
+    duration = media_info["duration"]
+
+    # Progres gabungan: transkripsi mengisi 0-50%, encode potongan 50-95%, penggabungan 95-100%.
+    state_lock = threading.Lock()
+    encoded_seconds = {}
+    state = {"transcribe_percent": 0}
+
+    def report_combined(message):
+        with state_lock:
+            encoded = sum(encoded_seconds.values())
+            transcribe_fraction = state["transcribe_percent"] / 100
+        encode_fraction = min(1.0, encoded / duration) if duration else 0.0
+        report_progress(int(transcribe_fraction * 50 + encode_fraction * 45), message)
+
+    def on_transcribe_progress(percent, message):
+        with state_lock:
+            state["transcribe_percent"] = percent
+        report_combined(message)
+
+    work_dir = tempfile.mkdtemp(prefix="masubs_pipeline_", dir=os.path.dirname(os.path.abspath(output_path)))
+    extension = os.path.splitext(output_path)[1] or ".mp4"
+    segments = []
+    futures = []
+    part_start = 0.0
+    # Subtitle terakhir dari segmen sebelumnya; akhirnya baru final setelah awal subtitle berikutnya diketahui.
+    pending = []
+
+    def add_cue(cue):
+        segments.append(cue)
+        if segment_signal:
+            segment_signal.emit(cue)
+
+    def flush_pending(next_start):
+        if pending:
+            extend_for_reading(pending[0], layout, next_start - layout.min_gap)
+            add_cue(pending.pop())
+
+    def submit_part(pool, start, end):
+        index = len(futures)
+        part_path = os.path.join(work_dir, f"part{index:04d}{extension}")
+
+        def on_part_progress(info):
+            with state_lock:
+                encoded_seconds[index] = info["out_time"]
+            report_combined(f"Potongan {index + 1}: {format_progress_message(info)}")
+
+        # Salinan daftar segmen: potongan ini hanya butuh subtitle yang sudah final.
+        futures.append(pool.submit(bind_span(burn_video_part), video_path, list(segments), start, end, part_path,
+                                   profile, on_part_progress, cancel_event))
+
+    try:
+        with ThreadPoolExecutor(max_workers=PIPELINE_ENCODE_JOBS) as pool:
+            def on_segment(segment):
+                nonlocal part_start
+                if cancel_event.is_set():
+                    raise _PipelineCancelled()
+                # Encode potongan yang gagal tidak perlu menunggu transkripsi selesai untuk dilaporkan.
+                for future in futures:
+                    if future.done() and not future.result()[0]:
+                        raise _PipelineCancelled(future.result()[1])
+                cues = resegment([segment], layout, extend_last=False) if layout else [segment]
+                # Subtitle yang ditahan diselesaikan dulu (bisa menyeberang batas potongan berikutnya).
+                if layout and cues:
+                    flush_pending(cues[0]["start"])
+                # Segmen datang berurutan dan tidak saling mendahului, jadi begitu ada segmen
+                # yang dimulai setelah batas potongan, semua subtitle sebelum batas itu sudah final.
+                # Potongan terakhir tidak dipisah jika sisanya kurang dari setengah potongan.
+                while (segment["start"] >= part_start + part_seconds
+                       and (duration is None or duration - (part_start + part_seconds) >= part_seconds / 2)):
+                    submit_part(pool, part_start, part_start + part_seconds)
+                    part_start += part_seconds
+                # Segmen berikutnya belum diketahui, jadi subtitle terakhir dari segmen ini ditahan.
+                if layout and cues:
+                    pending.append(cues.pop())
+                for cue in cues:
+                    add_cue(cue)
+
+            try:
+                full_text, srt_path = transcribe_audio(video_path, model_name, _Emitter(on_transcribe_progress),
+                                                       _Emitter(on_segment), use_cache=use_cache,
+                                                       backend=backend, release_after=release_after,
+                                                       skip_silence=skip_silence, options=options,
+                                                       export_formats=export_formats, layout=layout)
+            except _PipelineCancelled as e:
+                cancel_event.set()
+                raise RuntimeError(str(e) or "Proses dibatalkan oleh pengguna.")
+            except Exception:
+                # Jika transkripsi gagal, encode yang masih berjalan ikut dihentikan.
+                cancel_event.set()
+                raise
+
+            # Subtitle terakhir transkrip diperpanjang tanpa batas, seperti resegment(extend_last=True).
+            flush_pending(float("inf"))
+            # Transkripsi selesai: sisa potongan (sampai akhir video) bisa langsung di-encode.
+            while duration is not None and duration - (part_start + part_seconds) >= part_seconds / 2:
+                submit_part(pool, part_start, part_start + part_seconds)
+                part_start += part_seconds
+            submit_part(pool, part_start, None)
+
+            part_paths = []
+            for future in futures:
+                success, detail = future.result()
+                if not success:
+                    cancel_event.set()
+                    raise RuntimeError(detail)
+                part_paths.append(detail)
+
+        report_progress(95, "Menggabungkan potongan video dan audio...")
+        success, message = concat_parts(part_paths, video_path, output_path, profile, media_info,
+                                        cancel_event=cancel_event)
+        if not success:
+            raise RuntimeError(message)
+        report_progress(100, message)
+        return full_text, srt_path, output_path
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
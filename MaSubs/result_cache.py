@@ -0,0 +1,130 @@
+import os
+import sys
+import json
+import time
+import hashlib
+
+# Paket bersama 'masubs_common' berada di root repositori (satu tingkat di atas folder ini).
+# Saat dijalankan dari kode sumber, root tersebut perlu ditambahkan ke sys.path.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from masubs_common.media import get_cache_dir
+
+# Versi format entri cache. Dinaikkan jika struktur data berubah agar entri lama diabaikan.
+CACHE_FORMAT_VERSION = 1
+
+# Batas ukuran total cache hasil transkripsi (MB). Entri yang paling lama tidak
+# dipakai dihapus lebih dulu saat batas terlampaui.
+DEFAULT_CACHE_LIMIT_MB = 200
+
+
+def make_cache_key(audio_hash: str, model_name: str, options: dict) -> str:
+    """
+    Membentuk kunci cache dari hash audio, nama model, dan opsi decoding.
+
+    Args:
+        audio_hash (str): Hash konten audio, yaitu hasil masubs_common.media.pcm_fingerprint().
+        model_name (str): Nama model Whisper.
+        options (dict): Opsi yang memengaruhi hasil transkripsi (harus bisa di-serialize ke JSON).
+
+    Returns:
+        str: Kunci cache heksadesimal.
+    """
+    payload = json.dumps({"audio": audio_hash, "model": model_name, "options": options}, sort_keys=True)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache hasil transkripsi di disk. Setiap entri menyimpan daftar segmen mentah
+    sehingga file .srt (atau format lain) bisa dibuat ulang tanpa menjalankan model.
+
+    Args:
+        cache_dir (str, optional): Folder penyimpanan. Defaults to '<get_cache_dir()>/results'.
+        max_size_mb (float): Batas ukuran total cache dalam MB.
+    """
+    def __init__(self, cache_dir=None, max_size_mb=DEFAULT_CACHE_LIMIT_MB):
+        self.cache_dir = cache_dir or os.path.join(get_cache_dir(), "results")
+        self.max_size_mb = max_size_mb
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str):
+        """
+        Mengambil entri dari cache.
+
+        Returns:
+            dict | None: Entri berisi 'text' dan 'segments', atau None jika tidak ada.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        # Memperbarui waktu akses (mtime) agar eviksi LRU tidak menghapus entri yang sering dipakai.
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """
+        Menyimpan entri ke cache lalu menegakkan batas ukuran.
+
+        Args:
+            key (str): Kunci dari make_cache_key().
+            entry (dict): Data yang disimpan, minimal berisi 'text' dan 'segments'.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = dict(entry, version=CACHE_FORMAT_VERSION, created=time.time())
+        path = self._entry_path(key)
+        # Tulis ke file sementara lalu ganti secara atomik agar pembaca tidak melihat file setengah jadi.
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(entry, cache_file, ensure_ascii=False)
+        os.replace(temp_path, path)
+        self.enforce_limit()
+
+    def enforce_limit(self):
+        """Menghapus entri yang paling lama tidak dipakai sampai ukuran total di bawah batas."""
+        if self.max_size_mb is None or not os.path.isdir(self.cache_dir):
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        limit_bytes = self.max_size_mb * 1024 * 1024
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= limit_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Menghapus semua entri cache."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
@@ -0,0 +1,180 @@
+import bisect
+
+import numpy as np
+
+from audio_chunks import frame_energy_db, SAMPLE_RATE
+
+# Batas bawah ambang energi (dBFS). Bagian yang lebih pelan dari ini selalu dianggap hening.
+MIN_THRESHOLD_DB = -60.0
+# Ambang adaptif: sekian dB di atas noise floor (persentil 10 energi frame)...
+NOISE_FLOOR_MARGIN_DB = 12.0
+# ...tetapi tidak lebih dari sekian dB di bawah level bicara (persentil 95), agar rekaman
+# yang hampir seluruhnya berisi suara tidak ikut terpotong.
+PEAK_MARGIN_DB = 25.0
+
+# Jika bagian yang bisa dilewati kurang dari fraksi ini, audio dipakai utuh (tidak sepadan).
+MIN_SKIP_FRACTION = 0.05
+# Jeda hening yang disisipkan di antara wilayah bicara pada audio ringkas, agar Whisper
+# tetap melihat batas kalimat dan tidak menggabungkan dua ucapan yang berjauhan.
+GAP_SECONDS = 0.5
+
+
+def detect_speech_regions(audio, threshold_db=None, min_speech_seconds: float = 0.25,
+                          merge_gap_seconds: float = 1.0, padding_seconds: float = 0.4,
+                          frame_seconds: float = 0.03, sample_rate: int = SAMPLE_RATE) -> list:
+    """
+    Mencari wilayah yang kemungkinan berisi ucapan berdasarkan energi audio. Bagian hening
+    panjang (dead air) tidak dikirim ke Whisper, sehingga inferensi lebih cepat dan Whisper
+    tidak 'berhalusinasi' subtitle pada bagian kosong.
+
+    Args:
+        audio (numpy.ndarray): Sampel audio mono float32.
+        threshold_db (float, optional): Ambang energi (dBFS). Defaults to ambang adaptif dari
+            noise floor dan level bicara file ini.
+        min_speech_seconds (float): Ledakan suara yang lebih pendek dari ini (klik, ketukan) diabaikan.
+        merge_gap_seconds (float): Jeda yang lebih pendek dari ini tidak memisahkan wilayah.
+        padding_seconds (float): Perluasan setiap wilayah ke kiri dan kanan agar awal/akhir kata
+            yang pelan tidak terpotong.
+        frame_seconds (float): Resolusi analisis energi.
+        sample_rate (int): Sample rate audio.
+
+    Returns:
+        list: Daftar tuple (awal, akhir) dalam indeks sampel, terurut dan tidak tumpang tindih.
+    """
+    energy = frame_energy_db(audio, frame_seconds, sample_rate)
+    if len(energy) == 0:
+        return []
+    if threshold_db is None:
+        noise_floor = float(np.percentile(energy, 10))
+        speech_level = float(np.percentile(energy, 95))
+        threshold_db = max(min(noise_floor + NOISE_FLOOR_MARGIN_DB, speech_level - PEAK_MARGIN_DB),
+                           MIN_THRESHOLD_DB)
+
+    # Perataan sekitar 0.2 detik agar jeda antar-suku kata tidak dianggap hening.
+    smooth_frames = max(1, int(0.2 / frame_seconds))
+    kernel = np.ones(smooth_frames, dtype=np.float32) / smooth_frames
+    voiced = np.convolve(energy, kernel, mode="same") > threshold_db
+
+    # Mengubah mask per frame menjadi daftar run (awal, akhir) dalam satuan frame.
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    frame_samples = int(frame_seconds * sample_rate)
+    min_frames = min_speech_seconds / frame_seconds
+    merge_frames = merge_gap_seconds / frame_seconds
+    regions = []
+    for start, end in zip(starts, ends):
+        if regions and start - regions[-1][1] < merge_frames:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+    regions = [(start, end) for start, end in regions if end - start >= min_frames]
+
+    padding = int(padding_seconds * sample_rate)
+    padded = []
+    for start, end in regions:
+        start = max(0, int(start) * frame_samples - padding)
+        end = min(len(audio), int(end) * frame_samples + padding)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], end)
+        else:
+            padded.append((start, end))
+    return padded
+
+
+class TimeMap:
+    """
+    Memetakan waktu pada audio ringkas (hanya wilayah bicara) kembali ke waktu pada audio asli.
+
+    Args:
+        pieces (list): Daftar tuple (awal_ringkas, awal_asli, panjang) dalam detik, terurut.
+        duration (float): Durasi audio asli dalam detik.
+    """
+    def __init__(self, pieces, duration: float):
+        self.pieces = list(pieces)
+        self.duration = duration
+        self._compact_starts = [piece[0] for piece in self.pieces]
+
+    @property
+    def is_identity(self) -> bool:
+        # Satu wilayah dari detik 0 belum tentu identitas: hening di akhir bisa saja sudah dibuang.
+        if len(self.pieces) != 1:
+            return False
+        compact_start, original_start, length = self.pieces[0]
+        return compact_start == original_start == 0.0 and abs(length - self.duration) < 1e-6
+
+    def to_original(self, seconds: float, prefer_end: bool = False) -> float:
+        """
+        Mengubah satu titik waktu. Waktu yang jatuh di jeda sisipan dipetakan ke awal wilayah
+        berikutnya, atau ke akhir wilayah sebelumnya jika 'prefer_end' (untuk waktu akhir segmen).
+        """
+        if not self.pieces:
+            return seconds
+        index = max(0, bisect.bisect_right(self._compact_starts, seconds) - 1)
+        compact_start, original_start, length = self.pieces[index]
+        offset = seconds - compact_start
+        if offset <= length:
+            return original_start + max(0.0, offset)
+        # Di dalam jeda setelah wilayah ini.
+        if prefer_end or index + 1 == len(self.pieces):
+            return original_start + length
+        return self.pieces[index + 1][1]
+
+    def remap_segment(self, segment: dict) -> dict:
+        """Mengembalikan salinan segmen dengan waktu pada audio asli."""
+        start = self.to_original(segment["start"])
+        end = max(self.to_original(segment["end"], prefer_end=True), start)
+        remapped = {**segment, "start": start, "end": end}
+        if segment.get("words"):
+            remapped["words"] = [self.remap_segment(word) for word in segment["words"]]
+        return remapped
+
+
+def compact_audio(audio, regions, gap_seconds: float = GAP_SECONDS, sample_rate: int = SAMPLE_RATE):
+    """
+    Menyusun audio ringkas yang hanya berisi wilayah bicara, dipisahkan jeda hening pendek.
+
+    Args:
+        audio (numpy.ndarray): Audio asli.
+        regions (list): Hasil detect_speech_regions().
+        gap_seconds (float): Panjang jeda hening di antara wilayah.
+        sample_rate (int): Sample rate audio.
+
+    Returns:
+        tuple: (audio_ringkas, TimeMap). Jika hampir tidak ada yang bisa dilewati, audio asli
+               dikembalikan apa adanya dengan TimeMap identitas.
+    """
+    total = len(audio)
+    speech_samples = sum(end - start for start, end in regions)
+    if total == 0 or speech_samples >= total * (1.0 - MIN_SKIP_FRACTION):
+        return audio, TimeMap([(0.0, 0.0, total / sample_rate)], total / sample_rate)
+
+    gap = np.zeros(int(gap_seconds * sample_rate), dtype=np.float32)
+    parts = []
+    pieces = []
+    position = 0
+    for start, end in regions:
+        if parts:
+            parts.append(gap)
+            position += len(gap)
+        parts.append(np.asarray(audio[start:end], dtype=np.float32))
+        pieces.append((position / sample_rate, start / sample_rate, (end - start) / sample_rate))
+        position += end - start
+    compact = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+    return compact, TimeMap(pieces, total / sample_rate)
+
+
+def strip_non_speech(audio, sample_rate: int = SAMPLE_RATE):
+    """
+    Deteksi wilayah bicara lalu susun audio ringkas dalam satu langkah.
+
+    Args:
+        audio (numpy.ndarray): Audio mono float32.
+        sample_rate (int): Sample rate audio.
+
+    Returns:
+        tuple: (audio_ringkas, TimeMap). Segmen hasil transkripsi audio ringkas dikembalikan
+               ke waktu asli dengan TimeMap.remap_segment().
+    """
+    return compact_audio(audio, detect_speech_regions(audio, sample_rate=sample_rate), sample_rate=sample_rate)
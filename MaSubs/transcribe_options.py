@@ -0,0 +1,66 @@
+from dataclasses import dataclass, replace, asdict
+
+# Urutan temperatur yang sama dengan bawaan whisper.transcribe(). Dipakai hanya jika
+# fallback temperatur diaktifkan: jendela yang hasilnya berulang atau kurang yakin
+# didekode ulang dengan temperatur berikutnya, sehingga satu jendela bisa didekode
+# sampai enam kali (penyebab utama transkripsi 2-3x lebih lambat pada audio bising).
+FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+
+@dataclass(frozen=True)
+class TranscribeOptions:
+    """
+    Opsi decoding Whisper yang berlaku untuk satu job transkripsi. Nilai bawaannya adalah
+    jalur cepat: decoding greedy, tanpa fallback temperatur, dan bahasa dideteksi sekali
+    per file (hasilnya di-cache per sumber audio).
+
+    Attributes:
+        language (str | None): Kode bahasa, misal 'id' atau 'en'. None = deteksi otomatis.
+        beam_size (int): Lebar beam search. 1 = greedy (paling cepat).
+        temperature (float): Temperatur sampling untuk percobaan pertama.
+        temperature_fallback (bool): Dekode ulang jendela yang meragukan dengan temperatur
+            lebih tinggi (FALLBACK_TEMPERATURES). Lebih tahan pengulangan, tetapi lebih lambat.
+        condition_on_previous_text (bool): Teks jendela sebelumnya dipakai sebagai konteks di
+            dalam satu panggilan model. Tanpa fallback temperatur, opsi ini bisa memicu
+            pengulangan teks, jadi bawaannya dimatikan.
+        word_timestamps (bool): Simpan timestamp per kata di setiap segmen ('words'), dipakai
+            untuk menyusun ulang baris subtitle tanpa menjalankan model lagi. Sedikit lebih
+            lambat karena butuh langkah alignment tambahan.
+    """
+    language: str = None
+    beam_size: int = 1
+    temperature: float = 0.0
+    temperature_fallback: bool = False
+    condition_on_previous_text: bool = False
+    word_timestamps: bool = False
+
+    def __post_init__(self):
+        if self.beam_size < 1:
+            raise ValueError("beam_size minimal 1.")
+        if self.language == "":
+            # String kosong (misal dari input GUI/CLI) berarti deteksi otomatis.
+            object.__setattr__(self, "language", None)
+
+    @property
+    def temperatures(self) -> tuple:
+        """Temperatur yang dicoba berurutan untuk setiap jendela."""
+        if self.temperature_fallback:
+            return tuple(t for t in FALLBACK_TEMPERATURES if t >= self.temperature) or (self.temperature,)
+        return (self.temperature,)
+
+    def with_language(self, language: str) -> "TranscribeOptions":
+        """Mengembalikan salinan opsi dengan bahasa yang sudah ditentukan."""
+        return replace(self, language=language)
+
+    def cache_options(self) -> dict:
+        """Opsi dalam bentuk dict untuk kunci cache hasil transkripsi."""
+        options = asdict(self)
+        options["language"] = self.language or "auto"
+        return options
+
+
+# Preset untuk GUI/CLI. 'akurat' mendekati perilaku bawaan model.transcribe() ditambah beam search.
+DECODE_PRESETS = {
+    "cepat": TranscribeOptions(),
+    "akurat": TranscribeOptions(beam_size=5, temperature_fallback=True, condition_on_previous_text=True),
+}
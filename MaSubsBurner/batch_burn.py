@@ -0,0 +1,203 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+
+from burner_logic import burn_subtitles
+from encoding_profiles import SOFTWARE_ENCODERS
+from masubs_common.media import probe_media
+
+# Ekstensi video yang dipindai saat memilih folder batch.
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov")
+# Ekstensi subtitle yang dicari dengan nama (stem) yang sama dengan video, berurutan sesuai prioritas.
+# Jika beberapa ada, file yang paling baru diubah yang dipakai (misal .srt yang diedit setelah
+# diekspor); jika sama baru, .ass didahulukan karena gayanya langsung dibaca libass.
+SUBTITLE_EXTENSIONS = (".ass", ".srt")
+# Akhiran nama file hasil; file dengan akhiran ini tidak dianggap sebagai sumber.
+OUTPUT_SUFFIX = "_hardsub"
+# Encoder hardware (NVENC/QSV/AMF) punya batas sesi encode bersamaan di GPU,
+# jadi jumlah job paralelnya dibatasi.
+MAX_HARDWARE_JOBS = 2
+
+
+def default_output_path(video_path: str) -> str:
+    """Mengembalikan path output bawaan, misal 'episode01_hardsub.mp4' di folder yang sama."""
+    stem, ext = os.path.splitext(video_path)
+    return f"{stem}{OUTPUT_SUFFIX}{ext}"
+
+
+def find_subtitle_for(video_path: str):
+    """
+    Mencari file subtitle dengan nama (stem) yang sama dengan video.
+
+    Args:
+        video_path (str): Path video.
+
+    Returns:
+        str | None: Path subtitle, atau None jika tidak ada.
+    """
+    stem = os.path.splitext(video_path)[0]
+    candidates = [stem + ext for ext in SUBTITLE_EXTENSIONS if os.path.exists(stem + ext)]
+    if not candidates:
+        return None
+    # max() mengembalikan kandidat pertama (urutan prioritas) jika waktu ubahnya sama.
+    return max(candidates, key=os.path.getmtime)
+
+
+def pair_videos_with_subtitles(folder: str):
+    """
+    Memasangkan setiap video di folder dengan file subtitle yang nama (stem)-nya sama,
+    misal 'episode01.mp4' dengan 'episode01.srt'.
+
+    Args:
+        folder (str): Folder yang dipindai (tidak rekursif).
+
+    Returns:
+        tuple: (daftar_pasangan, daftar_video_tanpa_subtitle) dengan pasangan berupa
+               tuple (path_video, path_subtitle).
+    """
+    names = sorted(os.listdir(folder))
+    lower_names = {name.lower(): name for name in names}
+    pairs = []
+    unpaired = []
+    for name in names:
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in VIDEO_EXTENSIONS or stem.endswith(OUTPUT_SUFFIX):
+            continue
+        subtitle_paths = [os.path.join(folder, lower_names[(stem + sub_ext).lower()])
+                          for sub_ext in SUBTITLE_EXTENSIONS if (stem + sub_ext).lower() in lower_names]
+        video_path = os.path.join(folder, name)
+        if subtitle_paths:
+            pairs.append((video_path, max(subtitle_paths, key=os.path.getmtime)))
+        else:
+            unpaired.append(video_path)
+    return pairs, unpaired
+
+
+def plan_concurrency(job_count: int, threads_per_job: int = 0, vcodec: str = "libx264"):
+    """
+    Menentukan jumlah encode paralel dan jumlah thread per encode agar total thread
+    tidak melebihi jumlah core (oversubscription membuat semua job melambat).
+
+    Args:
+        job_count (int): Jumlah video dalam batch.
+        threads_per_job (int): Thread per encode yang diminta; 0 berarti ditentukan otomatis.
+        vcodec (str): Encoder video yang dipakai.
+
+    Returns:
+        tuple: (jumlah_job_paralel, thread_per_job).
+    """
+    cores = os.cpu_count() or 1
+    if threads_per_job:
+        jobs = max(1, cores // threads_per_job)
+    else:
+        # x264 masih efisien sampai sekitar 4 thread per encode; sisanya lebih baik
+        # dipakai untuk menjalankan encode lain secara paralel.
+        jobs = max(1, cores // 4)
+    jobs = min(jobs, max(1, job_count))
+    if vcodec not in SOFTWARE_ENCODERS:
+        jobs = min(jobs, MAX_HARDWARE_JOBS)
+    threads = threads_per_job or max(1, cores // jobs)
+    return jobs, threads
+
+
+class BatchBurner:
+    """
+    Menjalankan banyak proses burn-in sekaligus. Setiap job adalah satu proses ffmpeg,
+    jadi thread Python cukup untuk mengawasinya. Kegagalan satu video tidak menghentikan
+    video lainnya.
+
+    Event dilaporkan melalui callback 'on_event(kind, video_path, data)' dengan 'kind':
+        - "progress": data = dict progres ffmpeg (percent, fps, speed, eta)
+        - "done":     data = path file output
+        - "failed":   data = pesan error
+        - "stats":    data = dict berisi ringkasan throughput keseluruhan
+    """
+    def __init__(self, pairs, profile, max_jobs=None, on_event=None):
+        self.pairs = list(pairs)
+        jobs, threads = plan_concurrency(len(self.pairs), profile.threads, profile.vcodec)
+        self.max_jobs = max_jobs or jobs
+        self.profile = replace(profile, threads=threads)
+        self.on_event = on_event
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._live = {}
+
+    def cancel(self):
+        """Menghentikan semua encode yang sedang berjalan dan melewati sisanya."""
+        self.cancel_event.set()
+
+    def _emit(self, kind, video_path, data):
+        if self.on_event:
+            self.on_event(kind, video_path, data)
+
+    def _run_job(self, video_path, subtitle_path):
+        if self.cancel_event.is_set():
+            return False, "Proses dibatalkan oleh pengguna."
+
+        def on_progress(info):
+            with self._lock:
+                self._live[video_path] = info
+            self._emit("progress", video_path, info)
+
+        try:
+            return burn_subtitles(video_path, subtitle_path, default_output_path(video_path),
+                                  self.profile, on_progress, self.cancel_event)
+        finally:
+            with self._lock:
+                self._live.pop(video_path, None)
+
+    def run(self) -> list:
+        """
+        Menjalankan seluruh batch sampai selesai.
+
+        Returns:
+            list: Daftar dict per video berisi 'video_path', 'subtitle_path', 'output_path',
+                  'success', dan 'message'.
+        """
+        start_time = time.perf_counter()
+        media_seconds = 0.0
+        completed = 0
+        failed = 0
+        results = []
+
+        with ThreadPoolExecutor(max_workers=self.max_jobs) as pool:
+            futures = {pool.submit(self._run_job, video, subtitle): (video, subtitle)
+                       for video, subtitle in self.pairs}
+            for future in as_completed(futures):
+                video_path, subtitle_path = futures[future]
+                try:
+                    success, message = future.result()
+                except Exception as e:
+                    success, message = False, str(e)
+                results.append({"video_path": video_path, "subtitle_path": subtitle_path,
+                                "output_path": default_output_path(video_path),
+                                "success": success, "message": message})
+                if success:
+                    completed += 1
+                    try:
+                        media_seconds += probe_media(video_path)["duration"] or 0.0
+                    except RuntimeError:
+                        pass
+                    self._emit("done", video_path, default_output_path(video_path))
+                else:
+                    failed += 1
+                    self._emit("failed", video_path, message)
+
+                wall_time = time.perf_counter() - start_time
+                with self._lock:
+                    live_fps = sum(info["fps"] or 0.0 for info in self._live.values())
+                self._emit("stats", None, {
+                    "completed": completed,
+                    "failed": failed,
+                    "total": len(self.pairs),
+                    "elapsed": wall_time,
+                    "media_seconds": media_seconds,
+                    # Detik video yang selesai per detik waktu nyata, untuk seluruh batch.
+                    "throughput": media_seconds / wall_time if wall_time > 0 else 0.0,
+                    "live_fps": live_fps,
+                })
+
+        order = {video: index for index, (video, _) in enumerate(self.pairs)}
+        return sorted(results, key=lambda result: order[result["video_path"]])
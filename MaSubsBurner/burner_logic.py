@@ -1,6 +1,18 @@
 import ffmpeg
 import os
 import sys
+import subprocess
+import threading
+
+# Paket bersama 'masubs_common' berada di root repositori (satu tingkat di atas folder ini).
+# Saat dijalankan dari kode sumber, root tersebut perlu ditambahkan ke sys.path.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from masubs_common.media import find_executable, probe_media
+from masubs_common.instrumentation import span, traced
+from encoding_profiles import EncodingProfile, get_preset, video_output_args, audio_output_args, DEFAULT_PRESET
 
 def get_ffmpeg_path():
     """
@@ -11,19 +23,129 @@ def get_ffmpeg_path():
     Returns:
         str: Path absolut ke 'ffmpeg.exe' jika dibundel, atau string 'ffmpeg' jika tidak.
     """
-    # 'getattr(sys, 'frozen', False)' adalah cara standar untuk memeriksa apakah skrip
-    # sedang berjalan sebagai paket PyInstaller yang "dibekukan".
-    if getattr(sys, 'frozen', False):
-        # Jika ya, 'sys._MEIPASS' berisi path ke direktori sementara
-        # tempat semua file (termasuk ffmpeg.exe yang kita bundel) diekstrak.
-        application_path = sys._MEIPASS
-        return os.path.join(application_path, 'ffmpeg.exe')
-    else:
-        # Jika tidak (berjalan sebagai skrip .py biasa), kita asumsikan 'ffmpeg'
-        # sudah ada di sistem PATH untuk kemudahan pengembangan.
-        return 'ffmpeg'
+    # Logikanya dipakai bersama dengan MaSubs: saat berjalan sebagai paket PyInstaller,
+    # 'ffmpeg.exe' yang dibundel di 'sys._MEIPASS' dipakai; jika tidak (berjalan sebagai
+    # skrip .py biasa), kita asumsikan 'ffmpeg' sudah ada di sistem PATH.
+    return find_executable('ffmpeg')
+
+def format_eta(seconds) -> str:
+    """Mengubah detik menjadi teks durasi singkat (M:SS atau H:MM:SS)."""
+    if seconds is None:
+        return "-"
+    seconds = max(0, int(round(seconds)))
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+def parse_progress_block(fields: dict, duration) -> dict:
+    """
+    Mengubah satu blok output '-progress' ffmpeg (pasangan key=value) menjadi info progres.
+
+    Args:
+        fields (dict): Pasangan key=value dari satu blok progres.
+        duration (float | None): Durasi total media dalam detik.
+
+    Returns:
+        dict: Info dengan kunci 'out_time' (detik), 'percent' (0-100), 'fps', 'speed'
+              (kelipatan real-time) dan 'eta' (detik, atau None).
+    """
+    def to_float(value):
+        try:
+            return float(value.rstrip("x"))
+        except (AttributeError, ValueError):
+            return None
+
+    # 'out_time_us' adalah posisi output dalam mikrodetik. ('out_time_ms' pada ffmpeg
+    # lama juga bernilai mikrodetik walaupun namanya 'ms'.)
+    out_time_us = to_float(fields.get("out_time_us")) or to_float(fields.get("out_time_ms")) or 0.0
+    out_time = max(0.0, out_time_us / 1_000_000)
+    speed = to_float(fields.get("speed"))
+    percent = 0
+    eta = None
+    if duration:
+        percent = min(100, int(out_time / duration * 100))
+        if speed:
+            eta = max(0.0, duration - out_time) / speed
+    if fields.get("progress") == "end":
+        percent = 100
+        eta = 0.0
+    return {"out_time": out_time, "percent": percent, "fps": to_float(fields.get("fps")),
+            "speed": speed, "eta": eta}
+
+def format_progress_message(info: dict) -> str:
+    """Membentuk pesan status bar dari info progres."""
+    fps = f"{info['fps']:.0f}" if info["fps"] is not None else "-"
+    speed = f"{info['speed']:.2f}x" if info["speed"] is not None else "-"
+    return f"Encoding {info['percent']}% — {fps} fps — {speed} — ETA {format_eta(info['eta'])}"
+
+def run_ffmpeg(args, duration=None, progress_callback=None, cancel_event=None):
+    """
+    Menjalankan ffmpeg sebagai subprocess dengan output '-progress' yang dibaca secara langsung.
+
+    Args:
+        args (list): Argumen lengkap (termasuk executable), misal dari ffmpeg.compile().
+        duration (float, optional): Durasi total media untuk menghitung persentase dan ETA.
+        progress_callback (callable, optional): Dipanggil dengan dict dari parse_progress_block().
+        cancel_event (threading.Event, optional): Jika di-set, ffmpeg dihentikan dengan bersih.
+
+    Returns:
+        tuple: (return_code, stderr_text, dibatalkan).
+    """
+    # '-progress pipe:1' menulis blok key=value ke stdout sekitar dua kali per detik,
+    # '-nostats' mematikan baris statistik biasa di stderr.
+    command = [args[0], "-progress", "pipe:1", "-nostats"] + list(args[1:])
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace")
+
+    # stderr dibaca di thread terpisah agar buffer pipe tidak penuh dan membuat ffmpeg macet.
+    stderr_lines = []
+    stderr_thread = threading.Thread(target=lambda: stderr_lines.extend(process.stderr), daemon=True)
+    stderr_thread.start()
 
-def burn_subtitles(video_path: str, subtitle_path: str, output_path: str):
+    cancelled = threading.Event()
+
+    def watch_cancel():
+        while process.poll() is None:
+            if cancel_event.wait(0.2):
+                cancelled.set()
+                # Minta ffmpeg berhenti dengan bersih ('q' di stdin), lalu paksa jika tidak merespons.
+                try:
+                    process.stdin.write("q\n")
+                    process.stdin.flush()
+                except OSError:
+                    pass
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.terminate()
+                    try:
+                        process.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+                return
+
+    if cancel_event is not None:
+        threading.Thread(target=watch_cancel, daemon=True).start()
+
+    fields = {}
+    for line in process.stdout:
+        key, _, value = line.strip().partition("=")
+        if not key:
+            continue
+        fields[key] = value
+        # Setiap blok progres diakhiri oleh baris 'progress=continue' atau 'progress=end'.
+        if key == "progress":
+            if progress_callback:
+                progress_callback(parse_progress_block(fields, duration))
+            fields = {}
+
+    return_code = process.wait()
+    stderr_thread.join(timeout=5)
+    return return_code, "".join(stderr_lines), cancelled.is_set()
+
+@traced("burn", "video_path", "subtitle_path", "output_path")
+def burn_subtitles(video_path: str, subtitle_path: str, output_path: str, profile: EncodingProfile = None,
+                   progress_callback=None, cancel_event=None):
     """
     Fungsi utama untuk 'membakar' (hardcode) file subtitle ke dalam file video.
     Menggunakan pustaka ffmpeg-python untuk membangun dan menjalankan perintah FFmpeg.
@@ -32,11 +154,18 @@ def burn_subtitles(video_path: str, subtitle_path: str, output_path: str):
         video_path (str): Path ke file video sumber.
         subtitle_path (str): Path ke file subtitle (.srt).
         output_path (str): Path untuk menyimpan file video hasil.
+        profile (EncodingProfile, optional): Pengaturan encoding (encoder, kecepatan, kualitas,
+            thread, mode audio). Defaults to preset DEFAULT_PRESET.
+        progress_callback (callable, optional): Menerima dict progres (persen, fps, speed, ETA)
+            sekitar dua kali per detik selama encoding.
+        cancel_event (threading.Event, optional): Jika di-set, proses dihentikan dan file
+            output yang belum selesai dihapus.
 
     Returns:
         tuple: Sebuah tuple (bool, str) yang berisi status keberhasilan dan pesan.
                Contoh: (True, "Proses berhasil...") atau (False, "Error: ...").
     """
+    profile = profile or get_preset(DEFAULT_PRESET)
     try:
         # Filter 'subtitles' pada FFmpeg lebih andal dengan forward slashes, 
         # terutama saat berjalan di lingkungan Windows.
@@ -45,13 +174,21 @@ def burn_subtitles(video_path: str, subtitle_path: str, output_path: str):
         # Mendapatkan path ffmpeg.exe yang akan digunakan (bisa dari bundel atau PATH sistem).
         ffmpeg_executable = get_ffmpeg_path()
 
+        # Metadata video diambil dari cache media bersama. Jika MaSubs sudah pernah
+        # memproses file ini, ffprobe tidak perlu dijalankan lagi.
+        with span("probe"):
+            media_info = probe_media(video_path)
+        if media_info["video"] is None:
+            return False, "File yang dipilih tidak memiliki stream video."
+
         # Membangun grafik pemrosesan FFmpeg.
         # 1. Tentukan input stream dari file video.
         input_stream = ffmpeg.input(video_path)
         
         # 2. Pisahkan stream video dan audio untuk diproses secara terpisah.
+        #    Video tanpa audio tetap bisa diproses; stream audio hanya dipetakan jika ada.
         video_stream = input_stream['v']
-        audio_stream = input_stream['a']
+        audio_streams = [input_stream['a']] if media_info["audio"] else []
 
         # 3. Terapkan filter 'subtitles' HANYA pada stream video.
         video_with_subs = ffmpeg.filter(
@@ -60,23 +197,35 @@ def burn_subtitles(video_path: str, subtitle_path: str, output_path: str):
 
         # 4. Tentukan output, gabungkan kembali stream video (yang sudah ada subtitle)
         #    dan stream audio asli ke dalam satu file output.
+        #    Pengaturan encoding diambil dari profil: encoder & kualitas video, jumlah thread,
+        #    serta apakah audio disalin apa adanya (tanpa encode ulang) atau di-encode ke AAC.
+        source_audio_codec = media_info["audio"]["codec"] if media_info["audio"] else None
         stream = ffmpeg.output(
             video_with_subs, 
-            audio_stream, 
+            *audio_streams, 
             output_path,
-            # Pengaturan encoding:
-            vcodec='libx264',    # Codec video H.264 yang sangat umum dan kompatibel.
-            crf=23,              # Constant Rate Factor, kualitas visual yang baik (default).
-            preset='veryfast',   # Keseimbangan yang baik antara kecepatan encoding dan ukuran file.
-            acodec='aac',        # Codec audio AAC, standar untuk kontainer MP4.
-            audio_bitrate='192k' # Bitrate audio yang umum untuk kualitas stereo yang baik.
+            **video_output_args(profile),
+            **audio_output_args(profile, source_audio_codec, output_path)
         )
         
         # 5. Jalankan perintah FFmpeg yang telah dibangun.
         #    'cmd' secara eksplisit menunjuk ke executable ffmpeg yang benar.
-        #    'quiet=True' mencegah FFmpeg mencetak log progresnya ke konsol.
         #    'overwrite_output=True' otomatis menimpa file output jika sudah ada.
-        ffmpeg.run(stream, cmd=ffmpeg_executable, quiet=True, overwrite_output=True)
+        #    Progres dibaca langsung dari ffmpeg dan diteruskan ke 'progress_callback'.
+        args = ffmpeg.compile(stream, cmd=ffmpeg_executable, overwrite_output=True)
+        with span("encode", vcodec=profile.vcodec, preset=profile.name,
+                  media_seconds=media_info["duration"]) as stage:
+            return_code, stderr_text, cancelled = run_ffmpeg(args, media_info["duration"],
+                                                             progress_callback, cancel_event)
+            stage.set(return_code=return_code, cancelled=cancelled)
+
+        if cancelled:
+            # Hapus file output setengah jadi agar tidak disangka hasil yang valid.
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            return False, "Proses dibatalkan oleh pengguna."
+        if return_code != 0:
+            raise ffmpeg.Error('ffmpeg', None, stderr_text.encode("utf-8"))
         
         # Jika proses berhasil tanpa error, kembalikan status sukses.
         return True, f"Proses berhasil. File disimpan di {output_path}"
@@ -0,0 +1,211 @@
+import os
+import subprocess
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
+# Urutan tingkat kecepatan ala x264, dari paling cepat ke paling lambat.
+# Dipakai untuk menerjemahkan preset ke parameter encoder hardware.
+SPEED_LEVELS = ["ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow"]
+
+# Encoder video yang dikenali, berurutan dari yang paling disukai. Encoder software
+# selalu dicoba terakhir karena tersedia di semua build ffmpeg.
+KNOWN_VIDEO_ENCODERS = [
+    "h264_nvenc", "hevc_nvenc",   # NVIDIA
+    "h264_qsv", "hevc_qsv",       # Intel Quick Sync
+    "h264_amf", "hevc_amf",       # AMD
+    "libx264", "libx265",         # Software (CPU)
+]
+SOFTWARE_ENCODERS = {"libx264", "libx265"}
+
+# Codec audio yang boleh disalin apa adanya ke setiap jenis container output.
+_COPYABLE_AUDIO = {
+    ".mp4": {"aac", "mp3", "ac3", "eac3", "alac", "opus", "flac"},
+    ".mov": {"aac", "mp3", "ac3", "eac3", "alac", "pcm_s16le", "pcm_s24le"},
+    ".mkv": None,  # None = semua codec audio diterima.
+}
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """
+    Pengaturan encoding untuk proses burn-in.
+
+    Attributes:
+        name (str): Nama profil yang ditampilkan di GUI.
+        vcodec (str): Encoder video ffmpeg (misal 'libx264' atau 'h264_nvenc').
+        speed (str): Tingkat kecepatan ala x264 (lihat SPEED_LEVELS).
+        crf (int): Target kualitas (semakin kecil semakin bagus). Diterjemahkan ke parameter
+            kualitas yang setara untuk encoder hardware.
+        threads (int): Jumlah thread encoder; 0 berarti ditentukan otomatis oleh ffmpeg.
+        audio_mode (str): 'encode' (selalu encode ulang), 'copy' (salin stream bila memungkinkan).
+        acodec (str): Codec audio saat encode ulang.
+        audio_bitrate (str): Bitrate audio saat encode ulang.
+    """
+    name: str
+    vcodec: str = "libx264"
+    speed: str = "veryfast"
+    crf: int = 23
+    threads: int = 0
+    audio_mode: str = "encode"
+    acodec: str = "aac"
+    audio_bitrate: str = "192k"
+
+
+# Preset bawaan yang ditampilkan di GUI. "Cepat" sama persis dengan pengaturan lama
+# (libx264, crf 23, preset veryfast, audio AAC 192k).
+PRESETS = {
+    "Tercepat": EncodingProfile("Tercepat", speed="ultrafast", crf=26, audio_mode="copy"),
+    "Cepat": EncodingProfile("Cepat"),
+    "Seimbang": EncodingProfile("Seimbang", speed="medium", crf=21, audio_mode="copy"),
+    "Kualitas Tinggi": EncodingProfile("Kualitas Tinggi", speed="slow", crf=18),
+}
+DEFAULT_PRESET = "Cepat"
+
+
+def get_preset(name: str, **overrides) -> EncodingProfile:
+    """
+    Mengambil preset berdasarkan nama, opsional dengan beberapa nilai yang diganti.
+
+    Args:
+        name (str): Nama preset di PRESETS.
+        **overrides: Field EncodingProfile yang ingin diganti (misal vcodec='h264_nvenc').
+
+    Returns:
+        EncodingProfile: Profil yang siap dipakai.
+    """
+    if name not in PRESETS:
+        raise ValueError(f"Preset '{name}' tidak dikenal.")
+    return replace(PRESETS[name], **overrides)
+
+
+@lru_cache(maxsize=None)
+def list_available_encoders(ffmpeg_executable: str) -> frozenset:
+    """
+    Membaca daftar encoder dari output 'ffmpeg -encoders'.
+
+    Args:
+        ffmpeg_executable (str): Path ke executable ffmpeg.
+
+    Returns:
+        frozenset: Nama-nama encoder yang dikompilasi ke dalam ffmpeg tersebut.
+    """
+    try:
+        output = subprocess.run([ffmpeg_executable, "-hide_banner", "-encoders"],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+    encoders = set()
+    header_done = False
+    for line in output.splitlines():
+        # Daftar encoder dimulai setelah baris pemisah " ------".
+        if line.strip().startswith("------"):
+            header_done = True
+            continue
+        parts = line.split()
+        if header_done and len(parts) >= 2:
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+@lru_cache(maxsize=None)
+def encoder_works(ffmpeg_executable: str, encoder: str) -> bool:
+    """
+    Mencoba encode beberapa frame kecil untuk memastikan encoder benar-benar bisa dipakai.
+    Encoder hardware bisa terdaftar di ffmpeg walaupun GPU/driver-nya tidak ada.
+
+    Args:
+        ffmpeg_executable (str): Path ke executable ffmpeg.
+        encoder (str): Nama encoder video.
+
+    Returns:
+        bool: True jika encode percobaan berhasil.
+    """
+    command = [
+        ffmpeg_executable, "-hide_banner", "-v", "error", "-f", "lavfi",
+        "-i", "color=c=black:s=256x256:d=0.2", "-frames:v", "3", "-c:v", encoder, "-f", "null", "-",
+    ]
+    try:
+        subprocess.run(command, capture_output=True, check=True, timeout=15)
+        return True
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        return False
+
+
+def detect_video_encoders(ffmpeg_executable: str) -> list:
+    """
+    Mendeteksi encoder video yang dikenali dan benar-benar berfungsi pada mesin ini.
+
+    Args:
+        ffmpeg_executable (str): Path ke executable ffmpeg.
+
+    Returns:
+        list: Nama encoder, berurutan sesuai KNOWN_VIDEO_ENCODERS. Encoder hardware
+              hanya dimasukkan jika encode percobaan berhasil.
+    """
+    available = list_available_encoders(ffmpeg_executable)
+    detected = []
+    for encoder in KNOWN_VIDEO_ENCODERS:
+        if encoder not in available:
+            continue
+        if encoder in SOFTWARE_ENCODERS or encoder_works(ffmpeg_executable, encoder):
+            detected.append(encoder)
+    # Jika daftar encoder tidak bisa dibaca, tetap tawarkan libx264 seperti perilaku lama.
+    return detected or ["libx264"]
+
+
+def _speed_index(speed: str) -> int:
+    return SPEED_LEVELS.index(speed) if speed in SPEED_LEVELS else SPEED_LEVELS.index("veryfast")
+
+
+def video_output_args(profile: EncodingProfile) -> dict:
+    """
+    Menerjemahkan profil menjadi argumen output video untuk ffmpeg-python.
+
+    Args:
+        profile (EncodingProfile): Profil encoding.
+
+    Returns:
+        dict: Argumen keyword untuk ffmpeg.output().
+    """
+    codec = profile.vcodec
+    speed_index = _speed_index(profile.speed)
+    args = {"vcodec": codec}
+
+    if codec.endswith("_nvenc"):
+        # NVENC memakai preset p1 (tercepat) s.d. p7 (terbaik) dan kualitas konstan lewat 'cq'.
+        args.update(preset=f"p{1 + round(speed_index * 6 / (len(SPEED_LEVELS) - 1))}", rc="vbr", cq=profile.crf)
+    elif codec.endswith("_qsv"):
+        # Quick Sync menerima nama preset ala x264 mulai dari 'veryfast'.
+        args.update(preset=SPEED_LEVELS[max(speed_index, SPEED_LEVELS.index("veryfast"))],
+                    global_quality=profile.crf)
+    elif codec.endswith("_amf"):
+        quality = "speed" if speed_index <= 3 else ("balanced" if speed_index <= 5 else "quality")
+        args.update(quality=quality, rc="cqp", qp_i=profile.crf, qp_p=profile.crf)
+    else:
+        args.update(preset=profile.speed, crf=profile.crf)
+
+    if profile.threads:
+        args["threads"] = profile.threads
+    return args
+
+
+def audio_output_args(profile: EncodingProfile, source_audio_codec, output_path: str) -> dict:
+    """
+    Menentukan argumen output audio. Pada mode 'copy', stream audio disalin apa adanya jika
+    codec-nya didukung oleh container output; jika tidak, audio di-encode ulang.
+
+    Args:
+        profile (EncodingProfile): Profil encoding.
+        source_audio_codec (str | None): Codec audio sumber (dari probe_media), None jika tidak ada audio.
+        output_path (str): Path file output, dipakai untuk menentukan container.
+
+    Returns:
+        dict: Argumen keyword untuk ffmpeg.output(), kosong jika tidak ada audio.
+    """
+    if source_audio_codec is None:
+        return {}
+    if profile.audio_mode == "copy":
+        allowed = _COPYABLE_AUDIO.get(os.path.splitext(output_path)[1].lower(), set())
+        if allowed is None or source_audio_codec in allowed:
+            return {"acodec": "copy"}
+    return {"acodec": profile.acodec, "audio_bitrate": profile.audio_bitrate}
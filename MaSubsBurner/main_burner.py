@@ -1,20 +1,41 @@
 import sys
 import os
+import time
+import threading
+
+# Paket bersama 'masubs_common' berada di root repositori. Sebelumnya path ini ditambahkan
+# oleh burner_logic, tetapi burner_logic kini baru diimpor setelah jendela tampil.
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+# Diimpor paling awal: titik nol pengukuran waktu startup ada di modul ini.
+from masubs_common.startup import report_startup_event, startup_benchmark_enabled
 
 # --- Impor Pustaka ---
 # Impor komponen-komponen yang dibutuhkan dari PyQt6 untuk membangun GUI.
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, 
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QProgressBar, QStatusBar,
-    QFileDialog, QMessageBox
+    QFileDialog, QMessageBox, QComboBox, QSpinBox, QCheckBox, QListWidget
 )
 # Impor untuk ikon aplikasi.
 from PyQt6.QtGui import QIcon
 # Impor komponen inti PyQt6 untuk threading dan sinyal.
-from PyQt6.QtCore import QThread, QObject, pyqtSignal
+from PyQt6.QtCore import QThread, QObject, QTimer, pyqtSignal
 
-# Impor fungsi logika inti dari file lokal.
-from burner_logic import burn_subtitles
+# Impor modul ringan dari file lokal. burner_logic, batch_burn, dan segment_burn menarik
+# ffmpeg-python sehingga diimpor di thread latar belakang setelah jendela tampil
+# (lihat STARTUP_MODULES) dan di dalam worker yang memakainya.
+from encoding_profiles import PRESETS, DEFAULT_PRESET, get_preset, detect_video_encoders
+from masubs_common.media import find_executable
+from masubs_common.diagnostics_panel import DiagnosticsDialog
+from masubs_common.startup_panel import StartupWorker, ReadinessIndicator
+from masubs_common.job_client import JobClient, JobServerError, job_params, server_url, SERVER_URL_ENV
+from masubs_common.job_store import FINAL_STATUSES
+
+# Modul yang diimpor di latar belakang setelah jendela tampil, agar job pertama tidak menunggu impor.
+STARTUP_MODULES = ("burner_logic", "segment_burn", "batch_burn")
 
 
 # --- Kelas Worker untuk Threading ---
@@ -29,23 +50,44 @@ class Worker(QObject):
     finished = pyqtSignal(tuple)
     # 'error' akan mengirimkan pesan jika terjadi kegagalan tak terduga.
     error = pyqtSignal(str)
-    # 'progress' bisa digunakan di masa depan untuk mengirim update status (saat ini tidak dipakai).
-    progress = pyqtSignal(str)
+    # 'progress' mengirim update (persentase, pesan) yang dibaca langsung dari output ffmpeg.
+    progress = pyqtSignal(int, str)
 
-    def __init__(self, video_path, subtitle_path, output_path):
+    def __init__(self, video_path, subtitle_path, output_path, profile=None, parallel=False):
         super().__init__()
         # Menyimpan semua path yang dibutuhkan untuk proses burning.
         self.video_path = video_path
         self.subtitle_path = subtitle_path
         self.output_path = output_path
+        # Profil encoding yang dipilih pengguna di GUI.
+        self.profile = profile
+        # Mode paralel: video dipotong di keyframe dan setiap potongan di-encode bersamaan.
+        self.parallel = parallel
+        # Event pembatalan. Di-set dari thread GUI lewat cancel(); aman lintas thread.
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Meminta proses ffmpeg yang sedang berjalan untuk berhenti."""
+        self.cancel_event.set()
+
+    def report_progress(self, info):
+        """Callback dari burn_subtitles; meneruskan progres ffmpeg sebagai sinyal."""
+        from burner_logic import format_progress_message
+        self.progress.emit(info["percent"], format_progress_message(info))
 
     def run(self):
         """
         Metode ini dieksekusi di dalam thread terpisah saat thread.start() dipanggil.
         """
         try:
+            # Impor lazy; biasanya sudah dimuat oleh StartupWorker sehingga tidak menambah waktu.
+            from burner_logic import burn_subtitles
+            from segment_burn import burn_subtitles_parallel
             # Memanggil fungsi inti yang memakan waktu lama dari burner_logic.
-            success, message = burn_subtitles(self.video_path, self.subtitle_path, self.output_path)
+            burn = burn_subtitles_parallel if self.parallel else burn_subtitles
+            success, message = burn(self.video_path, self.subtitle_path, self.output_path,
+                                    self.profile, progress_callback=self.report_progress,
+                                    cancel_event=self.cancel_event)
             # Mengirim sinyal 'finished' beserta hasilnya kembali ke thread utama.
             self.finished.emit((success, message))
         except Exception as e:
@@ -53,6 +95,106 @@ class Worker(QObject):
             self.error.emit(str(e))
 
 
+# --- Kelas Worker untuk Batch Hardsub ---
+class BatchWorker(QObject):
+    """
+    Menjalankan BatchBurner (beberapa encode ffmpeg sekaligus) di thread terpisah.
+    Event dari setiap job diteruskan ke GUI melalui sinyal.
+    """
+    # 'file_progress' mengirim (path_video, persentase, pesan).
+    file_progress = pyqtSignal(str, int, str)
+    # 'file_finished' mengirim (path_video, berhasil, pesan).
+    file_finished = pyqtSignal(str, bool, str)
+    # 'stats' mengirim ringkasan throughput keseluruhan.
+    stats = pyqtSignal(dict)
+    # 'finished' mengirim daftar hasil per video.
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    def __init__(self, pairs, profile):
+        super().__init__()
+        from batch_burn import BatchBurner
+        self.batch = BatchBurner(pairs, profile, on_event=self.on_event)
+
+    def cancel(self):
+        self.batch.cancel()
+
+    def on_event(self, kind, video_path, data):
+        """Callback dari BatchBurner; bisa dipanggil dari beberapa thread job sekaligus."""
+        if kind == "progress":
+            from burner_logic import format_progress_message
+            self.file_progress.emit(video_path, data["percent"], format_progress_message(data))
+        elif kind == "done":
+            self.file_finished.emit(video_path, True, data)
+        elif kind == "failed":
+            self.file_finished.emit(video_path, False, data)
+        elif kind == "stats":
+            self.stats.emit(data)
+
+    def run(self):
+        try:
+            self.finished.emit(self.batch.run())
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class ServerBurnWorker(QObject):
+    """
+    Mengirim job burn-in ke server job MaSubs lalu memantau progresnya. Sinyalnya sama
+    dengan BatchWorker, jadi daftar batch dipakai ulang untuk menampilkan status setiap video.
+    """
+    file_progress = pyqtSignal(str, int, str)
+    file_finished = pyqtSignal(str, bool, str)
+    stats = pyqtSignal(dict)
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+
+    # Jeda polling status job di server (detik).
+    POLL_SECONDS = 1.0
+
+    def __init__(self, jobs):
+        super().__init__()
+        # Daftar (path_video_di_daftar, parameter_job).
+        self.jobs = jobs
+        self.client = JobClient()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        # Dipanggil dari thread GUI; permintaan pembatalan dikirim oleh loop polling di run().
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            pending = {self.client.submit("burn", params): video for video, params in self.jobs}
+            results = []
+            cancel_sent = False
+            while pending:
+                if self.cancel_event.is_set() and not cancel_sent:
+                    for job_id in pending:
+                        self.client.cancel(job_id)
+                    cancel_sent = True
+                for job_id, video in list(pending.items()):
+                    job = self.client.job(job_id)
+                    if job["status"] in FINAL_STATUSES:
+                        del pending[job_id]
+                        success = job["status"] == "done"
+                        message = (job["result"] or {}).get("message") if success else job["error"] or job["status"]
+                        results.append({"video_path": video, "success": success, "message": message,
+                                        "output_path": (job["result"] or {}).get("output_path")})
+                        self.file_finished.emit(video, success, message or "")
+                    else:
+                        status = "antre di server" if job["status"] == "queued" else job["message"]
+                        self.file_progress.emit(video, job["progress"], status)
+                if pending:
+                    time.sleep(self.POLL_SECONDS)
+            self.finished.emit(results)
+        except JobServerError as e:
+            self.error.emit(str(e))
+        except Exception as e:
+            # Misal respons server yang tidak lengkap; tanpa ini GUI tertahan di status sibuk.
+            self.error.emit(f"{type(e).__name__}: {e}")
+
+
 # --- Kelas Utama Aplikasi ---
 class MaSubsBurnerApp(QMainWindow):
     """
@@ -65,10 +207,48 @@ class MaSubsBurnerApp(QMainWindow):
         # Properti untuk menyimpan path file yang dipilih oleh pengguna.
         self.video_path = None
         self.subtitle_path = None
+        # Pasangan (video, subtitle) untuk mode batch beserta progres terakhir tiap video.
+        self.batch_pairs = []
+        self.batch_progress = {}
+        self.diagnostics_dialog = None
         
         # Panggil metode untuk menginisialisasi dan mengatur semua elemen UI.
         self.init_ui()
 
+        # Persiapan (impor modul logika, cek ffmpeg, deteksi encoder) baru dimulai setelah
+        # event loop berjalan, sehingga jendela tampil lebih dulu.
+        QTimer.singleShot(0, self.start_startup_checks)
+
+    def start_startup_checks(self):
+        """Menjalankan StartupWorker di thread terpisah; hasilnya ditampilkan di indikator status bar."""
+        self.startup_thread = QThread()
+        # Deteksi encoder menjalankan encode percobaan untuk setiap encoder hardware, yang bisa
+        # memakan beberapa detik; sebelumnya dilakukan di thread GUI sebelum jendela tampil.
+        tasks = {"encoders": lambda: detect_video_encoders(find_executable("ffmpeg"))}
+        self.startup_worker = StartupWorker(STARTUP_MODULES, ("ffmpeg", "ffprobe"), tasks)
+        self.startup_worker.moveToThread(self.startup_thread)
+
+        self.startup_thread.started.connect(self.startup_worker.run)
+        self.startup_worker.finished.connect(self.on_startup_finished)
+        self.startup_thread.finished.connect(self.startup_thread.deleteLater)
+        self.startup_worker.finished.connect(self.startup_thread.quit)
+        self.startup_thread.start()
+
+    def on_startup_finished(self, report):
+        """Slot yang dipanggil saat persiapan latar belakang selesai."""
+        self.lbl_readiness.set_report(report)
+        encoders = report["results"].get("encoders")
+        if encoders:
+            # Pilihan pengguna dipertahankan jika encoder tersebut tersedia.
+            current = self.combo_encoder.currentText()
+            self.combo_encoder.clear()
+            self.combo_encoder.addItems(encoders)
+            self.combo_encoder.setCurrentText(current if current in encoders else encoders[0])
+        report_startup_event("ready", seconds_warm_up=report["seconds"], missing=report["missing"])
+        if startup_benchmark_enabled():
+            # Mode benchmark: waktu sudah dicatat, aplikasi ditutup.
+            QApplication.instance().quit()
+
     def init_ui(self):
         """Menginisialisasi dan mengatur semua komponen antarmuka pengguna (UI)."""
         self.setWindowTitle("MaSubs Burner")
@@ -92,13 +272,49 @@ class MaSubsBurnerApp(QMainWindow):
         self.layout.addWidget(self.lbl_video_path)
 
         # --- Bagian UI: Pemilihan File Subtitle ---
-        self.btn_select_subtitle = QPushButton("2. Pilih File Subtitle (.srt)...")
+        self.btn_select_subtitle = QPushButton("2. Pilih File Subtitle (.srt/.ass)...")
         self.btn_select_subtitle.clicked.connect(self.select_subtitle_file)
         self.layout.addWidget(self.btn_select_subtitle)
 
-        self.lbl_subtitle_path = QLabel("Belum ada file .srt yang dipilih.")
+        self.lbl_subtitle_path = QLabel("Belum ada file subtitle yang dipilih.")
         self.lbl_subtitle_path.setStyleSheet("font-style: italic; color: grey;")
         self.layout.addWidget(self.lbl_subtitle_path)
+
+        # --- Bagian UI: Pengaturan Encoding ---
+        encoding_row = QHBoxLayout()
+        encoding_row.addWidget(QLabel("Preset:"))
+        self.combo_preset = QComboBox()
+        self.combo_preset.addItems(PRESETS.keys())
+        self.combo_preset.setCurrentText(DEFAULT_PRESET)
+        self.combo_preset.currentTextChanged.connect(self.on_preset_changed)
+        encoding_row.addWidget(self.combo_preset)
+
+        encoding_row.addWidget(QLabel("Encoder:"))
+        self.combo_encoder = QComboBox()
+        # Encoder hardware (NVENC/QSV/AMF) hanya ditampilkan jika benar-benar berfungsi.
+        # Encoder hardware dideteksi di latar belakang; sampai selesai hanya libx264 yang ditawarkan.
+        self.combo_encoder.addItems(["libx264"])
+        encoding_row.addWidget(self.combo_encoder)
+
+        encoding_row.addWidget(QLabel("Thread:"))
+        self.spin_threads = QSpinBox()
+        self.spin_threads.setRange(0, max(1, os.cpu_count() or 1))
+        self.spin_threads.setSpecialValueText("Otomatis") # Nilai 0 = ditentukan ffmpeg.
+        encoding_row.addWidget(self.spin_threads)
+        self.layout.addLayout(encoding_row)
+
+        self.chk_copy_audio = QCheckBox("Salin audio tanpa encode ulang (lebih cepat, jika codec didukung)")
+        self.layout.addWidget(self.chk_copy_audio)
+
+        self.chk_parallel = QCheckBox("Mode paralel (video dipotong per keyframe, cocok untuk video panjang)")
+        self.layout.addWidget(self.chk_parallel)
+
+        # Encode dijalankan oleh server job bersama (python masubs.py serve), bukan di komputer ini.
+        # Alamat server diambil dari environment variable MASUBS_SERVER_URL.
+        self.chk_server = QCheckBox(f"Kirim ke server job ({server_url()})")
+        self.chk_server.setChecked(bool(os.environ.get(SERVER_URL_ENV)))
+        self.layout.addWidget(self.chk_server)
+        self.on_preset_changed(DEFAULT_PRESET)
         
         # --- Bagian UI: Indikator Progres ---
         self.progress_bar = QProgressBar()
@@ -111,9 +327,40 @@ class MaSubsBurnerApp(QMainWindow):
         self.btn_start_burn.clicked.connect(self.start_burn_process)
         self.layout.addWidget(self.btn_start_burn)
 
+        # Tombol batal hanya terlihat selama proses burning berjalan.
+        self.btn_cancel = QPushButton("Batalkan")
+        self.btn_cancel.clicked.connect(self.cancel_burn_process)
+        self.btn_cancel.setVisible(False)
+        self.layout.addWidget(self.btn_cancel)
+
+        # --- Bagian UI: Mode Batch ---
+        self.btn_batch = QPushButton("Mode Batch: Pilih Folder Episode...")
+        self.btn_batch.clicked.connect(self.start_batch_process)
+        self.layout.addWidget(self.btn_batch)
+
+        # Daftar status per video untuk mode batch.
+        self.list_batch = QListWidget()
+        self.list_batch.setVisible(False)
+        self.layout.addWidget(self.list_batch)
+
         # --- Status Bar di bagian bawah jendela ---
         self.setStatusBar(QStatusBar(self))
         self.statusBar().showMessage("Siap")
+        # Tombol panel diagnostik: waktu setiap tahap dari job terakhir.
+        self.btn_diagnostics = QPushButton("Diagnostik...")
+        self.btn_diagnostics.setFlat(True)
+        self.btn_diagnostics.clicked.connect(self.show_diagnostics)
+        self.statusBar().addPermanentWidget(self.btn_diagnostics)
+        # Indikator kesiapan: modul logika, ffmpeg, dan encoder diperiksa di latar belakang.
+        self.lbl_readiness = ReadinessIndicator()
+        self.statusBar().addPermanentWidget(self.lbl_readiness)
+
+    def show_diagnostics(self):
+        """Membuka panel diagnostik performa (tidak modal, bisa dibiarkan terbuka selama proses)."""
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
 
     def select_video_file(self):
         """Membuka dialog file untuk memilih file video."""
@@ -125,8 +372,9 @@ class MaSubsBurnerApp(QMainWindow):
             self.lbl_video_path.setStyleSheet("font-style: normal; color: black;")
 
     def select_subtitle_file(self):
-        """Membuka dialog file untuk memilih file subtitle (.srt)."""
-        file_name, _ = QFileDialog.getOpenFileName(self, "Pilih File Subtitle", "", "SRT Files (*.srt)")
+        """Membuka dialog file untuk memilih file subtitle (.srt/.ass/.vtt)."""
+        file_name, _ = QFileDialog.getOpenFileName(self, "Pilih File Subtitle", "",
+                                                   "Subtitle Files (*.srt *.ass *.vtt);;SRT Files (*.srt);;ASS Files (*.ass)")
         if file_name:
             self.subtitle_path = file_name
             self.lbl_subtitle_path.setText(f"Subtitle: {os.path.basename(file_name)}")
@@ -152,22 +400,31 @@ class MaSubsBurnerApp(QMainWindow):
             self.statusBar().showMessage("Proses dibatalkan oleh pengguna.")
             return
 
+        if self.chk_server.isChecked():
+            self.start_server_jobs([(self.video_path, self.subtitle_path)], output_path)
+            return
+
         # 3. Persiapan UI dan Threading
         self.set_ui_enabled(False) # Nonaktifkan tombol untuk mencegah klik berulang.
         self.progress_bar.setVisible(True)
-        # 'setRange(0, 0)' mengubah progress bar ke mode "indeterminate" (sibuk).
-        self.progress_bar.setRange(0, 0) 
+        # Progres nyata (0-100) dibaca dari output '-progress' ffmpeg.
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.btn_cancel.setVisible(True)
+        self.btn_cancel.setEnabled(True)
         self.statusBar().showMessage("Memulai proses encoding video...")
 
         # 4. Inisialisasi dan jalankan thread untuk tugas burning.
         self.thread = QThread()
-        self.worker = Worker(self.video_path, self.subtitle_path, output_path)
+        self.worker = Worker(self.video_path, self.subtitle_path, output_path, self.current_profile(),
+                             parallel=self.chk_parallel.isChecked())
         self.worker.moveToThread(self.thread)
 
         # Hubungkan sinyal dari worker ke slot (metode) di thread utama.
         self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.on_process_finished)
         self.worker.error.connect(self.on_process_error)
+        self.worker.progress.connect(self.update_progress)
         
         # Atur pembersihan setelah thread selesai.
         self.thread.finished.connect(self.thread.deleteLater)
@@ -176,10 +433,148 @@ class MaSubsBurnerApp(QMainWindow):
 
         self.thread.start()
 
+    def start_batch_process(self):
+        """Memilih folder, memasangkan video dengan .srt ber-nama sama, lalu menjalankan batch."""
+        folder = QFileDialog.getExistingDirectory(self, "Pilih Folder Berisi Video dan Subtitle")
+        if not folder:
+            return
+        from batch_burn import pair_videos_with_subtitles
+        pairs, unpaired = pair_videos_with_subtitles(folder)
+        if not pairs:
+            QMessageBox.warning(self, "Tidak Ada Pasangan",
+                                "Tidak ditemukan video yang memiliki file .srt/.ass dengan nama yang sama.")
+            return
+
+        message = f"{len(pairs)} video akan diproses. Hasil disimpan di folder yang sama (akhiran '_hardsub')."
+        if unpaired:
+            message += f"\n\n{len(unpaired)} video dilewati karena tidak memiliki .srt/.ass."
+        if QMessageBox.question(self, "Konfirmasi Batch", message) != QMessageBox.StandardButton.Yes:
+            return
+        if self.chk_server.isChecked():
+            self.start_server_jobs(pairs)
+            return
+
+        self.batch_pairs = pairs
+        self.batch_progress = {video: 0 for video, _ in pairs}
+        self.list_batch.clear()
+        for video, _ in pairs:
+            self.list_batch.addItem(f"[menunggu] {os.path.basename(video)}")
+        self.list_batch.setVisible(True)
+
+        self.set_ui_enabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.btn_cancel.setVisible(True)
+        self.btn_cancel.setEnabled(True)
+
+        self.thread = QThread()
+        self.worker = BatchWorker(pairs, self.current_profile())
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.file_progress.connect(self.on_batch_file_progress)
+        self.worker.file_finished.connect(self.on_batch_file_finished)
+        self.worker.stats.connect(self.on_batch_stats)
+        self.worker.finished.connect(self.on_batch_finished)
+        self.worker.error.connect(self.on_process_error)
+
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.error.connect(self.thread.quit)
+
+        batch = self.worker.batch
+        self.statusBar().showMessage(
+            f"Menjalankan {batch.max_jobs} encode paralel ({batch.profile.threads} thread per encode)...")
+        self.thread.start()
+
+    def start_server_jobs(self, pairs, output_path=None):
+        """Mengirim pasangan (video, subtitle) ke server job; statusnya ditampilkan di daftar batch."""
+        profile = self.current_profile()
+        jobs = [(video, job_params(file_path=video, subtitle_path=subtitle, output_path=output_path,
+                                   preset=profile.name, encoder=profile.vcodec, threads=profile.threads,
+                                   copy_audio=profile.audio_mode == "copy", parallel=self.chk_parallel.isChecked()))
+                for video, subtitle in pairs]
+
+        self.batch_pairs = pairs
+        self.batch_progress = {video: 0 for video, _ in pairs}
+        self.list_batch.clear()
+        for video, _ in pairs:
+            self.list_batch.addItem(f"[menunggu] {os.path.basename(video)}")
+        self.list_batch.setVisible(True)
+
+        self.set_ui_enabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.btn_cancel.setVisible(True)
+        self.btn_cancel.setEnabled(True)
+
+        self.thread = QThread()
+        self.worker = ServerBurnWorker(jobs)
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.file_progress.connect(self.on_batch_file_progress)
+        self.worker.file_finished.connect(self.on_batch_file_finished)
+        self.worker.finished.connect(self.on_batch_finished)
+        self.worker.error.connect(self.on_process_error)
+
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.error.connect(self.thread.quit)
+
+        self.statusBar().showMessage(f"Mengirim {len(jobs)} job ke server...")
+        self.thread.start()
+
+    def set_batch_item_text(self, video_path, text):
+        """Memperbarui baris daftar batch untuk video tertentu."""
+        row = [video for video, _ in self.batch_pairs].index(video_path)
+        self.list_batch.item(row).setText(f"{text} {os.path.basename(video_path)}")
+
+    def on_batch_file_progress(self, video_path, percent, message):
+        self.batch_progress[video_path] = percent
+        self.set_batch_item_text(video_path, f"[{message}]")
+        self.progress_bar.setValue(int(sum(self.batch_progress.values()) / len(self.batch_progress)))
+
+    def on_batch_file_finished(self, video_path, success, message):
+        self.batch_progress[video_path] = 100
+        self.set_batch_item_text(video_path, "[selesai]" if success else f"[gagal: {message.splitlines()[0] if message else ''}]")
+        self.progress_bar.setValue(int(sum(self.batch_progress.values()) / len(self.batch_progress)))
+
+    def on_batch_stats(self, stats):
+        self.statusBar().showMessage(
+            f"{stats['completed']} selesai, {stats['failed']} gagal dari {stats['total']} video "
+            f"— throughput {stats['throughput']:.2f}x real-time — {stats['live_fps']:.0f} fps total"
+        )
+
+    def on_batch_finished(self, results):
+        """Slot yang dipanggil saat seluruh batch selesai."""
+        self.set_ui_enabled(True)
+        self.progress_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
+        succeeded = sum(1 for result in results if result["success"])
+        QMessageBox.information(self, "Batch Selesai",
+                                f"{succeeded} dari {len(results)} video berhasil diproses.")
+
+    def update_progress(self, percent, message):
+        """Slot yang menerima progres ffmpeg dan memperbarui UI."""
+        self.progress_bar.setValue(percent)
+        self.statusBar().showMessage(message)
+
+    def cancel_burn_process(self):
+        """Dipanggil saat tombol 'Batalkan' diklik."""
+        # Worker sedang sibuk di thread-nya sendiri, jadi cancel() dipanggil langsung
+        # (bukan lewat sinyal); ia hanya men-set threading.Event.
+        self.worker.cancel()
+        self.btn_cancel.setEnabled(False)
+        self.statusBar().showMessage("Membatalkan proses...")
+
     def on_process_finished(self, result):
         """Slot yang dipanggil oleh sinyal 'finished' dari worker."""
         self.set_ui_enabled(True)
         self.progress_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
         
         success, message = result
         if success:
@@ -194,18 +589,36 @@ class MaSubsBurnerApp(QMainWindow):
         """Slot yang dipanggil oleh sinyal 'error' dari worker."""
         self.set_ui_enabled(True)
         self.progress_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
         self.statusBar().showMessage("Error Kritis!")
         QMessageBox.critical(self, "Error Kritis", f"Terjadi kesalahan yang tidak terduga:\n{error_message}")
 
+    def on_preset_changed(self, preset_name):
+        """Menyesuaikan checkbox audio dengan mode audio bawaan preset yang dipilih."""
+        self.chk_copy_audio.setChecked(PRESETS[preset_name].audio_mode == "copy")
+
+    def current_profile(self):
+        """Membentuk profil encoding dari pilihan pengguna di GUI."""
+        return get_preset(
+            self.combo_preset.currentText(),
+            vcodec=self.combo_encoder.currentText(),
+            threads=self.spin_threads.value(),
+            audio_mode="copy" if self.chk_copy_audio.isChecked() else "encode",
+        )
+
     def set_ui_enabled(self, is_enabled):
         """Metode utilitas untuk mengaktifkan/menonaktifkan tombol-tombol UI."""
         self.btn_select_video.setEnabled(is_enabled)
         self.btn_select_subtitle.setEnabled(is_enabled)
         self.btn_start_burn.setEnabled(is_enabled)
+        self.btn_batch.setEnabled(is_enabled)
+        self.chk_server.setEnabled(is_enabled)
 
 # --- Titik Masuk Eksekusi Aplikasi ---
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = MaSubsBurnerApp()
     window.show()
+    # Dicatat saat event loop mulai berjalan, yaitu setelah jendela pertama kali digambar.
+    QTimer.singleShot(0, lambda: report_startup_event("shown"))
     sys.exit(app.exec())
\ No newline at end of file
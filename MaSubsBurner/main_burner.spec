@@ -3,7 +3,8 @@
 
 a = Analysis(
     ['main_burner.py'],
-    pathex=[],
+    # Root repositori ditambahkan agar paket bersama 'masubs_common' ikut dibundel.
+    pathex=['..'],
     # --- PERUBAHAN PENTING ADA DI SINI ---
     # Beritahu PyInstaller untuk menambahkan ffmpeg.exe dan ffprobe.exe
     binaries=[('ffmpeg.exe', '.'), ('ffprobe.exe', '.')],
@@ -0,0 +1,332 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import ffmpeg
+
+from burner_logic import get_ffmpeg_path, run_ffmpeg, burn_subtitles
+from batch_burn import plan_concurrency
+from encoding_profiles import get_preset, video_output_args, audio_output_args, DEFAULT_PRESET
+from masubs_common.media import find_executable, probe_media, probe_keyframes
+from masubs_common.instrumentation import span, traced, bind_span
+from masubs_common.subtitles import slice_segments
+from masubs_common.subtitle_export import export_subtitles, load_segments
+
+# Potongan yang lebih pendek dari ini tidak sebanding dengan biaya menjalankan ffmpeg tambahan.
+MIN_SEGMENT_SECONDS = 60.0
+
+
+def burn_video_part(video_path: str, segments, start: float, end, part_path: str, profile,
+                    progress_callback=None, cancel_event=None):
+    """
+    Membakar subtitle ke satu potongan video [start, end) tanpa audio. Subtitle untuk
+    potongan ini ditulis ke file .ass kecil (gaya bawaan yang sama dengan SRT) yang waktunya
+    sudah digeser ke detik ke-0, karena timestamp frame output dimulai dari 0 setelah seek.
+    Dengan .ass, libass membaca gaya langsung tanpa mengonversi SRT terlebih dahulu.
+
+    Args:
+        video_path (str): Path video sumber.
+        segments (list): Seluruh segmen subtitle yang sudah diketahui (waktu absolut).
+        start (float): Awal potongan dalam detik.
+        end (float | None): Akhir potongan dalam detik; None berarti sampai akhir video.
+        part_path (str): Path file potongan hasil (container sama dengan output akhir).
+        profile (EncodingProfile): Profil encoding video.
+        progress_callback (callable, optional): Menerima dict progres ffmpeg untuk potongan ini.
+        cancel_event (threading.Event, optional): Jika di-set, encode dihentikan.
+
+    Returns:
+        tuple: (bool, str) status keberhasilan dan pesan, seperti burn_subtitles().
+    """
+    # Potongan yang masih mengantre tidak perlu dijalankan jika proses sudah dibatalkan.
+    if cancel_event is not None and cancel_event.is_set():
+        return False, "Proses dibatalkan oleh pengguna."
+
+    subtitle_path = export_subtitles(slice_segments(segments, start, end if end is not None else float("inf")),
+                                     os.path.splitext(part_path)[0], ("ass",))["ass"]
+
+    # '-ss' sebagai opsi input ditambah encode ulang menghasilkan potongan yang akurat per frame.
+    input_args = {"ss": start}
+    if end is not None:
+        input_args["t"] = end - start
+    video_stream = ffmpeg.input(video_path, **input_args)['v']
+    # Filter 'subtitles' lebih andal dengan forward slashes, terutama di Windows.
+    video_with_subs = ffmpeg.filter(video_stream, 'subtitles', filename=subtitle_path.replace('\\', '/'))
+    stream = ffmpeg.output(video_with_subs, part_path, an=None, **video_output_args(profile))
+    args = ffmpeg.compile(stream, cmd=get_ffmpeg_path(), overwrite_output=True)
+
+    duration = end - start if end is not None else None
+    with span("encode_part", start=start, end=end, vcodec=profile.vcodec) as stage:
+        return_code, stderr_text, cancelled = run_ffmpeg(args, duration, progress_callback, cancel_event)
+        stage.set(return_code=return_code, cancelled=cancelled)
+    if cancelled:
+        return False, "Proses dibatalkan oleh pengguna."
+    if return_code != 0:
+        return False, f"FFmpeg Error: {stderr_text}"
+    return True, part_path
+
+
+def concat_parts(part_paths, video_path: str, output_path: str, profile, media_info: dict,
+                 progress_callback=None, cancel_event=None):
+    """
+    Menggabungkan potongan video (tanpa encode ulang) lalu menyatukannya dengan audio asli
+    dari video sumber dalam satu file output.
+
+    Args:
+        part_paths (list): Path potongan video, berurutan.
+        video_path (str): Video sumber, diambil audionya.
+        output_path (str): Path file video hasil.
+        profile (EncodingProfile): Profil encoding (menentukan audio disalin atau di-encode).
+        media_info (dict): Hasil probe_media() untuk video sumber.
+        progress_callback (callable, optional): Menerima dict progres ffmpeg.
+        cancel_event (threading.Event, optional): Jika di-set, proses dihentikan.
+
+    Returns:
+        tuple: (bool, str) status keberhasilan dan pesan.
+    """
+    # Daftar file untuk concat demuxer ffmpeg; tanda kutip tunggal di path harus di-escape.
+    list_path = os.path.splitext(part_paths[0])[0] + "_list.txt"
+    with open(list_path, "w", encoding="utf-8") as list_file:
+        for part_path in part_paths:
+            escaped = os.path.abspath(part_path).replace('\\', '/').replace("'", "'\\''")
+            list_file.write(f"file '{escaped}'\n")
+
+    video_stream = ffmpeg.input(list_path, f="concat", safe=0)['v']
+    audio_streams = [ffmpeg.input(video_path)['a']] if media_info["audio"] else []
+    source_audio_codec = media_info["audio"]["codec"] if media_info["audio"] else None
+    stream = ffmpeg.output(
+        video_stream,
+        *audio_streams,
+        output_path,
+        vcodec="copy",
+        **audio_output_args(profile, source_audio_codec, output_path)
+    )
+    args = ffmpeg.compile(stream, cmd=get_ffmpeg_path(), overwrite_output=True)
+    with span("concat", parts=len(part_paths)):
+        return_code, stderr_text, cancelled = run_ffmpeg(args, media_info["duration"],
+                                                         progress_callback, cancel_event)
+    if cancelled:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        return False, "Proses dibatalkan oleh pengguna."
+    if return_code != 0:
+        return False, f"FFmpeg Error: {stderr_text}"
+    return True, f"Proses berhasil. File disimpan di {output_path}"
+
+
+def plan_keyframe_segments(keyframes, duration: float, segment_count: int) -> list:
+    """
+    Membagi video menjadi beberapa rentang yang batasnya tepat di keyframe.
+    Seek ke keyframe tidak perlu mendekode frame sebelumnya, dan batasnya jatuh tepat
+    di timestamp frame sehingga tidak ada frame yang terduplikasi atau hilang saat digabung.
+
+    Args:
+        keyframes (list): Waktu keyframe (detik) dari probe_keyframes().
+        duration (float): Durasi video dalam detik.
+        segment_count (int): Jumlah potongan yang diinginkan.
+
+    Returns:
+        list: Daftar tuple (start, end) dalam detik; 'end' potongan terakhir bernilai None.
+    """
+    segment_count = max(1, min(segment_count, int(duration // MIN_SEGMENT_SECONDS) or 1))
+    boundaries = [0.0]
+    for index in range(1, segment_count):
+        target = duration * index / segment_count
+        # Keyframe terdekat dengan titik pembagian ideal, harus setelah batas sebelumnya.
+        candidates = [time for time in keyframes if time > boundaries[-1] + MIN_SEGMENT_SECONDS / 2]
+        if not candidates:
+            break
+        boundary = min(candidates, key=lambda time: abs(time - target))
+        if duration - boundary < MIN_SEGMENT_SECONDS / 2:
+            break
+        boundaries.append(boundary)
+    ends = boundaries[1:] + [None]
+    return list(zip(boundaries, ends))
+
+
+def probe_stream_durations(path: str) -> dict:
+    """
+    Membaca durasi setiap stream (video/audio) pada file media.
+
+    Args:
+        path (str): Path file media.
+
+    Returns:
+        dict: Durasi dalam detik dengan kunci 'video', 'audio', dan 'format' (None jika tidak diketahui).
+    """
+    command = [find_executable("ffprobe"), "-v", "error", "-print_format", "json",
+               "-show_entries", "stream=codec_type,duration:stream_tags=DURATION:format=duration", path]
+    raw = json.loads(subprocess.run(command, capture_output=True, check=True).stdout)
+
+    def parse_duration(value):
+        if value is None:
+            return None
+        try:
+            # Matroska menyimpan durasi per stream di tag 'DURATION' dengan format HH:MM:SS.nnnnnnnnn.
+            if ":" in value:
+                hours, minutes, seconds = value.split(":")
+                return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+            return float(value)
+        except ValueError:
+            return None
+
+    durations = {"video": None, "audio": None,
+                 "format": parse_duration(raw.get("format", {}).get("duration"))}
+    for stream in raw.get("streams", []):
+        kind = stream.get("codec_type")
+        if kind in ("video", "audio") and durations[kind] is None:
+            durations[kind] = parse_duration(stream.get("duration") or stream.get("tags", {}).get("DURATION"))
+    return durations
+
+
+@traced("verify_sync", "output_path")
+def verify_av_sync(output_path: str, source_duration, tolerance: float = None):
+    """
+    Memastikan hasil penggabungan tidak kehilangan atau menambah frame: durasi video
+    harus sama dengan durasi audio dan durasi sumber, dalam batas toleransi.
+
+    Args:
+        output_path (str): File video hasil.
+        source_duration (float | None): Durasi video sumber dalam detik.
+        tolerance (float, optional): Selisih maksimum dalam detik. Defaults to 0.1.
+
+    Returns:
+        tuple: (bool, str) status sinkron dan penjelasannya.
+    """
+    tolerance = 0.1 if tolerance is None else tolerance
+    try:
+        durations = probe_stream_durations(output_path)
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        return False, f"Gagal memeriksa sinkronisasi A/V: {e}"
+    video = durations["video"] or durations["format"]
+    if video is None:
+        return False, "Durasi video hasil tidak dapat dibaca."
+    if durations["audio"] is not None and abs(video - durations["audio"]) > tolerance:
+        return False, f"Audio dan video tidak sinkron (video {video:.3f} s, audio {durations['audio']:.3f} s)."
+    if source_duration and abs(video - source_duration) > tolerance:
+        return False, f"Durasi hasil ({video:.3f} s) berbeda dengan sumber ({source_duration:.3f} s)."
+    return True, "Audio dan video sinkron."
+
+
+@traced("burn_parallel", "video_path", "subtitle_path", "output_path")
+def burn_subtitles_parallel(video_path: str, subtitle_path: str, output_path: str, profile=None,
+                            segment_count: int = None, progress_callback=None, cancel_event=None):
+    """
+    Versi paralel dari burn_subtitles(): video dipotong di keyframe menjadi beberapa bagian,
+    setiap bagian dibakar dengan potongan subtitle yang waktunya sudah digeser oleh proses
+    ffmpeg terpisah, lalu semua bagian digabung tanpa encode ulang dan audio asli dimasukkan
+    sekali. Satu encode x264 tidak memakai semua core secara efisien, jadi pada mesin
+    dengan banyak core cara ini jauh lebih cepat untuk video panjang.
+
+    Args:
+        video_path (str): Path ke file video sumber.
+        subtitle_path (str): Path ke file subtitle (.srt atau .json; format lain memakai burn_subtitles()).
+        output_path (str): Path untuk menyimpan file video hasil.
+        profile (EncodingProfile, optional): Pengaturan encoding. Defaults to preset DEFAULT_PRESET.
+        segment_count (int, optional): Jumlah potongan. Defaults to jumlah encode paralel
+            yang direncanakan oleh plan_concurrency().
+        progress_callback (callable, optional): Menerima dict progres gabungan semua potongan.
+        cancel_event (threading.Event, optional): Jika di-set, semua encode dihentikan.
+
+    Returns:
+        tuple: (bool, str) status keberhasilan dan pesan, seperti burn_subtitles().
+    """
+    profile = profile or get_preset(DEFAULT_PRESET)
+    try:
+        with span("probe"):
+            media_info = probe_media(video_path)
+        if media_info["video"] is None:
+            return False, "File yang dipilih tidak memiliki stream video."
+        duration = media_info["duration"]
+        # Gaya dan tag file .ass/.vtt tidak bisa dipotong per segmen tanpa kehilangan informasi.
+        if not duration or os.path.splitext(subtitle_path)[1].lower() not in (".srt", ".json"):
+            return burn_subtitles(video_path, subtitle_path, output_path, profile, progress_callback, cancel_event)
+
+        # Jumlah potongan mengikuti jumlah encode yang bisa berjalan bersamaan tanpa
+        # oversubscription; thread encoder per potongan dibagi dari jumlah core.
+        jobs, threads = plan_concurrency(segment_count or os.cpu_count() or 1, profile.threads, profile.vcodec)
+        with span("keyframes") as stage:
+            ranges = plan_keyframe_segments(probe_keyframes(video_path), duration, segment_count or jobs)
+            stage.set(parts=len(ranges))
+        if len(ranges) < 2:
+            # Video terlalu pendek untuk dipotong: pakai jalur biasa.
+            return burn_subtitles(video_path, subtitle_path, output_path, profile, progress_callback, cancel_event)
+        segments = load_segments(subtitle_path)
+        part_profile = replace(profile, threads=threads)
+    except (RuntimeError, OSError) as e:
+        return False, f"An unexpected error occurred: {e}"
+
+    work_dir = tempfile.mkdtemp(prefix="masubs_parts_", dir=os.path.dirname(os.path.abspath(output_path)))
+    extension = os.path.splitext(output_path)[1] or ".mp4"
+    lock = threading.Lock()
+    part_progress = {}
+    # Event internal untuk menghentikan potongan lain saat satu potongan gagal. 'cancel_event'
+    # milik pemanggil hanya dibaca: jika di-set di sini, kegagalan terlihat seperti pembatalan.
+    stop_parts = threading.Event()
+    parts_done = threading.Event()
+
+    def forward_cancel():
+        while not parts_done.is_set():
+            if cancel_event.wait(0.2):
+                stop_parts.set()
+                return
+
+    if cancel_event is not None:
+        threading.Thread(target=forward_cancel, daemon=True).start()
+
+    def make_part_callback(index):
+        def on_part_progress(info):
+            # Progres gabungan: detik yang sudah di-encode dari semua potongan, sedangkan
+            # fps dan kecepatan dijumlahkan dari potongan yang masih berjalan.
+            with lock:
+                part_progress[index] = info
+                encoded = sum(item["out_time"] for item in part_progress.values())
+                running = [item for item in part_progress.values() if item["percent"] < 100]
+                fps = sum(item["fps"] or 0.0 for item in running)
+                speed = sum(item["speed"] or 0.0 for item in running)
+            if progress_callback:
+                progress_callback({"out_time": encoded, "percent": min(99, int(encoded / duration * 100)),
+                                   "fps": fps, "speed": speed or None,
+                                   "eta": max(0.0, duration - encoded) / speed if speed else None})
+        return on_part_progress
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            # bind_span: span encode setiap potongan tercatat di bawah job ini, bukan sebagai job baru.
+            futures = [pool.submit(bind_span(burn_video_part), video_path, segments, start, end,
+                                   os.path.join(work_dir, f"part{index:04d}{extension}"),
+                                   part_profile, make_part_callback(index), stop_parts)
+                       for index, (start, end) in enumerate(ranges)]
+            part_paths = []
+            for future in futures:
+                success, detail = future.result()
+                if not success:
+                    # Satu potongan gagal: potongan lain tidak berguna lagi.
+                    stop_parts.set()
+                    return False, detail
+                part_paths.append(detail)
+
+        success, message = concat_parts(part_paths, video_path, output_path, profile, media_info,
+                                        cancel_event=cancel_event)
+        if not success:
+            return False, message
+
+        in_sync, sync_message = verify_av_sync(output_path, duration, tolerance=_sync_tolerance(media_info))
+        if not in_sync:
+            return False, f"Video tersimpan di {output_path}, tetapi pemeriksaan gagal: {sync_message}"
+        if progress_callback:
+            progress_callback({"out_time": duration, "percent": 100, "fps": None, "speed": None, "eta": 0.0})
+        return True, message
+    finally:
+        parts_done.set()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _sync_tolerance(media_info: dict) -> float:
+    """Toleransi selisih durasi: dua frame video, minimal 0.1 detik (satu frame audio AAC ~0.02 s)."""
+    fps = media_info["video"]["fps"] if media_info["video"] else None
+    return max(0.1, 2 / fps) if fps else 0.1
@@ -0,0 +1,292 @@
+# benchmarks/run_benchmarks.py
+"""
+Benchmark throughput transkripsi (MaSubs) dan burn-in (MaSubsBurner).
+
+Media uji dibuat secara lokal dengan ffmpeg (testsrc2 + nada/noise), jadi hasilnya bisa
+diulang di mesin mana pun tanpa mengunduh apa pun. Setiap kasus dijalankan di proses
+Python baru dengan folder cache kosong, sehingga waktu muat model dan puncak memori
+tidak terpengaruh oleh kasus sebelumnya.
+
+Contoh:
+    python benchmarks/run_benchmarks.py --models tiny base --presets Tercepat Cepat --output hasil.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json --output hasil.json
+    python benchmarks/run_benchmarks.py --speech-clip contoh_ucapan.wav --duration 120
+    python benchmarks/run_benchmarks.py --backends openai-whisper faster-whisper --skip-burn
+
+Metrik per kasus:
+    elapsed        Waktu total (detik).
+    rtf            Real-time factor: waktu proses / durasi media (semakin kecil semakin cepat).
+    model_load     Waktu memuat model Whisper (hanya kasus transkripsi).
+    peak_rss_mb    Puncak memori proses Python.
+    peak_child_rss_mb  Puncak memori proses anak (ffmpeg).
+    cpu_percent    Pemakaian CPU rata-rata terhadap seluruh core (0-100).
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from masubs_common.subtitles import write_srt
+
+# Metrik yang dibandingkan dengan baseline; nilai yang lebih besar berarti lebih lambat/boros.
+COMPARED_METRICS = ("elapsed", "rtf", "model_load", "peak_rss_mb")
+DEFAULT_THRESHOLD = 0.10
+
+
+def resource_usage():
+    """
+    Mengambil total waktu CPU (detik) dan puncak RSS (MB) untuk proses ini dan proses anaknya.
+    Memakai modul 'resource' (Linux/macOS); di Windows memakai 'psutil' jika terpasang.
+
+    Returns:
+        dict: 'cpu_seconds', 'peak_rss_mb', 'peak_child_rss_mb' (None jika tidak tersedia).
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        # ru_maxrss bernilai KB di Linux tetapi byte di macOS.
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return {
+            "cpu_seconds": own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime,
+            "peak_rss_mb": own.ru_maxrss / scale,
+            "peak_child_rss_mb": children.ru_maxrss / scale or None,
+        }
+
+    try:
+        import psutil
+    except ImportError:
+        return {"cpu_seconds": None, "peak_rss_mb": None, "peak_child_rss_mb": None}
+    process = psutil.Process()
+    times = process.cpu_times()
+    memory = process.memory_info()
+    # 'peak_wset' hanya ada di Windows; proses ffmpeg yang sudah selesai tidak bisa diukur lagi.
+    return {
+        "cpu_seconds": times.user + times.system + times.children_user + times.children_system,
+        "peak_rss_mb": getattr(memory, "peak_wset", memory.rss) / (1024 * 1024),
+        "peak_child_rss_mb": None,
+    }
+
+
+def ffmpeg_version() -> str:
+    try:
+        output = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True, check=True).stdout
+        return output.splitlines()[0]
+    except (OSError, subprocess.CalledProcessError, IndexError):
+        return "tidak ditemukan"
+
+
+def generate_media(work_dir: str, duration: float, speech_clip=None) -> dict:
+    """
+    Membuat video uji (testsrc2 720p + audio) dan file subtitle padat untuk uji burn-in.
+
+    Args:
+        work_dir (str): Folder output.
+        duration (float): Durasi media dalam detik.
+        speech_clip (str, optional): Klip ucapan yang diulang sebagai audio. Tanpa klip,
+            audio berupa nada dengan noise (cukup untuk mengukur kecepatan, bukan akurasi).
+
+    Returns:
+        dict: Path 'video' dan 'subtitle'.
+    """
+    video_path = os.path.join(work_dir, "bench_source.mp4")
+    command = ["ffmpeg", "-v", "error", "-y",
+               "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=30:duration={duration}"]
+    if speech_clip:
+        command += ["-stream_loop", "-1", "-i", speech_clip]
+    else:
+        command += ["-f", "lavfi", "-i",
+                    f"sine=frequency=220:duration={duration},volume=0.3[a];"
+                    f"anoisesrc=duration={duration}:amplitude=0.05[n];[a][n]amix=inputs=2[out0]"]
+    command += ["-t", str(duration), "-map", "0:v", "-map", "1:a", "-c:v", "libx264", "-preset", "veryfast",
+                "-g", "60", "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest", video_path]
+    subprocess.run(command, check=True)
+
+    # Satu subtitle setiap 2 detik, panjang teks bervariasi, mendekati hasil transkripsi sungguhan.
+    # Namanya sengaja berbeda dari video agar tidak ditimpa oleh kasus transkripsi.
+    subtitle_path = os.path.join(work_dir, "bench_subtitles.srt")
+    write_srt([{"start": start, "end": start + 1.8,
+                "text": f"Baris subtitle uji nomor {index + 1} " + "teks " * (index % 6)}
+               for index, start in enumerate(range(0, int(duration), 2))], subtitle_path)
+    return {"video": video_path, "subtitle": subtitle_path}
+
+
+def run_case(case: dict) -> dict:
+    """Dijalankan di proses anak: mengeksekusi satu kasus dan mengembalikan metriknya."""
+    started = time.perf_counter()
+    usage_before = resource_usage()
+    metrics = {}
+
+    if case["kind"] == "transcribe":
+        sys.path.insert(0, os.path.join(ROOT_DIR, "MaSubs"))
+        from core_logic import get_model, transcribe_audio, probe_duration
+        load_start = time.perf_counter()
+        get_model(case["model"], case["backend"])
+        metrics["model_load"] = time.perf_counter() - load_start
+        work_start = time.perf_counter()
+        transcribe_audio(case["video"], case["model"], use_cache=False, backend=case["backend"])
+        duration = probe_duration(case["video"])
+    else:
+        sys.path.insert(0, os.path.join(ROOT_DIR, "MaSubsBurner"))
+        from burner_logic import burn_subtitles
+        from segment_burn import burn_subtitles_parallel
+        from encoding_profiles import get_preset
+        from masubs_common.media import probe_media
+        burn = burn_subtitles_parallel if case.get("parallel") else burn_subtitles
+        work_start = time.perf_counter()
+        success, message = burn(case["video"], case["subtitle"], case["output"], get_preset(case["preset"]))
+        if not success:
+            raise RuntimeError(message)
+        duration = probe_media(case["video"])["duration"]
+
+    work_seconds = time.perf_counter() - work_start
+    elapsed = time.perf_counter() - started
+    usage_after = resource_usage()
+    metrics.update({
+        "elapsed": elapsed,
+        "rtf": work_seconds / duration if duration else None,
+        "peak_rss_mb": usage_after["peak_rss_mb"],
+        "peak_child_rss_mb": usage_after["peak_child_rss_mb"],
+        "cpu_percent": None,
+    })
+    if usage_after["cpu_seconds"] is not None and elapsed > 0:
+        cpu_seconds = usage_after["cpu_seconds"] - usage_before["cpu_seconds"]
+        metrics["cpu_percent"] = 100 * cpu_seconds / (elapsed * (os.cpu_count() or 1))
+    return metrics
+
+
+def spawn_case(case: dict, cache_dir: str) -> dict:
+    """Menjalankan satu kasus di proses Python baru dengan folder cache kosong."""
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    env = dict(os.environ, MASUBS_CACHE_DIR=cache_dir)
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-case", json.dumps(case)],
+                               capture_output=True, text=True, env=env)
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "gagal"}
+    # Baris terakhir stdout berisi metrik; baris sebelumnya bisa berupa log pustaka.
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare_with_baseline(report: dict, baseline: dict, threshold: float, metrics=COMPARED_METRICS) -> list:
+    """
+    Membandingkan setiap kasus dengan kasus bernama sama di baseline.
+    'metrics' berisi nama metrik yang dibandingkan (nilai lebih besar = lebih lambat/boros).
+
+    Returns:
+        list: Daftar regresi berupa dict 'case', 'metric', 'baseline', 'current', 'change'.
+    """
+    baseline_cases = {case["name"]: case["metrics"] for case in baseline.get("cases", [])}
+    regressions = []
+    for case in report["cases"]:
+        previous = baseline_cases.get(case["name"])
+        if not previous or "error" in case["metrics"]:
+            continue
+        for metric in metrics:
+            old, new = previous.get(metric), case["metrics"].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            case.setdefault("change", {})[metric] = change
+            if change > threshold:
+                regressions.append({"case": case["name"], "metric": metric, "baseline": old,
+                                    "current": new, "change": change})
+    return regressions
+
+
+def build_cases(args, media: dict, work_dir: str) -> list:
+    cases = []
+    if not args.skip_transcribe:
+        for model in args.models:
+            for backend in args.backends:
+                # Nama kasus backend bawaan tidak diberi akhiran agar tetap cocok dengan baseline lama.
+                name = f"transcribe/{model}" + (f"/{backend}" if backend != "openai-whisper" else "")
+                cases.append({"name": name, "kind": "transcribe", "model": model, "backend": backend,
+                              "video": media["video"]})
+    if not args.skip_burn:
+        for preset in args.presets:
+            for parallel in ([False, True] if args.parallel else [False]):
+                name = f"burn/{preset}" + ("/parallel" if parallel else "")
+                cases.append({"name": name, "kind": "burn", "preset": preset, "parallel": parallel,
+                              "video": media["video"], "subtitle": media["subtitle"],
+                              "output": os.path.join(work_dir, name.replace("/", "_").replace(" ", "_") + ".mp4")})
+    return cases
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark transkripsi dan burn-in MaSubs Studio.")
+    parser.add_argument("--models", nargs="+", default=["tiny", "base"], help="Model Whisper yang diuji.")
+    parser.add_argument("--backends", nargs="+", default=["openai-whisper"],
+                        help="Backend inferensi yang diuji (openai-whisper, faster-whisper).")
+    parser.add_argument("--presets", nargs="+", default=["Tercepat", "Cepat"], help="Preset encoding yang diuji.")
+    parser.add_argument("--parallel", action="store_true", help="Juga uji burn-in mode paralel per keyframe.")
+    parser.add_argument("--duration", type=float, default=60.0, help="Durasi media uji (detik).")
+    parser.add_argument("--speech-clip", help="Klip ucapan lokal untuk audio uji (diulang sampai durasi penuh).")
+    parser.add_argument("--skip-transcribe", action="store_true")
+    parser.add_argument("--skip-burn", action="store_true")
+    parser.add_argument("--output", default="benchmark_report.json", help="Path laporan JSON.")
+    parser.add_argument("--baseline", help="Laporan JSON sebelumnya untuk dibandingkan.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Kenaikan relatif yang dianggap regresi (0.10 = 10%%).")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return 0
+
+    work_dir = tempfile.mkdtemp(prefix="masubs_bench_")
+    try:
+        print(f"Membuat media uji {args.duration:.0f} detik...", file=sys.stderr)
+        media = generate_media(work_dir, args.duration, args.speech_clip)
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "machine": {"platform": platform.platform(), "processor": platform.processor(),
+                        "cpu_count": os.cpu_count(), "python": platform.python_version(),
+                        "ffmpeg": ffmpeg_version()},
+            "media": {"duration": args.duration, "speech_clip": bool(args.speech_clip)},
+            "cases": [],
+        }
+        for case in build_cases(args, media, work_dir):
+            print(f"Menjalankan {case['name']}...", file=sys.stderr)
+            metrics = spawn_case(case, os.path.join(work_dir, "cache"))
+            report["cases"].append({"name": case["name"], "metrics": metrics})
+            if "error" in metrics:
+                summary = f"gagal: {metrics['error']}"
+            else:
+                rtf = f"{metrics['rtf']:.3f}" if metrics["rtf"] is not None else "-"
+                summary = f"elapsed {metrics['elapsed']:.2f} s, RTF {rtf}"
+            print(f"  {summary}", file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            regressions = compare_with_baseline(report, json.load(baseline_file), args.threshold)
+        report["regressions"] = regressions
+        for item in regressions:
+            print(f"REGRESI {item['case']} {item['metric']}: {item['baseline']:.3f} -> "
+                  f"{item['current']:.3f} (+{item['change'] * 100:.1f}%)", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    with open(args.output, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f"Laporan disimpan di {args.output}", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
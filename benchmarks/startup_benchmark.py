@@ -0,0 +1,179 @@
+# benchmarks/startup_benchmark.py
+"""
+Benchmark waktu startup MaSubs dan MaSubsBurner.
+
+Dua jenis kasus, masing-masing dijalankan di proses Python baru:
+    import:<modul>  Waktu impor modul aplikasi (tanpa GUI) dan pustaka berat yang ikut termuat.
+                    Whisper/torch tidak boleh termuat hanya karena modul diimpor.
+    gui:<aplikasi>  Jendela dibuka dengan QT_QPA_PLATFORM=offscreen dan MASUBS_STARTUP_BENCHMARK=1;
+                    aplikasi mencetak waktu 'shown' (jendela tampil) dan 'ready' (persiapan latar
+                    belakang selesai) lalu menutup diri. Membutuhkan PyQt6.
+
+Contoh:
+    python benchmarks/startup_benchmark.py --output startup.json
+    python benchmarks/startup_benchmark.py --repeat 5 --baseline startup_baseline.json
+
+Metrik per kasus (median dari --repeat percobaan):
+    elapsed   Waktu total proses, termasuk start interpreter (detik).
+    imported  Waktu impor modul (kasus import) atau waktu sampai jendela tampil (kasus gui).
+    ready     Waktu sampai indikator kesiapan selesai (hanya kasus gui).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+
+from run_benchmarks import compare_with_baseline, DEFAULT_THRESHOLD
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Metrik yang dibandingkan dengan baseline; nilai yang lebih besar berarti startup lebih lambat.
+COMPARED_METRICS = ("elapsed", "imported", "ready")
+
+# Pustaka yang mahal diimpor. Whisper/torch tidak boleh termuat saat startup; numpy dan
+# ffmpeg-python dicatat untuk melihat apakah impor lazy di GUI masih berlaku.
+HEAVY_MODULES = ("whisper", "torch", "faster_whisper", "numpy", "ffmpeg")
+FORBIDDEN_MODULES = ("whisper", "torch", "faster_whisper")
+
+# (nama kasus, folder aplikasi, modul yang diimpor)
+IMPORT_CASES = [
+    ("import:masubs", ROOT_DIR, "masubs"),
+    ("import:core_logic", os.path.join(ROOT_DIR, "MaSubs"), "core_logic"),
+    ("import:pipeline", os.path.join(ROOT_DIR, "MaSubs"), "pipeline"),
+    ("import:burner_logic", os.path.join(ROOT_DIR, "MaSubsBurner"), "burner_logic"),
+]
+# (nama kasus, folder aplikasi, skrip GUI)
+GUI_CASES = [
+    ("gui:MaSubs", os.path.join(ROOT_DIR, "MaSubs"), "main_app.py"),
+    ("gui:MaSubsBurner", os.path.join(ROOT_DIR, "MaSubsBurner"), "main_burner.py"),
+]
+
+# Kode yang dijalankan di proses anak untuk kasus import.
+_IMPORT_PROBE = """
+import sys, time, json, importlib
+sys.path.insert(0, {app_dir!r})
+start = time.perf_counter()
+importlib.import_module({module!r})
+imported = time.perf_counter() - start
+print(json.dumps({{"imported": imported, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _error_line(completed) -> str:
+    lines = (completed.stderr or "").strip().splitlines()
+    return lines[-1] if lines else f"exit code {completed.returncode}"
+
+
+def run_import_case(app_dir: str, module: str, timeout: float) -> dict:
+    """Mengimpor satu modul di proses baru dan mencatat waktunya serta pustaka berat yang ikut termuat."""
+    code = _IMPORT_PROBE.format(app_dir=app_dir, module=module, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                               cwd=app_dir, timeout=timeout)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        return {"error": _error_line(completed)}
+    metrics = json.loads(completed.stdout.strip().splitlines()[-1])
+    metrics["elapsed"] = elapsed
+    forbidden = [name for name in metrics["loaded"] if name in FORBIDDEN_MODULES]
+    if forbidden:
+        metrics["error"] = f"pustaka berat termuat saat impor: {', '.join(forbidden)}"
+    return metrics
+
+
+def run_gui_case(app_dir: str, script: str, timeout: float) -> dict:
+    """Membuka satu GUI tanpa layar dan membaca event startup yang dicetaknya ke stdout."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", MASUBS_STARTUP_BENCHMARK="1")
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run([sys.executable, script], capture_output=True, text=True,
+                                   cwd=app_dir, env=env, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"aplikasi tidak siap dalam {timeout:.0f} detik"}
+    elapsed = time.perf_counter() - start
+    events = {}
+    for line in completed.stdout.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and "event" in record:
+            events[record["event"]] = record
+    if "shown" not in events or "ready" not in events:
+        return {"error": _error_line(completed)}
+    return {"elapsed": elapsed, "imported": events["shown"]["seconds"], "ready": events["ready"]["seconds"],
+            "missing": events["ready"].get("missing", [])}
+
+
+def median_metrics(runs: list) -> dict:
+    """Menggabungkan beberapa percobaan: median untuk metrik angka, sisanya dari percobaan terakhir."""
+    failed = [run for run in runs if "error" in run]
+    if failed:
+        return failed[-1]
+    merged = dict(runs[-1])
+    for metric in COMPARED_METRICS:
+        values = [run[metric] for run in runs if run.get(metric) is not None]
+        if values:
+            merged[metric] = statistics.median(values)
+    return merged
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark waktu startup MaSubs Studio.")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah percobaan per kasus (diambil mediannya).")
+    parser.add_argument("--skip-gui", action="store_true", help="Hanya uji impor modul (tanpa PyQt6).")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Batas waktu per percobaan (detik).")
+    parser.add_argument("--output", default="startup_report.json", help="Path laporan JSON.")
+    parser.add_argument("--baseline", help="Laporan JSON sebelumnya untuk dibandingkan.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Kenaikan relatif yang dianggap regresi (0.10 = 10%%).")
+    args = parser.parse_args(argv)
+
+    cases = [(name, lambda d=app_dir, m=module: run_import_case(d, m, args.timeout))
+             for name, app_dir, module in IMPORT_CASES]
+    if not args.skip_gui:
+        cases += [(name, lambda d=app_dir, s=script: run_gui_case(d, s, args.timeout))
+                  for name, app_dir, script in GUI_CASES]
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"platform": platform.platform(), "processor": platform.processor(),
+                    "cpu_count": os.cpu_count(), "python": platform.python_version()},
+        "repeat": args.repeat,
+        "cases": [],
+    }
+    for name, run in cases:
+        print(f"Menjalankan {name}...", file=sys.stderr)
+        metrics = median_metrics([run() for _ in range(max(1, args.repeat))])
+        report["cases"].append({"name": name, "metrics": metrics})
+        if "error" in metrics:
+            summary = f"gagal: {metrics['error']}"
+        elif "ready" in metrics:
+            summary = f"tampil {metrics['imported']:.2f} s, siap {metrics['ready']:.2f} s"
+        else:
+            summary = f"impor {metrics['imported']:.2f} s (proses {metrics['elapsed']:.2f} s)"
+        print(f"  {summary}", file=sys.stderr)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            regressions = compare_with_baseline(report, json.load(baseline_file), args.threshold,
+                                                COMPARED_METRICS)
+        report["regressions"] = regressions
+        for item in regressions:
+            print(f"REGRESI {item['case']} {item['metric']}: {item['baseline']:.3f} -> "
+                  f"{item['current']:.3f} (+{item['change'] * 100:.1f}%)", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    with open(args.output, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f"Laporan disimpan di {args.output}", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,627 @@
+# masubs.py
+"""
+Antarmuka baris perintah (CLI) MaSubs Studio untuk server/render node tanpa GUI.
+
+Contoh:
+    python masubs.py transcribe "rekaman/*.mp4" --model small --jobs 4 --json
+    python masubs.py burn "episode/*.mkv" --preset Seimbang --copy-audio --jobs 2
+    python masubs.py pipeline "episode01.mp4" --model small --preset Cepat
+    python masubs.py export "rekaman/*.srt" --formats vtt ass
+    python masubs.py export "rekaman/*.json" --formats srt --relayout --max-chars 37
+    python masubs.py serve --host 0.0.0.0 --token rahasia --preload large
+    python masubs.py transcribe "/mnt/media/*.mp4" --model large --server http://render01:8765 --wait
+
+Skrip ini tidak pernah mengimpor PyQt6. Pustaka berat (whisper/torch) baru diimpor
+saat benar-benar dibutuhkan, sehingga startup untuk banyak job kecil tetap cepat.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import multiprocessing
+
+from masubs_common.instrumentation import (configure, recent_spans, summarize_spans,
+                                           TRACE_FILE_ENV, PROFILE_DIR_ENV)
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def use_app_modules(folder: str):
+    """Menambahkan folder aplikasi (MaSubs / MaSubsBurner) ke sys.path agar modulnya bisa diimpor."""
+    path = os.path.join(ROOT_DIR, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def expand_inputs(patterns) -> list:
+    """
+    Mengubah daftar pola glob, file, atau folder menjadi daftar file yang unik.
+    Pola di-expand di sini (bukan oleh shell) agar perilakunya sama di Windows.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.append(pattern)
+            continue
+        matches = sorted(glob.glob(pattern, recursive=True))
+        paths.extend(matches if matches else [pattern])
+    return list(dict.fromkeys(paths))
+
+
+def log(args, message: str):
+    """Mencetak pesan progres ke stderr (stdout disimpan untuk output JSON)."""
+    if not args.quiet:
+        print(message, file=sys.stderr, flush=True)
+
+
+class ConsoleProgress:
+    """Meniru antarmuka 'pyqtSignal.emit' dan mencetak progres ke stderr."""
+    def __init__(self, args, label: str):
+        self.args = args
+        self.label = label
+
+    def emit(self, percent, message):
+        log(self.args, f"[{self.label}] {percent:3d}% {message}")
+
+
+def emit_report(args, report: dict):
+    """Mencetak laporan akhir sebagai JSON (jika diminta) atau ringkasan teks."""
+    # Total waktu per tahap (model_load, audio_decode, inference, encode, ...) di proses ini.
+    report["stages"] = summarize_spans(recent_spans())
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for item in report["files"]:
+            detail = item.get("output") or item.get("error") or ""
+            print(f"{item['status']:>9}  {item['file']}  {detail}")
+        print(f"Total: {report['timings']['total']:.2f} detik")
+
+
+def apply_memory_guard(args):
+    """Mematikan guard memori jika diminta, termasuk untuk proses worker (lewat environment)."""
+    if args.no_memory_guard:
+        from memory_planner import configure_memory_guard, MEMORY_GUARD_ENV
+        os.environ[MEMORY_GUARD_ENV] = "0"
+        configure_memory_guard(enabled=False)
+
+
+def decode_options(args):
+    """Menyusun TranscribeOptions dari preset --decode dan opsi decoding yang ditulis eksplisit."""
+    from dataclasses import replace
+    from transcribe_options import DECODE_PRESETS
+    overrides = {}
+    if args.language:
+        overrides["language"] = args.language
+    if args.beam_size:
+        overrides["beam_size"] = args.beam_size
+    if args.temperature_fallback:
+        overrides["temperature_fallback"] = True
+    if args.condition_on_previous_text:
+        overrides["condition_on_previous_text"] = True
+    if args.word_timestamps:
+        overrides["word_timestamps"] = True
+    return replace(DECODE_PRESETS[args.decode], **overrides)
+
+
+def layout_rules(args):
+    """Menyusun LayoutRules dari opsi --relayout, atau None jika segmen ditulis apa adanya."""
+    if not args.relayout:
+        return None
+    from masubs_common.resegment import LayoutRules
+    return LayoutRules(max_chars_per_line=args.max_chars, max_lines=args.max_lines,
+                       max_duration=args.max_duration, max_chars_per_second=args.max_cps)
+
+
+def submit_remote(args, kind: str, job_params_list) -> int:
+    """
+    Mengirim job ke server job (--server) alih-alih menjalankannya di proses ini.
+    Dengan --wait, perintah menunggu semua job selesai dan melaporkan hasilnya seperti biasa.
+    """
+    from masubs_common.job_client import JobClient, JobServerError
+
+    client = JobClient(args.server)
+    start_time = time.perf_counter()
+    items = []
+    try:
+        job_ids = [(params["file_path"], client.submit(kind, params)) for params in job_params_list]
+        for file_path, job_id in job_ids:
+            log(args, f"[{os.path.basename(file_path)}] job #{job_id} dikirim ke {client.url}")
+        for file_path, job_id in job_ids:
+            if not args.wait:
+                items.append({"file": file_path, "status": "queued", "job_id": job_id, "output": None,
+                              "error": None, "elapsed": None})
+                continue
+            label = os.path.basename(file_path)
+            job = client.wait(job_id, on_progress=lambda job, label=label: log(
+                args, f"[{label}] #{job['id']} {job['status']} {job['progress']:3d}% {job['message']}"))
+            result = job["result"] or {}
+            items.append({"file": file_path, "status": job["status"], "job_id": job_id,
+                          "output": result.get("output_path") or result.get("srt_path"), "error": job["error"],
+                          "elapsed": (job["finished"] or 0) - (job["started"] or job["finished"] or 0)})
+    except JobServerError as e:
+        log(args, str(e))
+        return 2
+    emit_report(args, {"command": kind, "server": client.url, "files": items,
+                       "timings": {"total": time.perf_counter() - start_time}})
+    return 0 if all(item["status"] in ("done", "queued") for item in items) else 1
+
+
+def command_transcribe(args) -> int:
+    use_app_modules("MaSubs")
+    from batch_queue import collect_media_files
+    apply_memory_guard(args)
+
+    files = collect_media_files(expand_inputs(args.inputs))
+    if not files:
+        log(args, "Tidak ada file audio/video yang ditemukan.")
+        return 2
+    if args.previous and len(files) > 1:
+        log(args, "--previous hanya bisa dipakai untuk satu file.")
+        return 2
+    options = decode_options(args)
+    layout = layout_rules(args)
+    incremental = args.incremental or bool(args.previous)
+    if incremental and (args.long or args.batch_size or (args.jobs > 1 and len(files) > 1)):
+        log(args, "--incremental hanya berlaku pada mode satu proses (tanpa --long/--batch-size/--jobs); diabaikan.")
+    if args.server is not None:
+        from masubs_common.job_client import job_params
+        return submit_remote(args, "transcribe", [
+            job_params(file_path=path, model=args.model, backend=args.backend, long=args.long,
+                       jobs=args.jobs if args.long else None, use_cache=not args.no_cache,
+                       skip_silence=not args.keep_silence, options=options, layout=layout,
+                       export_formats=args.formats, incremental=incremental, previous_path=args.previous)
+            for path in files])
+
+    start_time = time.perf_counter()
+    timings = {}
+    items = []
+
+    if args.batch_size and not args.long:
+        # Banyak klip pendek: satu model, jendela dari beberapa file didekode dalam satu forward pass.
+        from batched_inference import BatchedTranscriber
+
+        def on_event(kind, file_path, data):
+            if kind in ("done", "failed"):
+                log(args, f"[{os.path.basename(file_path)}] {kind}: {data}")
+
+        results = BatchedTranscriber(files, args.model, args.batch_size, on_event=on_event,
+                                     backend=args.backend, use_cache=not args.no_cache,
+                                     skip_silence=not args.keep_silence, options=options,
+                                     export_formats=args.formats, layout=layout).run()
+        for result in results:
+            items.append({"file": result["file_path"], "status": result["status"],
+                          "output": result["srt_path"], "error": result["error"],
+                          "elapsed": result["elapsed"]})
+    elif args.jobs > 1 and len(files) > 1 and not args.long:
+        # Banyak file: dibagi ke pool proses worker, masing-masing memuat model sendiri.
+        from batch_queue import BatchTranscriber
+
+        def on_event(kind, file_path, data):
+            if kind == "progress":
+                log(args, f"[{os.path.basename(file_path)}] {data[0]:3d}% {data[1]}")
+            elif kind in ("done", "failed"):
+                log(args, f"[{os.path.basename(file_path)}] {kind}: {data}")
+
+        results = BatchTranscriber(files, args.model, args.jobs, on_event=on_event, backend=args.backend,
+                                   use_cache=not args.no_cache, skip_silence=not args.keep_silence,
+                                   options=options, export_formats=args.formats, layout=layout).run()
+        for result in results:
+            items.append({"file": result["file_path"], "status": result["status"],
+                          "output": result["srt_path"], "error": result["error"],
+                          "elapsed": result["elapsed"]})
+    else:
+        # Satu proses: model dimuat sekali (oleh job pertama yang membutuhkannya, lewat memory
+        # planner) lalu dipakai ulang untuk semua file. Jika semua file ada di cache hasil, model
+        # tidak dimuat sama sekali. Waktu muat model tercatat di 'stages' (span model_load).
+        from core_logic import transcribe_audio
+        from long_audio import transcribe_long_audio
+
+        for file_path in files:
+            progress = ConsoleProgress(args, os.path.basename(file_path))
+            file_start = time.perf_counter()
+            try:
+                if args.long:
+                    _, srt_path = transcribe_long_audio(file_path, args.model, args.jobs, progress,
+                                                        use_cache=not args.no_cache, backend=args.backend,
+                                                        skip_silence=not args.keep_silence, options=options,
+                                                        export_formats=args.formats, layout=layout)
+                else:
+                    _, srt_path = transcribe_audio(file_path, args.model, progress, use_cache=not args.no_cache,
+                                                   backend=args.backend, release_after=args.release_model,
+                                                   skip_silence=not args.keep_silence, options=options,
+                                                   export_formats=args.formats, layout=layout,
+                                                   incremental=incremental, previous_path=args.previous)
+                items.append({"file": file_path, "status": "done", "output": srt_path, "error": None,
+                              "elapsed": time.perf_counter() - file_start})
+            except Exception as e:
+                items.append({"file": file_path, "status": "failed", "output": None, "error": str(e),
+                              "elapsed": time.perf_counter() - file_start})
+                log(args, f"[{os.path.basename(file_path)}] gagal: {e}")
+
+    timings["total"] = time.perf_counter() - start_time
+    emit_report(args, {"command": "transcribe", "model": args.model, "backend": args.backend,
+                       "decode": options.cache_options(), "files": items, "timings": timings})
+    return 0 if all(item["status"] == "done" for item in items) else 1
+
+
+def command_burn(args) -> int:
+    use_app_modules("MaSubsBurner")
+    from batch_burn import BatchBurner, default_output_path, find_subtitle_for, VIDEO_EXTENSIONS
+    from burner_logic import burn_subtitles, format_progress_message
+    from encoding_profiles import get_preset
+    from segment_burn import burn_subtitles_parallel
+
+    videos = []
+    for path in expand_inputs(args.inputs):
+        if os.path.isdir(path):
+            videos.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                          if name.lower().endswith(VIDEO_EXTENSIONS))
+        else:
+            videos.append(path)
+    if not videos:
+        log(args, "Tidak ada file video yang ditemukan.")
+        return 2
+    if (args.subtitle or args.output) and len(videos) != 1:
+        log(args, "--subtitle dan --output hanya bisa dipakai untuk satu video.")
+        return 2
+
+    overrides = {"threads": args.threads, "audio_mode": "copy" if args.copy_audio else "encode"}
+    if args.encoder:
+        overrides["vcodec"] = args.encoder
+    profile = get_preset(args.preset, **overrides)
+
+    items = []
+    pairs = []
+    for video in videos:
+        subtitle = args.subtitle or find_subtitle_for(video)
+        if subtitle:
+            pairs.append((video, subtitle))
+        else:
+            items.append({"file": video, "status": "skipped", "output": None,
+                          "error": "Subtitle dengan nama yang sama tidak ditemukan.", "elapsed": None})
+
+    if args.server is not None:
+        from masubs_common.job_client import job_params
+        return submit_remote(args, "burn", [
+            job_params(file_path=video, subtitle_path=subtitle, output_path=args.output, preset=args.preset,
+                       encoder=args.encoder, threads=args.threads, copy_audio=args.copy_audio,
+                       parallel=args.parallel)
+            for video, subtitle in pairs])
+
+    start_time = time.perf_counter()
+    if len(pairs) == 1:
+        video, subtitle = pairs[0]
+        output_path = args.output or default_output_path(video)
+        label = os.path.basename(video)
+        burn = burn_subtitles_parallel if args.parallel else burn_subtitles
+        success, message = burn(
+            video, subtitle, output_path, profile,
+            progress_callback=lambda info: log(args, f"[{label}] {format_progress_message(info)}"))
+        items.append({"file": video, "status": "done" if success else "failed",
+                      "output": output_path if success else None,
+                      "error": None if success else message,
+                      "elapsed": time.perf_counter() - start_time})
+    elif pairs:
+        def on_event(kind, video_path, data):
+            if kind == "progress":
+                log(args, f"[{os.path.basename(video_path)}] {format_progress_message(data)}")
+            elif kind == "stats":
+                log(args, f"{data['completed'] + data['failed']}/{data['total']} selesai, "
+                          f"throughput {data['throughput']:.2f}x real-time")
+
+        batch = BatchBurner(pairs, profile, max_jobs=args.jobs or None, on_event=on_event)
+        for result in batch.run():
+            items.append({"file": result["video_path"], "status": "done" if result["success"] else "failed",
+                          "output": result["output_path"] if result["success"] else None,
+                          "error": None if result["success"] else result["message"], "elapsed": None})
+
+    report = {"command": "burn", "preset": args.preset, "encoder": profile.vcodec, "files": items,
+              "timings": {"total": time.perf_counter() - start_time}}
+    emit_report(args, report)
+    return 0 if all(item["status"] == "done" for item in items) else 1
+
+
+def command_pipeline(args) -> int:
+    use_app_modules("MaSubs")
+    apply_memory_guard(args)
+    from pipeline import transcribe_and_burn
+    from batch_burn import VIDEO_EXTENSIONS
+    from encoding_profiles import get_preset
+
+    videos = []
+    for path in expand_inputs(args.inputs):
+        if os.path.isdir(path):
+            videos.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                          if name.lower().endswith(VIDEO_EXTENSIONS))
+        else:
+            videos.append(path)
+    if not videos:
+        log(args, "Tidak ada file video yang ditemukan.")
+        return 2
+    if args.output and len(videos) != 1:
+        log(args, "--output hanya bisa dipakai untuk satu video.")
+        return 2
+    if args.server is not None:
+        from masubs_common.job_client import job_params
+        return submit_remote(args, "pipeline", [
+            job_params(file_path=video, model=args.model, output_path=args.output, preset=args.preset,
+                       encoder=args.encoder, threads=args.threads, copy_audio=args.copy_audio,
+                       part_seconds=args.part_seconds, backend=args.backend, use_cache=not args.no_cache,
+                       skip_silence=not args.keep_silence, options=decode_options(args),
+                       layout=layout_rules(args), export_formats=args.formats)
+            for video in videos])
+
+    overrides = {"threads": args.threads, "audio_mode": "copy" if args.copy_audio else "encode"}
+    if args.encoder:
+        overrides["vcodec"] = args.encoder
+    profile = get_preset(args.preset, **overrides)
+
+    start_time = time.perf_counter()
+    items = []
+    for video in videos:
+        progress = ConsoleProgress(args, os.path.basename(video))
+        file_start = time.perf_counter()
+        try:
+            _, srt_path, output_path = transcribe_and_burn(
+                video, args.model, args.output, profile, args.part_seconds,
+                progress_signal=progress, use_cache=not args.no_cache, backend=args.backend,
+                release_after=args.release_model, skip_silence=not args.keep_silence,
+                options=decode_options(args), export_formats=args.formats, layout=layout_rules(args))
+            items.append({"file": video, "status": "done", "output": output_path, "subtitle": srt_path,
+                          "error": None, "elapsed": time.perf_counter() - file_start})
+        except Exception as e:
+            items.append({"file": video, "status": "failed", "output": None, "subtitle": None,
+                          "error": str(e), "elapsed": time.perf_counter() - file_start})
+            log(args, f"[{os.path.basename(video)}] gagal: {e}")
+
+    report = {"command": "pipeline", "model": args.model, "backend": args.backend, "preset": args.preset, "encoder": profile.vcodec,
+              "files": items, "timings": {"total": time.perf_counter() - start_time}}
+    emit_report(args, report)
+    return 0 if all(item["status"] == "done" for item in items) else 1
+
+
+def command_export(args) -> int:
+    """Membuat format subtitle lain dari file .srt/.json yang sudah ada, tanpa transkripsi ulang."""
+    from masubs_common.subtitle_export import export_subtitles, load_segments, FORMAT_EXTENSIONS
+    from masubs_common.resegment import resegment
+    layout = layout_rules(args)
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        log(args, "Tidak ada file subtitle yang ditemukan.")
+        return 2
+
+    start_time = time.perf_counter()
+    items = []
+    for path in files:
+        file_start = time.perf_counter()
+        base_path, extension = os.path.splitext(path)
+        # File sumber tidak ditimpa oleh format yang sama.
+        formats = [name for name in args.formats if FORMAT_EXTENSIONS[name] != extension.lower()]
+        try:
+            segments = load_segments(path)
+            if layout:
+                # File .json dari transkripsi dengan --word-timestamps menyimpan waktu per kata,
+                # jadi baris bisa dipotong tepat di kata yang diucapkan.
+                segments = resegment(segments, layout)
+            outputs = export_subtitles(segments, base_path, formats)
+            items.append({"file": path, "status": "done", "output": ", ".join(outputs.values()), "error": None,
+                          "elapsed": time.perf_counter() - file_start})
+        except (OSError, ValueError, KeyError) as e:
+            items.append({"file": path, "status": "failed", "output": None, "error": str(e),
+                          "elapsed": time.perf_counter() - file_start})
+            log(args, f"[{os.path.basename(path)}] gagal: {e}")
+
+    emit_report(args, {"command": "export", "formats": args.formats, "relayout": bool(layout), "files": items,
+                       "timings": {"total": time.perf_counter() - start_time}})
+    return 0 if all(item["status"] == "done" for item in items) else 1
+
+
+def command_serve(args) -> int:
+    """Menjalankan server job lokal sampai dihentikan dengan Ctrl+C."""
+    use_app_modules("MaSubs")
+    from job_server import JobServer
+    from masubs_common.job_client import SERVER_TOKEN_ENV
+
+    token = args.token or os.environ.get(SERVER_TOKEN_ENV)
+    if args.host not in ("127.0.0.1", "localhost", "::1") and not token:
+        log(args, "Peringatan: server terbuka di jaringan tanpa --token; siapa pun bisa mengirim job.")
+    try:
+        server = JobServer(args.host, args.port, model_workers=args.workers, burn_workers=args.burn_workers,
+                           db_path=args.db, token=token, preload_model=args.preload, backend=args.backend,
+                           log=lambda message: log(args, message))
+    except OSError as e:
+        log(args, f"Server tidak bisa dijalankan di {args.host}:{args.port}: {e}")
+        return 2
+    server.run()
+    return 0
+
+
+def command_jobs(args) -> int:
+    """Menampilkan daftar/detail job di server, atau membatalkannya."""
+    from masubs_common.job_client import JobClient, JobServerError
+
+    client = JobClient(args.server)
+    try:
+        if args.ids:
+            jobs = [client.cancel(job_id) if args.cancel else client.job(job_id) for job_id in args.ids]
+        else:
+            jobs = client.jobs(args.status, args.limit)
+    except JobServerError as e:
+        log(args, str(e))
+        return 2
+    if args.json:
+        json.dump({"server": client.url, "jobs": jobs}, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for job in jobs:
+            result = job["result"] or {}
+            detail = job["error"] or result.get("output_path") or result.get("srt_path") or job["message"]
+            print(f"#{job['id']:<5} {job['kind']:<10} {job['status']:>9} {job['progress']:3d}%  "
+                  f"{job['params'].get('file_path')}  {detail}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    # Registri backend ringan (tidak mengimpor whisper/torch), aman diimpor saat startup.
+    use_app_modules("MaSubs")
+    from backends import BACKENDS, DEFAULT_BACKEND
+    from masubs_common.subtitle_export import EXPORT_FORMATS
+
+    # Opsi umum dipasang di setiap subcommand agar bisa ditulis setelah nama perintah.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="Cetak laporan hasil dan waktu sebagai JSON ke stdout.")
+    common.add_argument("--quiet", action="store_true", help="Jangan cetak progres ke stderr.")
+    common.add_argument("--trace", metavar="FILE",
+                        help="Tulis waktu & memori setiap tahap sebagai JSONL ke file ini.")
+    common.add_argument("--profile", metavar="DIR", help="Simpan hasil cProfile (.prof) setiap job ke folder ini.")
+
+    # Opsi decoding Whisper, dipakai oleh 'transcribe' dan 'pipeline'.
+    decoding = argparse.ArgumentParser(add_help=False)
+    decoding.add_argument("--decode", choices=["cepat", "akurat"], default="cepat",
+                          help="Preset decoding: 'cepat' (greedy, tanpa fallback temperatur) atau "
+                               "'akurat' (beam search + fallback, 2-3x lebih lambat).")
+    decoding.add_argument("--language", help="Kode bahasa (misal 'id'). Tanpa opsi ini bahasa dideteksi sekali per file.")
+    decoding.add_argument("--beam-size", type=int, default=0, help="Lebar beam search (0 = ikuti preset).")
+    decoding.add_argument("--temperature-fallback", action="store_true",
+                          help="Dekode ulang jendela yang meragukan dengan temperatur lebih tinggi.")
+    decoding.add_argument("--condition-on-previous-text", action="store_true",
+                          help="Pakai teks jendela sebelumnya sebagai konteks decoding.")
+    decoding.add_argument("--formats", nargs="+", choices=EXPORT_FORMATS, default=["srt"],
+                          help="Format subtitle yang ditulis (.srt selalu ditulis), misal '--formats srt vtt ass'.")
+    decoding.add_argument("--word-timestamps", action="store_true",
+                          help="Simpan timestamp per kata (di cache dan .json) untuk --relayout yang lebih presisi.")
+
+    # Aturan tata letak subtitle, diterapkan setelah inferensi (atau pada .srt/.json yang sudah ada).
+    layout = argparse.ArgumentParser(add_help=False)
+    layout.add_argument("--relayout", action="store_true",
+                        help="Susun ulang baris subtitle: pecah segmen panjang dan bungkus teks sesuai batas di bawah.")
+    layout.add_argument("--max-chars", type=int, default=42, help="Karakter maksimal per baris (dengan --relayout).")
+    layout.add_argument("--max-lines", type=int, default=2, help="Baris maksimal per subtitle (dengan --relayout).")
+    layout.add_argument("--max-duration", type=float, default=7.0,
+                        help="Durasi maksimal satu subtitle dalam detik (dengan --relayout).")
+    layout.add_argument("--max-cps", type=float, default=17.0,
+                        help="Kecepatan baca maksimal, karakter per detik (dengan --relayout).")
+
+    # Kirim job ke server job (lihat 'serve') alih-alih menjalankannya di proses ini.
+    remote = argparse.ArgumentParser(add_help=False)
+    remote.add_argument("--server", nargs="?", const="", metavar="URL",
+                        help="Kirim job ke server job (tanpa URL: $MASUBS_SERVER_URL atau http://127.0.0.1:8765). "
+                             "Path file harus terlihat dari mesin server.")
+    remote.add_argument("--wait", action="store_true", help="Dengan --server: tunggu sampai semua job selesai.")
+
+    parser = argparse.ArgumentParser(prog="masubs", description="MaSubs Studio tanpa GUI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    transcribe = subparsers.add_parser("transcribe", parents=[common, decoding, layout, remote],
+                                       help="Transkripsi audio/video menjadi .srt.")
+    transcribe.add_argument("inputs", nargs="+", help="File, folder, atau pola glob (misal 'rekaman/*.mp4').")
+    transcribe.add_argument("--model", default="base", help="Model Whisper (tiny/base/small/medium/large).")
+    transcribe.add_argument("--jobs", type=int, default=1,
+                            help="Jumlah proses worker (banyak file, atau potongan pada --long).")
+    transcribe.add_argument("--batch-size", type=int, default=0,
+                            help="Dekode jendela 30 detik dari beberapa klip pendek sekaligus (0 = nonaktif).")
+    transcribe.add_argument("--long", action="store_true",
+                            help="Mode audio panjang: potong di bagian hening dan proses paralel.")
+    transcribe.add_argument("--no-cache", action="store_true", help="Abaikan cache hasil transkripsi.")
+    transcribe.add_argument("--backend", choices=list(BACKENDS), default=DEFAULT_BACKEND,
+                            help="Mesin inferensi (faster-whisper = int8, butuh 'pip install faster-whisper').")
+    transcribe.add_argument("--release-model", action="store_true",
+                            help="Bebaskan model dari memori setelah setiap file selesai.")
+    transcribe.add_argument("--no-memory-guard", action="store_true",
+                            help="Jangan cek RAM sebelum memuat model (tanpa int8/turun model/antre otomatis).")
+    transcribe.add_argument("--keep-silence", action="store_true",
+                            help="Kirim seluruh audio ke Whisper, termasuk bagian hening/musik tanpa ucapan.")
+    transcribe.add_argument("--incremental", action="store_true",
+                            help="Setelah file diedit, transkripsi ulang hanya bagian yang berubah (mode satu "
+                                 "proses; versi sebelumnya juga harus ditranskripsi dengan opsi ini).")
+    transcribe.add_argument("--previous", metavar="FILE",
+                            help="Versi lama file jika hasil edit disimpan dengan nama lain (mengaktifkan --incremental).")
+    transcribe.set_defaults(handler=command_transcribe)
+
+    burn = subparsers.add_parser("burn", parents=[common, remote], help="Hardcode subtitle ke video.")
+    burn.add_argument("inputs", nargs="+",
+                      help="Video, folder, atau pola glob. Subtitle dicari dengan nama yang sama (.srt).")
+    burn.add_argument("--subtitle", help="File subtitle (hanya untuk satu video).")
+    burn.add_argument("--output", help="File output (hanya untuk satu video).")
+    burn.add_argument("--preset", default="Cepat", help="Preset encoding (Tercepat/Cepat/Seimbang/Kualitas Tinggi).")
+    burn.add_argument("--encoder", help="Encoder video, misal libx264 atau h264_nvenc.")
+    burn.add_argument("--threads", type=int, default=0, help="Thread per encode (0 = otomatis).")
+    burn.add_argument("--copy-audio", action="store_true", help="Salin audio tanpa encode ulang jika memungkinkan.")
+    burn.add_argument("--jobs", type=int, default=0, help="Jumlah encode paralel (0 = otomatis dari jumlah core).")
+    burn.add_argument("--parallel", action="store_true",
+                      help="Satu video: potong di keyframe dan encode setiap potongan secara paralel.")
+    burn.set_defaults(handler=command_burn)
+
+    pipeline = subparsers.add_parser("pipeline", parents=[common, decoding, layout, remote],
+                                     help="Transkripsi lalu langsung hardcode subtitle ke video.")
+    pipeline.add_argument("inputs", nargs="+", help="Video, folder, atau pola glob.")
+    pipeline.add_argument("--model", default="base", help="Model Whisper (tiny/base/small/medium/large).")
+    pipeline.add_argument("--output", help="File output (hanya untuk satu video).")
+    pipeline.add_argument("--preset", default="Cepat", help="Preset encoding (Tercepat/Cepat/Seimbang/Kualitas Tinggi).")
+    pipeline.add_argument("--encoder", help="Encoder video, misal libx264 atau h264_nvenc.")
+    pipeline.add_argument("--threads", type=int, default=0, help="Thread per encode (0 = otomatis).")
+    pipeline.add_argument("--copy-audio", action="store_true", help="Salin audio tanpa encode ulang jika memungkinkan.")
+    pipeline.add_argument("--part-seconds", type=float, default=300.0,
+                          help="Panjang potongan video yang di-encode selagi transkripsi berjalan.")
+    pipeline.add_argument("--no-cache", action="store_true", help="Abaikan cache hasil transkripsi.")
+    pipeline.add_argument("--backend", choices=list(BACKENDS), default=DEFAULT_BACKEND,
+                          help="Mesin inferensi untuk tahap transkripsi.")
+    pipeline.add_argument("--release-model", action="store_true",
+                          help="Bebaskan model dari memori setelah transkripsi selesai.")
+    pipeline.add_argument("--no-memory-guard", action="store_true",
+                          help="Jangan cek RAM sebelum memuat model.")
+    pipeline.add_argument("--keep-silence", action="store_true",
+                          help="Kirim seluruh audio ke Whisper, termasuk bagian tanpa ucapan.")
+    pipeline.set_defaults(handler=command_pipeline)
+
+    export = subparsers.add_parser("export", parents=[common, layout],
+                                   help="Ubah .srt/.json menjadi format lain (VTT, ASS, JSON) tanpa transkripsi ulang.")
+    export.add_argument("inputs", nargs="+", help="File .srt/.json, atau pola glob.")
+    export.add_argument("--formats", nargs="+", choices=EXPORT_FORMATS, default=["vtt", "ass", "json"],
+                        help="Format yang dibuat di samping file sumber.")
+    export.set_defaults(handler=command_export)
+
+    serve = subparsers.add_parser("serve", parents=[common],
+                                  help="Jalankan server job lokal (antrean persisten + worker dengan model tetap termuat).")
+    serve.add_argument("--host", default="127.0.0.1",
+                       help="Alamat bind. '0.0.0.0' agar editor lain di jaringan bisa mengirim job.")
+    serve.add_argument("--port", type=int, default=8765, help="Port HTTP.")
+    serve.add_argument("--workers", type=int, default=1,
+                       help="Jumlah worker transkripsi/pipeline (masing-masing memuat model sendiri).")
+    serve.add_argument("--burn-workers", type=int, default=1, help="Jumlah worker khusus job burn-in.")
+    serve.add_argument("--preload", metavar="MODEL", help="Muat model ini di setiap worker saat server start.")
+    serve.add_argument("--backend", choices=list(BACKENDS), default=DEFAULT_BACKEND, help="Backend untuk --preload.")
+    serve.add_argument("--db", help="File database antrean (bawaan: jobs.sqlite3 di folder cache).")
+    serve.add_argument("--token", help="Wajibkan 'Authorization: Bearer <token>' (atau $MASUBS_SERVER_TOKEN).")
+    serve.set_defaults(handler=command_serve)
+
+    jobs = subparsers.add_parser("jobs", parents=[common], help="Lihat atau batalkan job di server job.")
+    jobs.add_argument("ids", nargs="*", type=int, help="ID job (tanpa ID: daftar job terbaru).")
+    jobs.add_argument("--server", metavar="URL", help="Alamat server (bawaan: $MASUBS_SERVER_URL atau lokal).")
+    jobs.add_argument("--status", choices=["queued", "running", "done", "failed", "cancelled"],
+                      help="Hanya job dengan status ini.")
+    jobs.add_argument("--limit", type=int, default=50, help="Jumlah job maksimal yang ditampilkan.")
+    jobs.add_argument("--cancel", action="store_true", help="Batalkan job dengan ID yang diberikan.")
+    jobs.set_defaults(handler=command_jobs)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    # Pengaturan juga diteruskan lewat environment agar proses worker (spawn) ikut mencatat.
+    if args.trace:
+        os.environ[TRACE_FILE_ENV] = os.path.abspath(args.trace)
+    if args.profile:
+        os.environ[PROFILE_DIR_ENV] = os.path.abspath(args.profile)
+    configure(trace_file=os.environ.get(TRACE_FILE_ENV), profile_dir=os.environ.get(PROFILE_DIR_ENV))
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    # Proses worker batch dibuat dengan metode 'spawn'; wajib untuk build yang dibekukan.
+    multiprocessing.freeze_support()
+    sys.exit(main())
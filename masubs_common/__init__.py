@@ -0,0 +1,6 @@
+"""
+Paket bersama untuk MaSubs dan MaSubsBurner.
+
+Berisi logika yang tidak bergantung pada GUI dan dipakai oleh kedua aplikasi,
+misalnya persiapan media (probe metadata dan ekstraksi audio PCM) beserta cache-nya.
+"""
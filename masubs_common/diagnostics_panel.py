@@ -0,0 +1,88 @@
+import json
+
+# Modul ini hanya diimpor oleh kedua GUI; CLI dan worker tidak membutuhkan PyQt6.
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTextEdit, QFileDialog, QLabel
+from PyQt6.QtCore import QTimer
+
+from masubs_common.instrumentation import recent_spans, format_span, summarize_spans
+
+# Interval pembaruan panel saat terbuka (milidetik).
+REFRESH_INTERVAL_MS = 1000
+
+
+class DiagnosticsDialog(QDialog):
+    """
+    Panel diagnostik: menampilkan waktu setiap tahap (span) dari job terakhir, ringkasan
+    per tahap, dan tombol untuk menyimpan semua span sebagai file JSONL untuk dianalisis.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostik Performa")
+        self.resize(640, 420)
+
+        layout = QVBoxLayout(self)
+        self.lbl_summary = QLabel()
+        layout.addWidget(self.lbl_summary)
+
+        self.text_spans = QTextEdit()
+        self.text_spans.setReadOnly(True)
+        self.text_spans.setStyleSheet("font-family: monospace;")
+        layout.addWidget(self.text_spans)
+
+        button_row = QHBoxLayout()
+        self.btn_export = QPushButton("Simpan sebagai JSONL...")
+        self.btn_export.clicked.connect(self.export_spans)
+        button_row.addWidget(self.btn_export)
+        self.btn_close = QPushButton("Tutup")
+        self.btn_close.clicked.connect(self.close)
+        button_row.addWidget(self.btn_close)
+        layout.addLayout(button_row)
+
+        # Span dicatat dari thread worker; panel cukup membaca ulang secara berkala di thread GUI.
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(REFRESH_INTERVAL_MS)
+        # span_id terakhir yang sudah ditampilkan. Jumlah record tidak bisa dipakai karena
+        # berhenti bertambah setelah antrean mencapai RECENT_SPAN_LIMIT.
+        self._shown_span = False
+        self.refresh()
+
+    def refresh(self):
+        """Memperbarui isi panel jika ada span baru."""
+        records = recent_spans()
+        last_span = records[-1]["span_id"] if records else None
+        if last_span == self._shown_span:
+            return
+        self._shown_span = last_span
+        if not records:
+            self.lbl_summary.setText("Belum ada data. Jalankan satu proses terlebih dahulu.")
+            self.text_spans.clear()
+            return
+
+        # Span anak selesai lebih dulu dari induknya, jadi urutkan berdasarkan waktu mulai
+        # agar job tampil di atas tahap-tahapnya.
+        last_job = records[-1]["job_id"]
+        job_records = sorted((record for record in records if record["job_id"] == last_job),
+                             key=lambda record: record["started_at"])
+        summary = summarize_spans(records, job_id=last_job)
+        slowest = max((name for name in summary if name != job_records[0]["name"]),
+                      key=lambda name: summary[name]["wall_seconds"], default=None)
+        text = f"Job terakhir: {job_records[0]['name']} — {job_records[0]['wall_seconds']:.2f} detik"
+        if slowest:
+            text += f" (tahap terlama: {slowest}, {summary[slowest]['wall_seconds']:.2f} detik)"
+        self.lbl_summary.setText(text)
+        self.text_spans.setPlainText("\n".join(format_span(record) for record in job_records))
+
+    def export_spans(self):
+        """Menyimpan semua span di memori ke file JSONL."""
+        path, _ = QFileDialog.getSaveFileName(self, "Simpan Diagnostik", "masubs_trace.jsonl",
+                                              "JSON Lines (*.jsonl)")
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as trace_file:
+            for record in recent_spans():
+                trace_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        super().closeEvent(event)
@@ -0,0 +1,330 @@
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import inspect
+import threading
+import functools
+import subprocess
+from collections import deque
+
+# Environment variable untuk mengaktifkan instrumentasi tanpa mengubah kode:
+#   MASUBS_TRACE_FILE   -> setiap span ditulis sebagai satu baris JSON ke file ini.
+#   MASUBS_PROFILE_DIR  -> setiap job (span tingkat atas) diprofil dengan cProfile ke folder ini.
+#   MASUBS_PYSPY        -> jika '1' dan 'py-spy' ada di PATH, job juga direkam sebagai flamegraph
+#                          (Linux/macOS; py-spy dihentikan dengan SIGINT agar menulis hasilnya).
+TRACE_FILE_ENV = "MASUBS_TRACE_FILE"
+PROFILE_DIR_ENV = "MASUBS_PROFILE_DIR"
+PYSPY_ENV = "MASUBS_PYSPY"
+
+# Jumlah span terakhir yang disimpan di memori untuk panel diagnostik.
+RECENT_SPAN_LIMIT = 500
+
+_local = threading.local()
+_lock = threading.Lock()
+_recent = deque(maxlen=RECENT_SPAN_LIMIT)
+_listeners = []
+# Hanya satu cProfile yang boleh aktif per proses; job lain yang berjalan bersamaan tidak diprofil.
+_profiler_active = threading.Event()
+_settings = {
+    "trace_file": os.environ.get(TRACE_FILE_ENV) or None,
+    "profile_dir": os.environ.get(PROFILE_DIR_ENV) or None,
+    "py_spy": os.environ.get(PYSPY_ENV) == "1",
+}
+
+
+def configure(trace_file=None, profile_dir=None, py_spy=None):
+    """
+    Mengubah pengaturan instrumentasi saat program berjalan (misal dari opsi CLI).
+    Argumen yang bernilai None tidak diubah.
+
+    Args:
+        trace_file (str, optional): File JSONL tujuan setiap span.
+        profile_dir (str, optional): Folder hasil cProfile (.prof) per job.
+        py_spy (bool, optional): Merekam job dengan py-spy jika tersedia.
+    """
+    with _lock:
+        if trace_file is not None:
+            _settings["trace_file"] = trace_file
+        if profile_dir is not None:
+            _settings["profile_dir"] = profile_dir
+        if py_spy is not None:
+            _settings["py_spy"] = py_spy
+
+
+def add_listener(callback):
+    """Mendaftarkan fungsi yang dipanggil dengan setiap record span yang selesai (dari thread mana pun)."""
+    with _lock:
+        _listeners.append(callback)
+
+
+def remove_listener(callback):
+    with _lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
+
+
+def recent_spans() -> list:
+    """Mengembalikan salinan span terakhir yang sudah selesai, dari yang paling lama."""
+    with _lock:
+        return list(_recent)
+
+
+def _memory_usage():
+    """Mengembalikan (rss_mb, peak_rss_mb, child_cpu_seconds); nilai yang tidak tersedia bernilai None."""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        # ru_maxrss bernilai KB di Linux tetapi byte di macOS.
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        rss = None
+        try:
+            with open("/proc/self/statm", "r") as statm:
+                rss = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        except (OSError, ValueError, IndexError, AttributeError):
+            pass
+        return rss, own.ru_maxrss / scale, children.ru_utime + children.ru_stime
+    try:
+        import psutil
+    except ImportError:
+        return None, None, None
+    memory = psutil.Process().memory_info()
+    # 'peak_wset' hanya ada di Windows.
+    return memory.rss / (1024 * 1024), getattr(memory, "peak_wset", memory.rss) / (1024 * 1024), None
+
+
+def _emit(record: dict):
+    with _lock:
+        _recent.append(record)
+        listeners = list(_listeners)
+        trace_file = _settings["trace_file"]
+        if trace_file:
+            try:
+                with open(trace_file, "a", encoding="utf-8") as trace:
+                    trace.write(json.dumps(record, ensure_ascii=False) + "\n")
+            except OSError:
+                # Instrumentasi tidak boleh menggagalkan job.
+                pass
+    for listener in listeners:
+        try:
+            listener(record)
+        except Exception:
+            pass
+
+
+def _start_profilers(name: str, span_id: str):
+    """Memulai cProfile dan/atau py-spy untuk satu job sesuai pengaturan."""
+    profile_dir = _settings["profile_dir"]
+    profiler = None
+    py_spy = None
+    if profile_dir and not _profiler_active.is_set():
+        import cProfile
+        os.makedirs(profile_dir, exist_ok=True)
+        _profiler_active.set()
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Profiler lain (misal debugger) sudah aktif.
+            _profiler_active.clear()
+            profiler = None
+    if _settings["py_spy"] and sys.platform != "win32" and shutil.which("py-spy"):
+        # py-spy merekam semua thread dari luar proses, jadi thread torch/ffmpeg watcher ikut terlihat.
+        output_dir = profile_dir or os.getcwd()
+        os.makedirs(output_dir, exist_ok=True)
+        output = os.path.join(output_dir, f"{name}_{span_id}.svg")
+        try:
+            py_spy = subprocess.Popen(["py-spy", "record", "--pid", str(os.getpid()), "--threads",
+                                       "-o", output], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            py_spy = None
+    return profiler, py_spy
+
+
+def _stop_profilers(name: str, span_id: str, profiler, py_spy) -> dict:
+    artifacts = {}
+    if profiler is not None:
+        profiler.disable()
+        path = os.path.join(_settings["profile_dir"], f"{name}_{span_id}.prof")
+        profiler.dump_stats(path)
+        _profiler_active.clear()
+        artifacts["cprofile"] = path
+    if py_spy is not None:
+        # SIGINT membuat py-spy berhenti merekam dan menulis flamegraph-nya.
+        try:
+            import signal
+            py_spy.send_signal(signal.SIGINT)
+            py_spy.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            py_spy.kill()
+        artifacts["py_spy"] = py_spy.args[-1]
+    return artifacts
+
+
+class span:
+    """
+    Mengukur satu tahap pekerjaan (span): waktu nyata, waktu CPU proses, waktu CPU proses anak
+    (ffmpeg), RSS, dan puncak RSS. Span bisa bersarang; span tanpa induk dianggap sebagai job
+    dan bisa diprofil dengan cProfile/py-spy. Catatan: waktu CPU diukur untuk seluruh proses,
+    jadi span yang berjalan bersamaan di thread lain ikut terhitung.
+
+    Contoh:
+        with span("model_load", model=model_name) as stage:
+            model = load(...)
+            stage.set(cached=False)
+
+    Args:
+        name (str): Nama tahap, misal 'audio_decode', 'inference', 'encode'.
+        **attrs: Atribut tambahan yang ikut dicatat (harus bisa di-serialize ke JSON).
+    """
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        """Menambah atribut setelah span dimulai, misal jumlah segmen atau status cache."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1] if stack else None
+        self.span_id = uuid.uuid4().hex[:12]
+        self.job_id = self.parent.job_id if self.parent else self.span_id
+        stack.append(self)
+        self._profilers = _start_profilers(self.name, self.span_id) if self.parent is None else (None, None)
+        _, _, self._child_cpu_start = _memory_usage()
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        self._started_at = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        rss, peak_rss, child_cpu = _memory_usage()
+        _local.stack.pop()
+        artifacts = _stop_profilers(self.name, self.span_id, *self._profilers) if self.parent is None else {}
+        record = {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "job_id": self.job_id,
+            "thread": threading.current_thread().name,
+            "started_at": self._started_at,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "child_cpu_seconds": (child_cpu - self._child_cpu_start) if child_cpu is not None else None,
+            "rss_mb": rss,
+            "peak_rss_mb": peak_rss,
+            "status": "error" if exc_type else "ok",
+            "attrs": self.attrs,
+        }
+        if exc_type:
+            record["error"] = str(exc_value)
+        if artifacts:
+            record["artifacts"] = artifacts
+        _emit(record)
+        return False
+
+
+def traced(name: str, *arg_names):
+    """
+    Decorator yang membungkus seluruh fungsi dalam satu span.
+
+    Args:
+        name (str): Nama span.
+        *arg_names: Nama argumen fungsi yang nilainya ikut dicatat sebagai atribut.
+
+    Contoh:
+        @traced("transcribe", "file_path", "model_name")
+        def transcribe_audio(file_path, model_name, ...): ...
+    """
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            with span(name, **{key: bound[key] for key in arg_names if key in bound}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span():
+    """Mengembalikan span yang sedang aktif di thread ini, atau None."""
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+
+def bind_span(function):
+    """
+    Mengikat fungsi ke span yang aktif saat ini, untuk dijalankan di thread lain (misal lewat
+    ThreadPoolExecutor). Span yang dibuka di dalam fungsi tersebut menjadi anak dari span ini,
+    bukan job baru.
+
+    Args:
+        function (callable): Fungsi yang akan dijalankan di thread lain.
+
+    Returns:
+        callable: Fungsi pembungkus.
+    """
+    parent = current_span()
+    if parent is None:
+        return function
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(parent)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stack.pop()
+    return wrapper
+
+
+def summarize_spans(records, job_id=None) -> dict:
+    """
+    Menjumlahkan waktu per nama tahap, misal untuk laporan CLI.
+
+    Args:
+        records (list): Record span dari recent_spans() atau file JSONL.
+        job_id (str, optional): Hanya menghitung span milik job ini.
+
+    Returns:
+        dict: {nama_tahap: {'count', 'wall_seconds', 'cpu_seconds', 'peak_rss_mb'}}.
+    """
+    summary = {}
+    for record in records:
+        if job_id and record["job_id"] != job_id:
+            continue
+        item = summary.setdefault(record["name"], {"count": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                                                   "peak_rss_mb": None})
+        item["count"] += 1
+        item["wall_seconds"] += record["wall_seconds"]
+        item["cpu_seconds"] += record["cpu_seconds"]
+        if record["peak_rss_mb"] is not None:
+            item["peak_rss_mb"] = max(item["peak_rss_mb"] or 0.0, record["peak_rss_mb"])
+    return summary
+
+
+def format_span(record: dict) -> str:
+    """Membentuk satu baris teks dari record span untuk panel diagnostik atau log."""
+    depth = "  " if record["parent_id"] else ""
+    peak = f"{record['peak_rss_mb']:.0f} MB" if record["peak_rss_mb"] is not None else "-"
+    child = (f", ffmpeg CPU {record['child_cpu_seconds']:.2f} s"
+             if record.get("child_cpu_seconds") else "")
+    status = "" if record["status"] == "ok" else f" [GAGAL: {record.get('error', '')}]"
+    return (f"{depth}{record['name']}: {record['wall_seconds']:.2f} s "
+            f"(CPU {record['cpu_seconds']:.2f} s{child}, puncak {peak}){status}")
@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict
+
+from masubs_common.job_store import FINAL_STATUSES
+
+# Alamat server job bawaan. Bisa diganti dengan environment variable agar GUI dan CLI
+# di laptop editor mengirim job ke mesin bersama di jaringan.
+SERVER_URL_ENV = "MASUBS_SERVER_URL"
+SERVER_TOKEN_ENV = "MASUBS_SERVER_TOKEN"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_SERVER_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+
+
+class JobServerError(RuntimeError):
+    """Server job tidak bisa dihubungi atau menolak request."""
+
+
+def server_url() -> str:
+    return os.environ.get(SERVER_URL_ENV) or DEFAULT_SERVER_URL
+
+
+def job_params(options=None, layout=None, **params) -> dict:
+    """
+    Menyusun parameter job yang bisa dikirim sebagai JSON: path dijadikan absolut, dan
+    TranscribeOptions/LayoutRules diubah menjadi dict (disusun ulang oleh worker di server).
+    """
+    for key in ("file_path", "subtitle_path", "output_path", "previous_path"):
+        if params.get(key):
+            params[key] = os.path.abspath(params[key])
+    if options is not None:
+        params["options"] = asdict(options)
+    if layout is not None:
+        params["layout"] = asdict(layout)
+    if "export_formats" in params:
+        params["export_formats"] = list(params["export_formats"])
+    return params
+
+
+class JobClient:
+    """
+    Klien HTTP untuk server job MaSubs (lihat MaSubs/job_server.py). Hanya memakai pustaka
+    standar, jadi bisa dipakai dari GUI, CLI, maupun skrip lain tanpa dependensi tambahan.
+
+    Path file di parameter job adalah path di mesin server; untuk server bersama, simpan media
+    di folder jaringan yang terlihat dengan path yang sama dari server.
+    """
+    def __init__(self, url: str = None, token: str = None, timeout: float = 10.0):
+        self.url = (url or server_url()).rstrip("/")
+        self.token = token if token is not None else os.environ.get(SERVER_TOKEN_ENV)
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: dict = None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method)
+        request.add_header("Content-Type", "application/json")
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get("error", str(e))
+            except ValueError:
+                message = str(e)
+            raise JobServerError(f"Server menolak request ({e.code}): {message}") from None
+        except (urllib.error.URLError, OSError) as e:
+            raise JobServerError(f"Server job di {self.url} tidak bisa dihubungi: {e}") from None
+
+    def status(self) -> dict:
+        """Ringkasan server: jumlah job per status dan worker yang aktif."""
+        return self._request("GET", "/status")
+
+    def is_running(self) -> bool:
+        try:
+            self.status()
+            return True
+        except JobServerError:
+            return False
+
+    def submit(self, kind: str, params: dict) -> int:
+        """
+        Mengirim job ke antrean server.
+
+        Args:
+            kind (str): 'transcribe', 'pipeline', atau 'burn'.
+            params (dict): Parameter job; path file harus absolut dan terlihat oleh server.
+
+        Returns:
+            int: ID job.
+        """
+        return self._request("POST", "/jobs", {"kind": kind, "params": params})["id"]
+
+    def job(self, job_id: int) -> dict:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def jobs(self, status: str = None, limit: int = 100) -> list:
+        query = f"?limit={int(limit)}" + (f"&status={status}" if status else "")
+        return self._request("GET", "/jobs" + query)["jobs"]
+
+    def cancel(self, job_id: int) -> dict:
+        return self._request("POST", f"/jobs/{job_id}/cancel", {})
+
+    def wait(self, job_id: int, on_progress=None, poll_seconds: float = 1.0) -> dict:
+        """
+        Menunggu sampai job selesai, gagal, atau dibatalkan.
+
+        Args:
+            job_id (int): ID job.
+            on_progress (callable, optional): Dipanggil dengan dict job setiap kali progresnya berubah.
+            poll_seconds (float): Jeda antar-polling.
+
+        Returns:
+            dict: Job dalam status akhirnya.
+        """
+        last = None
+        while True:
+            job = self.job(job_id)
+            state = (job["status"], job["progress"], job["message"])
+            if on_progress and state != last:
+                on_progress(job)
+                last = state
+            if job["status"] in FINAL_STATUSES:
+                return job
+            time.sleep(poll_seconds)
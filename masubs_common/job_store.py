@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from masubs_common.media import get_cache_dir
+
+# Status job. 'running' yang tersisa setelah server mati dikembalikan ke 'queued' saat start.
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+FINAL_STATUSES = ("done", "failed", "cancelled")
+
+# Job yang sudah terputus sebanyak ini (server mati/crash di tengah job) dianggap gagal,
+# agar file yang selalu membuat worker crash tidak diulang tanpa henti.
+MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    model TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    progress INTEGER NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS workers (
+    name TEXT PRIMARY KEY,
+    pid INTEGER,
+    model TEXT,
+    job_id INTEGER,
+    heartbeat REAL
+);
+"""
+
+
+def default_db_path() -> str:
+    """Lokasi database antrean bawaan, di dalam folder cache bersama."""
+    return os.path.join(get_cache_dir(), "jobs.sqlite3")
+
+
+class JobStore:
+    """
+    Antrean job persisten berbasis SQLite. Satu file database dipakai bersama oleh proses
+    server (HTTP) dan semua proses worker; setiap proses membuka koneksinya sendiri.
+
+    Job diambil secara atomik dengan claim(), jadi dua worker tidak pernah mendapat job yang
+    sama. Karena antrean ada di disk, job yang belum selesai tetap ada setelah server di-restart.
+    """
+    def __init__(self, path: str = None):
+        self.path = path or default_db_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Server HTTP melayani setiap request di thread sendiri; satu koneksi dibagi dengan lock.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        # WAL: pembaca (endpoint status) tidak terblokir oleh worker yang sedang menulis progres.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def submit(self, kind: str, params: dict) -> int:
+        """
+        Menambahkan job ke antrean.
+
+        Args:
+            kind (str): Jenis job ('transcribe', 'pipeline', 'burn').
+            params (dict): Parameter job (harus bisa di-serialisasi ke JSON).
+
+        Returns:
+            int: ID job.
+        """
+        cursor = self._execute(
+            "INSERT INTO jobs (kind, params, model, created) VALUES (?, ?, ?, ?)",
+            (kind, json.dumps(params, ensure_ascii=False), params.get("model"), time.time()))
+        return cursor.lastrowid
+
+    def claim(self, worker: str, kinds=None, preferred_model: str = None) -> dict:
+        """
+        Mengambil job 'queued' tertua dan menandainya 'running' secara atomik.
+
+        Args:
+            worker (str): Nama worker yang mengambil job.
+            kinds (iterable, optional): Hanya ambil job dengan jenis ini.
+            preferred_model (str, optional): Job untuk model yang sudah dimuat worker ini
+                didahulukan, agar model tidak dimuat ulang di worker lain.
+
+        Returns:
+            dict | None: Job yang diambil, atau None jika antrean kosong.
+        """
+        where = "status = 'queued'"
+        params = []
+        if kinds:
+            kinds = list(kinds)
+            where += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        with self._lock:
+            # BEGIN IMMEDIATE mengunci database untuk penulisan sebelum SELECT, jadi worker
+            # di proses lain tidak bisa mengambil baris yang sama di antara SELECT dan UPDATE.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT id FROM jobs WHERE {where} ORDER BY (model IS ? AND model IS NOT NULL) DESC, id LIMIT 1",
+                    params + [preferred_model]).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, started = ?, attempts = attempts + 1, "
+                    "progress = 0, message = '' WHERE id = ?", (worker, time.time(), row["id"]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._to_dict(self._conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+    def update_progress(self, job_id: int, percent: int, message: str):
+        self._execute("UPDATE jobs SET progress = ?, message = ? WHERE id = ? AND status = 'running'",
+                      (int(percent), message, job_id))
+
+    def finish(self, job_id: int, result: dict):
+        self._execute("UPDATE jobs SET status = 'done', progress = 100, result = ?, finished = ? WHERE id = ?",
+                      (json.dumps(result, ensure_ascii=False), time.time(), job_id))
+
+    def fail(self, job_id: int, error: str, cancelled: bool = False):
+        self._execute("UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ?",
+                      ("cancelled" if cancelled else "failed", error, time.time(), job_id))
+
+    def cancel(self, job_id: int) -> dict:
+        """
+        Membatalkan job. Job yang masih antre langsung dibatalkan; job yang sedang berjalan
+        ditandai, lalu worker-nya berhenti pada laporan progres berikutnya.
+
+        Returns:
+            dict | None: Job setelah diperbarui, atau None jika ID tidak ada.
+        """
+        self._execute("UPDATE jobs SET status = 'cancelled', finished = ? WHERE id = ? AND status = 'queued'",
+                      (time.time(), job_id))
+        self._execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+        return self.get(job_id)
+
+    def cancel_requested(self, job_id: int) -> bool:
+        row = self._execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def get(self, job_id: int) -> dict:
+        return self._to_dict(self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list(self, status: str = None, limit: int = 100) -> list:
+        """Job terbaru lebih dulu, opsional hanya dengan status tertentu."""
+        if status:
+            rows = self._execute("SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit))
+        else:
+            rows = self._execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+        return [self._to_dict(row) for row in rows.fetchall()]
+
+    def counts(self) -> dict:
+        """Jumlah job per status."""
+        counts = {status: 0 for status in JOB_STATUSES}
+        for row in self._execute("SELECT status, COUNT(*) AS total FROM jobs GROUP BY status").fetchall():
+            counts[row["status"]] = row["total"]
+        return counts
+
+    def requeue_interrupted(self, worker: str = None) -> int:
+        """
+        Mengembalikan job 'running' yang tertinggal ke antrean. Dipanggil saat server start
+        (server mati di tengah job) atau saat satu proses worker berhenti mendadak. Hasil tahap
+        yang sudah selesai (audio PCM, deteksi bahasa, hasil transkripsi) ada di cache, jadi
+        job yang diulang melanjutkan dari sana.
+
+        Args:
+            worker (str, optional): Hanya job milik worker ini. Defaults to semua job 'running'.
+
+        Returns:
+            int: Jumlah job yang dikembalikan ke antrean.
+        """
+        where, params = ("status = 'running'", ()) if worker is None else \
+            ("status = 'running' AND worker = ?", (worker,))
+        self._execute(f"UPDATE jobs SET status = 'failed', finished = ?, "
+                      f"error = 'Job terputus terlalu sering (worker berhenti di tengah proses).' "
+                      f"WHERE {where} AND attempts >= ?", (time.time(), *params, MAX_ATTEMPTS))
+        cursor = self._execute(f"UPDATE jobs SET status = 'queued', worker = NULL, progress = 0, "
+                               f"message = 'Dilanjutkan setelah worker berhenti' WHERE {where}", params)
+        if worker is None:
+            self._execute("DELETE FROM workers")
+        else:
+            self._execute("DELETE FROM workers WHERE name = ?", (worker,))
+        return cursor.rowcount
+
+    def heartbeat(self, worker: str, model: str = None, job_id: int = None):
+        """Mencatat bahwa worker masih hidup, model yang dimuat, dan job yang sedang dikerjakan."""
+        self._execute("INSERT OR REPLACE INTO workers (name, pid, model, job_id, heartbeat) VALUES (?, ?, ?, ?, ?)",
+                      (worker, os.getpid(), model, job_id, time.time()))
+
+    def workers(self) -> list:
+        return [dict(row) for row in self._execute("SELECT * FROM workers ORDER BY name").fetchall()]
@@ -0,0 +1,343 @@
+import os
+import sys
+import json
+import hashlib
+import tempfile
+import subprocess
+import threading
+
+# Sample rate dan format PCM yang dipakai Whisper: mono, 16 kHz, float32 little-endian.
+PCM_SAMPLE_RATE = 16000
+PCM_DTYPE = "<f4"
+
+# Batas ukuran total cache PCM (MB). Satu jam audio 16 kHz float32 sekitar 230 MB.
+DEFAULT_PCM_CACHE_LIMIT_MB = 4096
+
+# Cache metadata di dalam proses, di depan cache JSON di disk.
+_probe_memo = {}
+_probe_lock = threading.Lock()
+
+
+def get_cache_dir() -> str:
+    """
+    Menentukan folder cache bersama MaSubs Studio. Bisa diganti dengan environment
+    variable 'MASUBS_CACHE_DIR'.
+
+    Returns:
+        str: Path folder cache (belum tentu sudah ada).
+    """
+    if os.environ.get("MASUBS_CACHE_DIR"):
+        return os.environ["MASUBS_CACHE_DIR"]
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "MaSubs", "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "masubs")
+
+
+def find_executable(name: str) -> str:
+    """
+    Menentukan path executable ffmpeg/ffprobe. Saat berjalan sebagai paket PyInstaller,
+    executable yang dibundel di 'sys._MEIPASS' dipakai; selain itu diasumsikan ada di PATH.
+
+    Args:
+        name (str): Nama executable tanpa ekstensi, misal 'ffmpeg' atau 'ffprobe'.
+
+    Returns:
+        str: Path absolut ke executable yang dibundel, atau nama executable itu sendiri.
+    """
+    if getattr(sys, 'frozen', False):
+        suffix = ".exe" if sys.platform == "win32" else ""
+        return os.path.join(sys._MEIPASS, name + suffix)
+    return name
+
+
+def source_key(path: str) -> str:
+    """
+    Membentuk kunci identitas file sumber dari path absolut, ukuran, dan waktu modifikasinya.
+    File yang diubah atau ditimpa otomatis mendapat kunci baru.
+
+    Args:
+        path (str): Path file media.
+
+    Returns:
+        str: Kunci heksadesimal.
+    """
+    stat = os.stat(path)
+    identity = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.blake2b(identity.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _metadata_path(key: str) -> str:
+    return os.path.join(get_cache_dir(), "media", f"{key}.json")
+
+
+def _read_json(path: str):
+    try:
+        with open(path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json_atomic(path: str, data: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as json_file:
+        json.dump(data, json_file)
+    os.replace(temp_path, path)
+
+
+def _summarize_probe(raw: dict) -> dict:
+    """Merangkum output JSON ffprobe menjadi metadata yang dipakai kedua aplikasi."""
+    media_format = raw.get("format", {})
+    streams = raw.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"
+                  and not s.get("disposition", {}).get("attached_pic")), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+    def parse_rate(rate):
+        try:
+            numerator, denominator = rate.split("/")
+            return float(numerator) / float(denominator) if float(denominator) else None
+        except (AttributeError, ValueError):
+            return None
+
+    duration = media_format.get("duration")
+    info = {
+        "duration": float(duration) if duration else None,
+        "format_name": media_format.get("format_name"),
+        "bit_rate": int(media_format["bit_rate"]) if media_format.get("bit_rate") else None,
+        "video": None,
+        "audio": None,
+    }
+    if video:
+        info["video"] = {
+            "codec": video.get("codec_name"),
+            "width": video.get("width"),
+            "height": video.get("height"),
+            "fps": parse_rate(video.get("avg_frame_rate")) or parse_rate(video.get("r_frame_rate")),
+            "pix_fmt": video.get("pix_fmt"),
+        }
+    if audio:
+        info["audio"] = {
+            "codec": audio.get("codec_name"),
+            "channels": audio.get("channels"),
+            "sample_rate": int(audio["sample_rate"]) if audio.get("sample_rate") else None,
+        }
+    return info
+
+
+def probe_media(path: str) -> dict:
+    """
+    Membaca metadata media (durasi, codec video/audio, resolusi, fps) dengan ffprobe.
+    Hasilnya disimpan di cache bersama sehingga MaSubs dan MaSubsBurner tidak
+    menjalankan ffprobe berulang kali untuk file yang sama.
+
+    Args:
+        path (str): Path file media.
+
+    Returns:
+        dict: Metadata dengan kunci 'duration', 'format_name', 'bit_rate', 'video', dan 'audio'
+              ('video'/'audio' bernilai None jika stream tersebut tidak ada).
+
+    Raises:
+        RuntimeError: Jika ffprobe gagal membaca file.
+    """
+    key = source_key(path)
+    with _probe_lock:
+        if key in _probe_memo:
+            return _probe_memo[key]
+
+    metadata_path = _metadata_path(key)
+    cached = _read_json(metadata_path) or {}
+    if "probe" not in cached:
+        command = [find_executable("ffprobe"), "-v", "error", "-print_format", "json",
+                   "-show_format", "-show_streams", path]
+        try:
+            completed = subprocess.run(command, capture_output=True, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, "stderr", b"") or b""
+            raise RuntimeError(f"ffprobe gagal membaca '{path}': {stderr.decode(errors='replace') or e}")
+        cached["probe"] = _summarize_probe(json.loads(completed.stdout))
+        _write_json_atomic(metadata_path, cached)
+
+    with _probe_lock:
+        _probe_memo[key] = cached["probe"]
+    return cached["probe"]
+
+
+def probe_keyframes(path: str) -> list:
+    """
+    Membaca waktu (detik) setiap keyframe pada stream video pertama. Hanya header paket
+    yang dibaca (tanpa dekode), dan hasilnya disimpan di cache metadata yang sama dengan
+    probe_media().
+
+    Args:
+        path (str): Path file video.
+
+    Returns:
+        list: Waktu keyframe dalam detik, terurut naik.
+
+    Raises:
+        RuntimeError: Jika ffprobe gagal membaca file.
+    """
+    metadata_path = _metadata_path(source_key(path))
+    cached = _read_json(metadata_path) or {}
+    if "keyframes" not in cached:
+        command = [find_executable("ffprobe"), "-v", "error", "-select_streams", "v:0",
+                   "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path]
+        try:
+            completed = subprocess.run(command, capture_output=True, check=True, text=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise RuntimeError(f"ffprobe gagal membaca keyframe '{path}': {getattr(e, 'stderr', '') or e}")
+        keyframes = set()
+        for line in completed.stdout.splitlines():
+            # Setiap baris berbentuk '<pts_time>,<flags>', misal '12.012000,K__'.
+            pts_time, _, flags = line.partition(",")
+            if "K" in flags:
+                try:
+                    keyframes.add(float(pts_time))
+                except ValueError:
+                    continue
+        cached["keyframes"] = sorted(keyframes)
+        _write_json_atomic(metadata_path, cached)
+    return cached["keyframes"]
+
+
+def pcm_cache_path(path: str) -> str:
+    """Mengembalikan path file cache PCM untuk file media sumber (belum tentu sudah ada)."""
+    return os.path.join(get_cache_dir(), "pcm", f"{source_key(path)}.f32")
+
+
+def extract_pcm(path: str) -> str:
+    """
+    Mendekode audio file media sekali menjadi PCM float32 mono 16 kHz di folder cache.
+    Pemanggilan berikutnya untuk file yang sama langsung memakai file cache tersebut.
+
+    Args:
+        path (str): Path file audio atau video.
+
+    Returns:
+        str: Path file PCM mentah (float32 little-endian, tanpa header).
+
+    Raises:
+        RuntimeError: Jika ffmpeg gagal mendekode audio.
+    """
+    pcm_path = pcm_cache_path(path)
+    if os.path.exists(pcm_path):
+        # Perbarui mtime agar eviksi LRU tidak menghapus file yang masih sering dipakai.
+        os.utime(pcm_path, None)
+        return pcm_path
+
+    os.makedirs(os.path.dirname(pcm_path), exist_ok=True)
+    # Nama sementara unik per pemanggilan: beberapa thread dalam satu proses (batch, server job)
+    # bisa mengekstrak file yang sama bersamaan. Yang selesai terakhir menimpa hasil yang identik.
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(pcm_path) + ".", suffix=".tmp",
+                                     dir=os.path.dirname(pcm_path))
+    os.close(fd)
+    command = [
+        find_executable("ffmpeg"), "-nostdin", "-v", "error", "-threads", "0",
+        "-i", path, "-vn", "-f", "f32le", "-ac", "1", "-ar", str(PCM_SAMPLE_RATE), "-y", temp_path,
+    ]
+    try:
+        subprocess.run(command, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        stderr = getattr(e, "stderr", b"") or b""
+        raise RuntimeError(f"Gagal mendekode audio: {stderr.decode(errors='replace') or e}")
+    os.replace(temp_path, pcm_path)
+    enforce_pcm_cache_limit(keep=pcm_path)
+    return pcm_path
+
+
+def load_pcm(pcm_path: str):
+    """
+    Memetakan file PCM ke memori (memory-map) sebagai array NumPy tanpa membacanya sekaligus.
+    Mode 'c' (copy-on-write) membuat array bisa ditulis oleh pustaka lain (misal torch)
+    tanpa pernah mengubah file di disk.
+
+    Args:
+        pcm_path (str): Path dari extract_pcm().
+
+    Returns:
+        numpy.memmap: Sampel audio mono float32 16 kHz.
+    """
+    import numpy as np
+    if os.path.getsize(pcm_path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(pcm_path, dtype=PCM_DTYPE, mode="c")
+
+
+def prepare_audio(path: str):
+    """
+    Tahap persiapan media untuk transkripsi: mengekstrak PCM (sekali) lalu memetakannya ke memori.
+
+    Args:
+        path (str): Path file audio atau video.
+
+    Returns:
+        numpy.memmap: Sampel audio mono float32 16 kHz.
+    """
+    return load_pcm(extract_pcm(path))
+
+
+def pcm_fingerprint(path: str) -> str:
+    """
+    Hash konten PCM hasil dekode dari file media. Hash disimpan di metadata cache sehingga
+    hanya dihitung sekali per file sumber.
+
+    Args:
+        path (str): Path file audio atau video.
+
+    Returns:
+        str: Hash heksadesimal (BLAKE2b, 128 bit) dari PCM.
+    """
+    key = source_key(path)
+    metadata_path = _metadata_path(key)
+    cached = _read_json(metadata_path) or {}
+    if "pcm_hash" not in cached:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(extract_pcm(path), "rb") as pcm_file:
+            for block in iter(lambda: pcm_file.read(1 << 22), b""):
+                digest.update(block)
+        cached["pcm_hash"] = digest.hexdigest()
+        _write_json_atomic(metadata_path, cached)
+    return cached["pcm_hash"]
+
+
+def enforce_pcm_cache_limit(max_size_mb: float = DEFAULT_PCM_CACHE_LIMIT_MB, keep: str = None):
+    """
+    Menghapus file PCM yang paling lama tidak dipakai sampai ukuran total di bawah batas.
+    File 'keep' (yang baru diekstrak) tidak pernah dihapus, meskipun ukurannya sendiri melebihi batas.
+    """
+    pcm_dir = os.path.join(get_cache_dir(), "pcm")
+    if not os.path.isdir(pcm_dir):
+        return
+    entries = []
+    for name in os.listdir(pcm_dir):
+        if not name.endswith(".f32"):
+            continue
+        full_path = os.path.join(pcm_dir, name)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, full_path))
+
+    limit_bytes = max_size_mb * 1024 * 1024
+    total_bytes = sum(size for _, size, _ in entries)
+    keep = os.path.abspath(keep) if keep else None
+    for _, size, full_path in sorted(entries):
+        if total_bytes <= limit_bytes:
+            break
+        # Ukuran 'keep' tetap dihitung, jadi file lain dihapus sampai totalnya muat (jika bisa).
+        if os.path.abspath(full_path) == keep:
+            continue
+        try:
+            os.remove(full_path)
+            total_bytes -= size
+        except OSError:
+            # Di Windows file yang sedang di-memory-map tidak bisa dihapus; lewati saja.
+            pass
@@ -0,0 +1,163 @@
+import re
+import textwrap
+from dataclasses import dataclass
+
+# Kata yang diakhiri tanda baca ini dianggap akhir kalimat: titik potong yang disukai.
+_SENTENCE_END = re.compile(r"[.?!…。？！]['\"”’)]*$")
+# Satu kata beserta spasi di depannya, seperti token kata dari Whisper (' halo').
+_WORD_PATTERN = re.compile(r"\s*\S+")
+
+
+@dataclass(frozen=True)
+class LayoutRules:
+    """
+    Aturan tata letak subtitle untuk resegment(). Bawaannya mengikuti pedoman umum
+    subtitle yang mudah dibaca (dua baris, ~42 karakter per baris, ~17 karakter per detik).
+
+    Attributes:
+        max_chars_per_line (int): Panjang maksimal satu baris.
+        max_lines (int): Jumlah baris maksimal per subtitle.
+        max_duration (float): Lama maksimal satu subtitle tampil (detik).
+        min_duration (float): Lama minimal satu subtitle tampil (detik).
+        max_chars_per_second (float): Kecepatan baca maksimal. Subtitle yang terlalu cepat
+            diperpanjang sampai subtitle berikutnya dimulai.
+        min_gap (float): Jeda minimal antara dua subtitle saat diperpanjang (detik).
+    """
+    max_chars_per_line: int = 42
+    max_lines: int = 2
+    max_duration: float = 7.0
+    min_duration: float = 1.0
+    max_chars_per_second: float = 17.0
+    min_gap: float = 0.08
+
+
+def shift_words(words, offset: float) -> list:
+    """Menggeser waktu daftar kata (dict 'start', 'end', 'word') sebesar 'offset' detik."""
+    return [{**word, "start": word["start"] + offset, "end": word["end"] + offset} for word in words]
+
+
+def segment_words(segment: dict) -> list:
+    """
+    Mengambil timestamp per kata dari segmen. Jika transkripsi dibuat tanpa timestamp per kata,
+    durasi segmen dibagi ke setiap kata sebanding dengan panjang hurufnya (perkiraan).
+
+    Args:
+        segment (dict): Segmen dengan 'start', 'end', 'text', dan opsional 'words'.
+
+    Returns:
+        list: Daftar dict kata dengan kunci 'start', 'end', dan 'word'.
+    """
+    if segment.get("words"):
+        return segment["words"]
+    tokens = _WORD_PATTERN.findall(segment["text"])
+    if not tokens:
+        return []
+    weights = [max(1, len(token.strip())) for token in tokens]
+    duration = max(segment["end"] - segment["start"], 0.0)
+    total = sum(weights)
+    words = []
+    position = segment["start"]
+    for token, weight in zip(tokens, weights):
+        end = position + duration * weight / total
+        words.append({"start": position, "end": end, "word": token})
+        position = end
+    return words
+
+
+def wrap_lines(text: str, max_chars_per_line: int, max_lines: int = 2) -> str:
+    """
+    Memecah teks menjadi beberapa baris. Untuk dua baris, titik potong dipilih agar panjang
+    kedua baris seimbang (lebih mudah dibaca daripada baris pertama penuh).
+
+    Args:
+        text (str): Teks satu subtitle.
+        max_chars_per_line (int): Panjang maksimal satu baris.
+        max_lines (int): Jumlah baris maksimal.
+
+    Returns:
+        str: Teks dengan pemisah baris '\\n'.
+    """
+    text = " ".join(text.split())
+    if len(text) <= max_chars_per_line or max_lines < 2:
+        return text
+    if max_lines == 2:
+        spaces = [index for index, char in enumerate(text) if char == " "]
+        if spaces:
+            split = min(spaces, key=lambda index: max(index, len(text) - index - 1))
+            return text[:split] + "\n" + text[split + 1:]
+    lines = textwrap.wrap(text, max_chars_per_line)
+    # Sisa baris digabung ke baris terakhir daripada membuat subtitle lebih tinggi dari batas.
+    return "\n".join(lines[:max_lines - 1] + [" ".join(lines[max_lines - 1:])])
+
+
+def _fits(text: str, rules: LayoutRules) -> bool:
+    # Panjang total saja tidak cukup: titik potong baris hanya bisa di spasi, jadi teks
+    # dianggap muat jika setiap baris hasil wrap_lines() tidak melebihi batas.
+    lines = wrap_lines(text, rules.max_chars_per_line, rules.max_lines).split("\n")
+    return len(lines) <= rules.max_lines and all(len(line) <= rules.max_chars_per_line for line in lines)
+
+
+def _make_cue(words, rules: LayoutRules) -> dict:
+    text = "".join(word["word"] for word in words).strip()
+    return {"start": words[0]["start"], "end": max(words[-1]["end"], words[0]["start"]),
+            "text": wrap_lines(text, rules.max_chars_per_line, rules.max_lines), "words": list(words)}
+
+
+def extend_for_reading(cue: dict, rules: LayoutRules, limit: float):
+    """
+    Memperpanjang akhir subtitle yang terlalu singkat untuk panjang teksnya (kecepatan baca),
+    paling jauh sampai 'limit' (awal subtitle berikutnya dikurangi jeda minimum).
+    """
+    characters = len(cue["text"].replace("\n", ""))
+    needed = max(characters / rules.max_chars_per_second, rules.min_duration)
+    if cue["end"] - cue["start"] < needed:
+        cue["end"] = max(cue["end"], min(cue["start"] + needed, limit))
+
+
+def resegment(segments, rules: LayoutRules = None, extend_last: bool = True) -> list:
+    """
+    Menyusun ulang segmen mentah Whisper menjadi subtitle yang mudah dibaca: segmen yang
+    terlalu panjang dipecah pada batas kata (diutamakan di akhir kalimat), teks dibungkus
+    menjadi beberapa baris, dan subtitle yang terlalu cepat dibaca diperpanjang.
+
+    Berjalan pada segmen yang sudah ada (misal dari cache atau file .json), jadi tata letak
+    bisa diubah tanpa menjalankan model lagi. Hasil terbaik didapat dengan timestamp per kata;
+    tanpa itu waktu setiap kata diperkirakan dari panjang hurufnya.
+
+    Args:
+        segments (list): Daftar dict segmen dengan 'start', 'end', 'text', dan opsional 'words'.
+        rules (LayoutRules, optional): Aturan tata letak. Defaults to LayoutRules().
+        extend_last (bool): Subtitle terakhir boleh diperpanjang melewati akhir aslinya demi
+            kecepatan baca. Matikan jika segmen berikutnya belum diketahui (mode streaming).
+
+    Returns:
+        list: Daftar dict subtitle baru ('start', 'end', 'text', 'words').
+    """
+    rules = rules or LayoutRules()
+    max_chars = rules.max_chars_per_line * rules.max_lines
+    cues = []
+    for segment in segments:
+        current = []
+        for word in segment_words(segment):
+            if current:
+                candidate = "".join(item["word"] for item in current + [word]).strip()
+                if not _fits(candidate, rules) or word["end"] - current[0]["start"] > rules.max_duration:
+                    cues.append(_make_cue(current, rules))
+                    current = []
+            current.append(word)
+            # Akhir kalimat menjadi titik potong jika subtitle sudah cukup panjang.
+            if _SENTENCE_END.search(word["word"].strip()) and \
+                    len("".join(item["word"] for item in current).strip()) >= max_chars / 2:
+                cues.append(_make_cue(current, rules))
+                current = []
+        if current:
+            cues.append(_make_cue(current, rules))
+
+    # Kecepatan baca: perpanjang subtitle yang terlalu singkat untuk panjang teksnya,
+    # tanpa menabrak subtitle berikutnya.
+    for index, cue in enumerate(cues):
+        if index + 1 < len(cues):
+            extend_for_reading(cue, rules, cues[index + 1]["start"] - rules.min_gap)
+        elif extend_last:
+            extend_for_reading(cue, rules, float("inf"))
+    return cues
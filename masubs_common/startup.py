@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import shutil
+import importlib
+
+from masubs_common.media import find_executable
+from masubs_common.instrumentation import span
+
+# Jika environment variable ini diisi, kedua GUI mencetak waktu startup (satu JSON per baris)
+# ke stdout lalu menutup diri begitu siap. Dipakai oleh benchmarks/startup_benchmark.py.
+STARTUP_BENCHMARK_ENV = "MASUBS_STARTUP_BENCHMARK"
+
+# Titik awal pengukuran startup: saat modul ini pertama kali diimpor oleh aplikasi.
+_STARTUP_BEGIN = time.perf_counter()
+
+
+def startup_benchmark_enabled() -> bool:
+    return bool(os.environ.get(STARTUP_BENCHMARK_ENV))
+
+
+def report_startup_event(event: str, **fields):
+    """
+    Mencetak satu tahap startup ('shown', 'ready') beserta waktunya sejak aplikasi mulai,
+    hanya jika mode benchmark startup aktif.
+    """
+    if not startup_benchmark_enabled():
+        return
+    record = {"event": event, "seconds": time.perf_counter() - _STARTUP_BEGIN, **fields}
+    print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+def executable_available(name: str) -> str:
+    """
+    Mengecek apakah executable (ffmpeg/ffprobe) bisa ditemukan, tanpa menjalankannya.
+
+    Returns:
+        str | None: Path executable, atau None jika tidak ditemukan.
+    """
+    path = find_executable(name)
+    if os.path.isabs(path):
+        return path if os.path.isfile(path) else None
+    return shutil.which(path)
+
+
+def warm_up(modules=(), executables=(), tasks=None) -> dict:
+    """
+    Menyiapkan aplikasi setelah jendela tampil: mengimpor modul logika yang berat (numpy,
+    ffmpeg-python, dan seluruh modul transkripsi/burn-in), mengecek ffmpeg, dan menjalankan
+    tugas tambahan seperti deteksi encoder. Dipanggil dari thread latar belakang, sehingga
+    impor yang dibutuhkan job pertama sudah selesai saat pengguna menekan tombol mulai.
+
+    Args:
+        modules (iterable): Nama modul yang diimpor lebih awal.
+        executables (iterable): Nama executable yang harus tersedia, misal ('ffmpeg', 'ffprobe').
+        tasks (dict, optional): Nama -> fungsi tanpa argumen; hasilnya dikembalikan di 'results'.
+
+    Returns:
+        dict: 'imports' (modul -> detik), 'executables' (nama -> path atau None), 'missing'
+              (executable yang tidak ditemukan), 'results', 'errors' (nama -> pesan), dan
+              'seconds' (total waktu).
+    """
+    started = time.perf_counter()
+    modules = tuple(modules)
+    report = {"imports": {}, "executables": {}, "missing": [], "results": {}, "errors": {}}
+    with span("startup", modules=len(modules)) as stage:
+        for module in modules:
+            module_start = time.perf_counter()
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                report["errors"][module] = f"{type(e).__name__}: {e}"
+            report["imports"][module] = time.perf_counter() - module_start
+        for name in executables:
+            path = executable_available(name)
+            report["executables"][name] = path
+            if path is None:
+                report["missing"].append(name)
+        for name, task in (tasks or {}).items():
+            try:
+                report["results"][name] = task()
+            except Exception as e:
+                report["errors"][name] = f"{type(e).__name__}: {e}"
+        report["seconds"] = time.perf_counter() - started
+        stage.set(seconds=report["seconds"], missing=",".join(report["missing"]), errors=len(report["errors"]))
+    return report
+
+
+def describe_readiness(report: dict) -> tuple:
+    """
+    Teks indikator kesiapan untuk status bar.
+
+    Returns:
+        tuple: (teks_singkat, tooltip, ok). 'ok' False jika ada executable atau modul yang gagal.
+    """
+    details = [f"{module}: {seconds * 1000:.0f} ms" for module, seconds in report["imports"].items()]
+    details += [f"{name}: {path or 'tidak ditemukan'}" for name, path in report["executables"].items()]
+    details += [f"{name}: {message}" for name, message in report["errors"].items()]
+    tooltip = "\n".join(details)
+    if report["missing"]:
+        return f"{', '.join(report['missing'])} tidak ditemukan", tooltip, False
+    if report["errors"]:
+        return "Sebagian komponen gagal dimuat", tooltip, False
+    return f"Siap ({report['seconds']:.1f} dtk)", tooltip, True
+
@@ -0,0 +1,35 @@
+# Modul ini hanya diimpor oleh kedua GUI; logika startup tanpa PyQt6 ada di masubs_common/startup.py.
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from masubs_common.startup import warm_up, describe_readiness
+
+
+class StartupWorker(QObject):
+    """
+    Menjalankan warm_up() (impor modul berat, cek ffmpeg, deteksi encoder) di thread terpisah,
+    agar jendela sudah tampil dan bisa dipakai selama persiapan berlangsung.
+    """
+    finished = pyqtSignal(dict)
+
+    def __init__(self, modules=(), executables=(), tasks=None):
+        super().__init__()
+        self.modules = tuple(modules)
+        self.executables = tuple(executables)
+        self.tasks = tasks or {}
+
+    def run(self):
+        self.finished.emit(warm_up(self.modules, self.executables, self.tasks))
+
+
+class ReadinessIndicator(QLabel):
+    """Indikator kesiapan di status bar: abu-abu selama persiapan, hijau jika siap, merah jika ada masalah."""
+    def __init__(self, parent=None):
+        super().__init__("Memuat komponen...", parent)
+        self.setStyleSheet("color: gray;")
+
+    def set_report(self, report: dict):
+        text, tooltip, ok = describe_readiness(report)
+        self.setText(text)
+        self.setToolTip(tooltip)
+        self.setStyleSheet("color: green;" if ok else "color: #b00020;")
@@ -0,0 +1,189 @@
+import os
+import json
+from dataclasses import dataclass
+
+from masubs_common.subtitles import format_timestamp, read_srt
+
+# Format yang didukung beserta ekstensi file-nya.
+FORMAT_EXTENSIONS = {"srt": ".srt", "vtt": ".vtt", "ass": ".ass", "json": ".json"}
+EXPORT_FORMATS = tuple(FORMAT_EXTENSIONS)
+
+# Ukuran buffer tulis (byte). Setiap file ditulis sekali dari buffer ini, bukan per blok.
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class AssStyle:
+    """
+    Gaya 'Default' untuk file .ass. Nilai bawaannya sama dengan header yang dibuat ffmpeg
+    saat filter 'subtitles' membaca file .srt (PlayRes 384x288, Arial 16, putih dengan
+    outline hitam, rata tengah bawah), jadi hasil burn-in dari .ass terlihat sama dengan
+    dari .srt tetapi libass tidak perlu mengonversi SRT terlebih dahulu.
+
+    Attributes:
+        font_name (str): Nama font.
+        font_size (int): Ukuran font dalam satuan PlayRes.
+        primary_colour (str): Warna teks dalam format ASS (&HAABBGGRR).
+        outline_colour (str): Warna outline.
+        back_colour (str): Warna bayangan/kotak latar.
+        bold (bool): Teks tebal.
+        outline (float): Tebal outline.
+        shadow (float): Jarak bayangan.
+        alignment (int): Posisi numpad (2 = tengah bawah).
+        margin_v (int): Jarak vertikal dari tepi bawah.
+        play_res_x (int): Lebar kanvas koordinat.
+        play_res_y (int): Tinggi kanvas koordinat.
+    """
+    font_name: str = "Arial"
+    font_size: int = 16
+    primary_colour: str = "&H00FFFFFF"
+    outline_colour: str = "&H00000000"
+    back_colour: str = "&H00000000"
+    bold: bool = False
+    outline: float = 1.0
+    shadow: float = 0.0
+    alignment: int = 2
+    margin_v: int = 10
+    play_res_x: int = 384
+    play_res_y: int = 288
+
+    def header(self) -> str:
+        """Bagian [Script Info], [V4+ Styles], dan [Events] sampai baris 'Format'."""
+        return (
+            "[Script Info]\n"
+            "ScriptType: v4.00+\n"
+            f"PlayResX: {self.play_res_x}\n"
+            f"PlayResY: {self.play_res_y}\n"
+            "ScaledBorderAndShadow: yes\n"
+            "WrapStyle: 0\n"
+            "\n"
+            "[V4+ Styles]\n"
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, "
+            "Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+            f"Style: Default,{self.font_name},{self.font_size},{self.primary_colour},&H000000FF,"
+            f"{self.outline_colour},{self.back_colour},{-1 if self.bold else 0},0,0,0,100,100,0,0,1,"
+            f"{self.outline:g},{self.shadow:g},{self.alignment},10,10,{self.margin_v},1\n"
+            "\n"
+            "[Events]\n"
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+        )
+
+
+def format_vtt_timestamp(seconds: float) -> str:
+    """Timestamp WebVTT (HH:MM:SS.mmm)."""
+    return format_timestamp(seconds).replace(",", ".")
+
+
+def format_ass_timestamp(seconds: float) -> str:
+    """Timestamp ASS (H:MM:SS.cc, seperseratus detik)."""
+    centiseconds = round(max(seconds, 0.0) * 100)
+    hours, centiseconds = divmod(centiseconds, 360_000)
+    minutes, centiseconds = divmod(centiseconds, 6_000)
+    seconds, centiseconds = divmod(centiseconds, 100)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
+
+
+def _vtt_text(text: str) -> str:
+    # '&', '<', dan '>' punya arti khusus di WebVTT (entity dan tag).
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _ass_text(text: str) -> str:
+    # Kurung kurawal membuka blok override ASS; baris baru ditulis sebagai '\N'.
+    return text.replace("{", "\\{").replace("}", "\\}").replace("\n", "\\N")
+
+
+def render_subtitles(segments, formats=EXPORT_FORMATS, style: AssStyle = None, metadata: dict = None) -> dict:
+    """
+    Menyusun isi beberapa format subtitle dalam satu kali iterasi daftar segmen.
+
+    Args:
+        segments (list): Daftar dict segmen dengan kunci 'start', 'end', dan 'text'.
+        formats (iterable): Format yang dibuat, subset dari EXPORT_FORMATS.
+        style (AssStyle, optional): Gaya untuk format 'ass'. Defaults to AssStyle().
+        metadata (dict, optional): Informasi tambahan untuk format 'json' (model, bahasa, dll.).
+
+    Returns:
+        dict: Nama format -> isi file (str).
+
+    Raises:
+        ValueError: Jika ada format yang tidak dikenal.
+    """
+    formats = list(dict.fromkeys(formats))
+    unknown = [name for name in formats if name not in FORMAT_EXTENSIONS]
+    if unknown:
+        raise ValueError(f"Format subtitle tidak dikenal: {', '.join(unknown)}. "
+                         f"Pilihan: {', '.join(EXPORT_FORMATS)}.")
+
+    parts = {name: [] for name in formats}
+    if "vtt" in parts:
+        parts["vtt"].append("WEBVTT\n\n")
+    if "ass" in parts:
+        parts["ass"].append((style or AssStyle()).header())
+    json_segments = [] if "json" in parts else None
+
+    for index, segment in enumerate(segments, start=1):
+        start, end = segment["start"], segment["end"]
+        text = segment["text"].strip()
+        if "srt" in parts:
+            parts["srt"].append(f"{index}\n{format_timestamp(start)} --> {format_timestamp(end)}\n{text}\n\n")
+        if "vtt" in parts:
+            parts["vtt"].append(f"{format_vtt_timestamp(start)} --> {format_vtt_timestamp(end)}\n{_vtt_text(text)}\n\n")
+        if "ass" in parts:
+            parts["ass"].append(f"Dialogue: 0,{format_ass_timestamp(start)},{format_ass_timestamp(end)},"
+                                f"Default,,0,0,0,,{_ass_text(text)}\n")
+        if json_segments is not None:
+            json_segments.append({**segment, "start": round(start, 3), "end": round(end, 3), "text": text})
+
+    if json_segments is not None:
+        parts["json"] = [json.dumps({**(metadata or {}), "segments": json_segments}, ensure_ascii=False, indent=1)]
+    return {name: "".join(chunks) for name, chunks in parts.items()}
+
+
+def export_subtitles(segments, base_path: str, formats=EXPORT_FORMATS, style: AssStyle = None,
+                     metadata: dict = None) -> dict:
+    """
+    Menulis segmen ke beberapa format sekaligus. Semua format dibuat dari daftar segmen yang
+    sama (misal dari cache hasil transkripsi), jadi format tambahan hanya butuh beberapa
+    milidetik, bukan transkripsi ulang.
+
+    Args:
+        segments (list): Daftar dict segmen dengan kunci 'start', 'end', dan 'text'.
+        base_path (str): Path tanpa ekstensi; ekstensi ditambahkan sesuai format.
+        formats (iterable): Format yang ditulis. Defaults to semua format.
+        style (AssStyle, optional): Gaya untuk format 'ass'.
+        metadata (dict, optional): Informasi tambahan untuk format 'json'.
+
+    Returns:
+        dict: Nama format -> path file yang ditulis.
+    """
+    paths = {}
+    for name, content in render_subtitles(segments, formats, style, metadata).items():
+        path = base_path + FORMAT_EXTENSIONS[name]
+        with open(path, "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as output_file:
+            output_file.write(content)
+        paths[name] = path
+    return paths
+
+
+def load_segments(path: str) -> list:
+    """
+    Membaca segmen dari file .srt atau .json hasil export_subtitles().
+
+    Args:
+        path (str): Path file subtitle.
+
+    Returns:
+        list: Daftar dict segmen dengan kunci 'start', 'end', dan 'text'.
+
+    Raises:
+        ValueError: Jika format file tidak bisa dibaca kembali menjadi segmen.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".srt":
+        return read_srt(path)
+    if extension == ".json":
+        with open(path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)["segments"]
+    raise ValueError(f"Tidak bisa membaca segmen dari file '{extension}'. Gunakan .srt atau .json.")
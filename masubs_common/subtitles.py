@@ -0,0 +1,134 @@
+import re
+
+# Pola satu baris timestamp SRT, misal '00:01:02,345 --> 00:01:04,000'.
+_TIMING_PATTERN = re.compile(
+    r"(\d+):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{3})"
+)
+
+
+def format_timestamp(seconds: float) -> str:
+    """
+    Mengonversi total detik dalam format float ke format timestamp SRT (HH:MM:SS,ms).
+
+    Args:
+        seconds (float): Waktu dalam detik yang akan diformat.
+
+    Returns:
+        str: String timestamp yang sudah diformat sesuai standar SRT.
+    """
+    # Memastikan input tidak negatif untuk menghindari error perhitungan.
+    assert seconds >= 0, "non-negative timestamp expected"
+
+    # Konversi detik ke milidetik untuk perhitungan yang lebih mudah.
+    milliseconds = round(seconds * 1000.0)
+
+    # Gunakan divmod untuk mendapatkan jam dan sisa milidetik secara efisien.
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds = milliseconds // 1_000
+    milliseconds %= 1_000
+
+    # Format output string dengan padding nol agar sesuai standar (misal: 01, 007).
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
+
+
+class SrtStreamWriter:
+    """
+    Penulis file .srt inkremental. Setiap blok langsung di-flush ke disk sehingga
+    jika proses berhenti di tengah jalan, subtitle yang sudah dihasilkan tetap tersimpan.
+
+    Contoh:
+        with SrtStreamWriter(path) as writer:
+            for segment in segments:
+                writer.write_segment(segment)
+    """
+    def __init__(self, output_srt_path: str):
+        self.output_srt_path = output_srt_path
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.output_srt_path, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.close()
+        return False
+
+    def write_segment(self, segment):
+        """Menulis satu blok subtitle lalu mem-flush-nya ke disk."""
+        self.count += 1
+        # Menulis setiap blok subtitle sesuai format standar SRT.
+        # 1. Nomor urut, 2. Timestamp (Mulai --> Selesai), 3. Teks subtitle
+        start_time = format_timestamp(segment['start'])
+        end_time = format_timestamp(segment['end'])
+        self._file.write(f"{self.count}\n{start_time} --> {end_time}\n{segment['text'].strip()}\n\n")
+        self._file.flush()
+
+
+def write_srt(segments, output_srt_path: str):
+    """
+    Menulis daftar segmen ke file .srt.
+
+    Args:
+        segments (list): Daftar dict segmen dengan kunci 'start', 'end', dan 'text'.
+        output_srt_path (str): Path file .srt yang akan ditulis.
+    """
+    with SrtStreamWriter(output_srt_path) as writer:
+        for segment in segments:
+            writer.write_segment(segment)
+
+
+def read_srt(srt_path: str) -> list:
+    """
+    Membaca file .srt menjadi daftar segmen.
+
+    Args:
+        srt_path (str): Path file .srt.
+
+    Returns:
+        list: Daftar dict dengan kunci 'start', 'end' (detik) dan 'text'.
+    """
+    # 'utf-8-sig' juga menerima file yang disimpan dengan BOM oleh editor di Windows.
+    with open(srt_path, "r", encoding="utf-8-sig") as srt_file:
+        content = srt_file.read()
+
+    segments = []
+    for block in re.split(r"\n\s*\n", content.replace("\r\n", "\n")):
+        lines = block.strip().split("\n")
+        for index, line in enumerate(lines):
+            match = _TIMING_PATTERN.search(line)
+            if not match:
+                continue
+            values = [int(value) for value in match.groups()]
+            start = values[0] * 3600 + values[1] * 60 + values[2] + values[3] / 1000
+            end = values[4] * 3600 + values[5] * 60 + values[6] + values[7] / 1000
+            segments.append({"start": start, "end": end, "text": "\n".join(lines[index + 1:])})
+            break
+    return segments
+
+
+def slice_segments(segments, start: float, end: float) -> list:
+    """
+    Mengambil segmen yang tampil di rentang [start, end) lalu menggeser waktunya
+    sehingga 'start' menjadi detik ke-0. Segmen yang melewati batas rentang dipotong,
+    sehingga subtitle yang sama tetap tampil tanpa jeda di potongan berikutnya.
+
+    Args:
+        segments (list): Daftar dict segmen dengan kunci 'start', 'end', dan 'text'.
+        start (float): Awal rentang dalam detik.
+        end (float): Akhir rentang dalam detik.
+
+    Returns:
+        list: Segmen baru dengan waktu relatif terhadap 'start'.
+    """
+    sliced = []
+    for segment in segments:
+        if segment["end"] <= start or segment["start"] >= end:
+            continue
+        sliced.append({
+            "start": max(segment["start"], start) - start,
+            "end": min(segment["end"], end) - start,
+            "text": segment["text"],
+        })
+    return sliced